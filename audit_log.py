@@ -0,0 +1,202 @@
+"""
+Audit Log for HSCRC Survey System
+Structured record of logins, edits, approvals and email sends, kept in local SQLite.
+log_event() only adds the event to an in-memory buffer; a daemon thread writes the
+buffer in batches, so auditing never adds a database write to a user action.
+"""
+
+import atexit
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from settings import data_path
+
+# Local SQLite file inside storage.data_dir (survives app restarts)
+AUDIT_DB_FILE = "audit.db"
+
+# Batching policy
+FLUSH_INTERVAL = 2          # Write buffered events at least this often (seconds)
+MAX_BUFFER = 200            # ...or as soon as this many are waiting
+
+# Event types
+LOGIN = 'login'
+LOGIN_FAILED = 'login_failed'
+EDIT = 'edit'
+APPROVE = 'approve'
+UNAPPROVE = 'unapprove'
+EMAIL_SENT = 'email_sent'
+EMAIL_FAILED = 'email_failed'
+CYCLE_FROZEN = 'cycle_frozen'
+EVENT_TYPES = (LOGIN, LOGIN_FAILED, EDIT, APPROVE, UNAPPROVE, EMAIL_SENT, EMAIL_FAILED, CYCLE_FROZEN)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    occurred_at REAL NOT NULL,
+    event_type TEXT NOT NULL,
+    hospital_name TEXT,
+    actor TEXT,
+    details TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_events_hospital ON events (hospital_name, occurred_at);
+CREATE INDEX IF NOT EXISTS idx_events_actor ON events (actor, occurred_at);
+CREATE INDEX IF NOT EXISTS idx_events_type ON events (event_type, occurred_at);
+CREATE INDEX IF NOT EXISTS idx_events_time ON events (occurred_at);
+"""
+
+
+def _connect(db_path=None):
+    db_path = db_path or data_path(AUDIT_DB_FILE)
+    conn = sqlite3.connect(db_path, timeout=10, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+class AuditLog:
+    """
+    Buffered audit log. log() is a list append under a lock; the daemon thread
+    writes whatever has accumulated in one transaction every FLUSH_INTERVAL seconds
+    (sooner when the buffer reaches MAX_BUFFER events).
+    """
+
+    def __init__(self, db_path=None, flush_interval=FLUSH_INTERVAL, max_buffer=MAX_BUFFER):
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.batches = 0                # Batched writes performed (for diagnostics)
+        self._conn = _connect(db_path)
+        self._lock = threading.Lock()           # guards the buffer
+        self._write_lock = threading.Lock()     # one batch write at a time
+        self._buffer = []
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="audit-log", daemon=True)
+        self._thread.start()
+        # Don't lose the last few events when the server shuts down
+        atexit.register(self.flush)
+
+    def log(self, event_type, hospital_name=None, actor=None, **details):
+        """Buffer one event; details are stored as JSON."""
+        event = (time.time(), event_type, hospital_name or None, actor or None,
+                 json.dumps(details, default=str) if details else None)
+        with self._lock:
+            self._buffer.append(event)
+            full = len(self._buffer) >= self.max_buffer
+        if full:
+            self._wakeup.set()
+
+    def flush(self):
+        """Write all buffered events now, in one transaction."""
+        with self._write_lock:
+            with self._lock:
+                events, self._buffer = self._buffer, []
+            if not events:
+                return
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT INTO events (occurred_at, event_type, hospital_name, actor, details) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    events
+                )
+                self._conn.execute("COMMIT")
+            except sqlite3.Error:
+                self._conn.execute("ROLLBACK")
+                # Put them back in front of anything logged meanwhile; retried on the next flush
+                with self._lock:
+                    self._buffer[:0] = events
+                raise
+            self.batches += 1
+
+    def query(self, hospital_name=None, actor=None, event_types=None, since=None, limit=500):
+        """
+        Most recent events matching every given filter (buffered events included).
+
+        Args:
+            hospital_name: Exact hospital name
+            actor: Who acted (case-insensitive match)
+            event_types: Iterable of event types (see EVENT_TYPES)
+            since: Only events at or after this datetime
+            limit: Maximum rows returned
+
+        Returns:
+            DataFrame with occurred_at, event_type, hospital_name, actor, details (newest first)
+        """
+        self.flush()
+
+        clauses, params = [], []
+        if hospital_name:
+            clauses.append("hospital_name = ?")
+            params.append(hospital_name)
+        if actor:
+            clauses.append("actor = ? COLLATE NOCASE")
+            params.append(actor.strip())
+        event_types = list(event_types or [])
+        if event_types:
+            clauses.append(f"event_type IN ({','.join('?' * len(event_types))})")
+            params.extend(event_types)
+        if since is not None:
+            clauses.append("occurred_at >= ?")
+            params.append(since.timestamp())
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+
+        with self._write_lock:
+            rows = self._conn.execute(
+                f"SELECT occurred_at, event_type, hospital_name, actor, details FROM events {where}"
+                f"ORDER BY occurred_at DESC, id DESC LIMIT ?",
+                params + [limit]
+            ).fetchall()
+
+        columns = ['occurred_at', 'event_type', 'hospital_name', 'actor', 'details']
+        return pd.DataFrame(
+            [(datetime.fromtimestamp(occurred_at).strftime("%Y-%m-%d %H:%M:%S"), event_type,
+              hospital or '', actor or '', _format_details(details))
+             for occurred_at, event_type, hospital, actor, details in rows],
+            columns=columns
+        )
+
+    def actors(self):
+        """Every actor that appears in the log, for filter pickers."""
+        self.flush()
+        with self._write_lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT actor FROM events WHERE actor IS NOT NULL ORDER BY actor COLLATE NOCASE"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except sqlite3.Error:
+                pass
+
+
+def _format_details(details):
+    if not details:
+        return ''
+    return ', '.join(f"{key}: {value}" for key, value in json.loads(details).items())
+
+
+@st.cache_resource(show_spinner=False)
+def get_audit_log():
+    """Process-wide audit log (one SQLite connection and flush thread)"""
+    return AuditLog()
+
+
+def log_event(event_type, hospital_name=None, actor=None, **details):
+    """
+    Record an audit event without slowing the caller down.
+    Auditing never breaks the action being audited, so errors are swallowed.
+    """
+    try:
+        get_audit_log().log(event_type, hospital_name, actor, **details)
+    except Exception:
+        pass
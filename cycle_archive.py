@@ -0,0 +1,102 @@
+"""
+Reporting Cycle Archive for HSCRC Survey System
+A finished cycle is frozen into a gzip-compressed, read-only CSV snapshot in
+storage.data_dir. Past cycles are then read from disk, so Google Sheets only
+has to serve the active cycle.
+"""
+
+import os
+import stat
+
+import pandas as pd
+import streamlit as st
+
+from settings import get_settings, data_path, CYCLE_NAME
+
+SNAPSHOT_PREFIX = "cycle_"
+SNAPSHOT_SUFFIX = ".csv.gz"
+
+
+class ArchiveError(Exception):
+    """Raised when a cycle can't be frozen or its snapshot can't be read."""
+
+
+def snapshot_path(cycle):
+    """Where a cycle's snapshot lives (whether or not it exists yet)."""
+    if not CYCLE_NAME.match(str(cycle)):
+        raise ArchiveError(f"'{cycle}' is not a valid cycle name")
+    return data_path(f"{SNAPSHOT_PREFIX}{cycle}{SNAPSHOT_SUFFIX}")
+
+
+def frozen_cycles():
+    """Names of every frozen cycle, oldest first."""
+    data_dir = get_settings().storage.data_dir
+    if not os.path.isdir(data_dir):
+        return []
+    return sorted(
+        name[len(SNAPSHOT_PREFIX):-len(SNAPSHOT_SUFFIX)]
+        for name in os.listdir(data_dir)
+        if name.startswith(SNAPSHOT_PREFIX) and name.endswith(SNAPSHOT_SUFFIX)
+    )
+
+
+def freeze_cycle(cycle, df):
+    """
+    Write a cycle's submissions to its read-only snapshot.
+    A frozen cycle is never rewritten, so freezing the same cycle twice is an error.
+
+    Args:
+        cycle: Name of the reporting cycle
+        df: The cycle's submissions, as loaded from its worksheet
+
+    Returns:
+        str: Path of the snapshot
+    """
+    path = snapshot_path(cycle)
+    if os.path.exists(path):
+        raise ArchiveError(f"Cycle {cycle} is already frozen")
+    if df.empty:
+        raise ArchiveError(f"Cycle {cycle} has no submissions to freeze")
+
+    # Written under a temporary name and renamed, so a snapshot is never seen half-written
+    temp_path = f"{path}.tmp"
+    df.to_csv(temp_path, index=False, compression='gzip')
+    os.chmod(temp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+    os.replace(temp_path, path)
+    return path
+
+
+@st.cache_data(show_spinner=False, max_entries=20)
+def _read_snapshot(path, stamp):
+    # Blank cells stay '' (as get_all_records returns them) instead of becoming NaN
+    return pd.read_csv(path, compression='gzip', keep_default_na=False)
+
+
+def load_snapshot(cycle):
+    """
+    A frozen cycle's submissions (read once per process; snapshots never change).
+
+    Raises:
+        ArchiveError: if the cycle has not been frozen
+    """
+    path = snapshot_path(cycle)
+    try:
+        stamp = os.stat(path).st_mtime_ns
+    except OSError:
+        raise ArchiveError(f"Cycle {cycle} has not been frozen") from None
+    return _read_snapshot(path, stamp)
+
+
+def stack_cycles(frames):
+    """
+    Combine several cycles' submissions into one table with a 'cycle' column.
+
+    Args:
+        frames: Mapping of cycle name -> submissions DataFrame, in cycle order
+    """
+    if not frames:
+        return pd.DataFrame(columns=['cycle', 'hospital_name'])
+    return pd.concat(
+        [df.assign(cycle=cycle) for cycle, df in frames.items()],
+        ignore_index=True
+    )
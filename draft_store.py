@@ -0,0 +1,141 @@
+"""
+Draft Autosave for HSCRC Survey System
+Keeps each hospital's in-progress answers in local SQLite, written in a debounced way.
+Google Sheets stays the system of record; drafts are promoted only on Save Draft / Submit.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+
+import streamlit as st
+
+from settings import cycle_data_path
+
+# Local SQLite file inside storage.data_dir (survives app restarts), one per reporting cycle
+DRAFT_DB_FILE = "drafts.db"
+
+# Debounce policy
+DEBOUNCE_SECONDS = 2        # Write once changes have been quiet this long
+MAX_DELAY_SECONDS = 10      # ...but never hold a change back longer than this
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS drafts (
+    hospital_name TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+def _connect(db_path=None):
+    db_path = db_path or cycle_data_path(DRAFT_DB_FILE)
+    conn = sqlite3.connect(db_path, timeout=10, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+class DraftStore:
+    """
+    Per-hospital draft store. save_later() only records the latest values in memory;
+    a daemon thread writes them once the hospital stops changing things, so a burst
+    of edits becomes a single SQLite write.
+    """
+
+    def __init__(self, db_path=None, debounce=DEBOUNCE_SECONDS, max_delay=MAX_DELAY_SECONDS):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.writes = 0                 # SQLite writes performed (for diagnostics)
+        self._conn = _connect(db_path)
+        self._lock = threading.Lock()
+        self._pending = {}              # hospital -> [values, first_change, last_change]
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="draft-autosave", daemon=True)
+        self._thread.start()
+
+    def save_later(self, hospital_name, values):
+        """Queue the hospital's current form values; coalesced with any unwritten change."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._pending.get(hospital_name)
+            if entry is None:
+                self._pending[hospital_name] = [dict(values), now, now]
+            else:
+                entry[0] = dict(values)
+                entry[2] = now
+        self._wakeup.set()
+
+    def flush(self, hospital_name=None):
+        """Write pending drafts now (one hospital, or all of them)."""
+        with self._lock:
+            if hospital_name is None:
+                due = list(self._pending.items())
+                self._pending.clear()
+            elif hospital_name in self._pending:
+                due = [(hospital_name, self._pending.pop(hospital_name))]
+            else:
+                due = []
+            for name, (values, _, _) in due:
+                self._write(name, values)
+
+    def load(self, hospital_name):
+        """
+        Latest draft for a hospital.
+
+        Returns:
+            tuple: (values dict, updated_at epoch seconds), or None if there is no draft
+        """
+        with self._lock:
+            entry = self._pending.get(hospital_name)
+            if entry is not None:
+                return dict(entry[0]), time.time()
+            row = self._conn.execute(
+                "SELECT payload, updated_at FROM drafts WHERE hospital_name = ?", (hospital_name,)
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def discard(self, hospital_name):
+        """Drop a hospital's draft (after it was promoted to Google Sheets, or on request)."""
+        with self._lock:
+            self._pending.pop(hospital_name, None)
+            self._conn.execute("DELETE FROM drafts WHERE hospital_name = ?", (hospital_name,))
+
+    def _write(self, hospital_name, values):
+        self._conn.execute(
+            "INSERT INTO drafts (hospital_name, payload, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (hospital_name) DO UPDATE SET payload = excluded.payload, updated_at = excluded.updated_at",
+            (hospital_name, json.dumps(values, default=str), time.time())
+        )
+        self.writes += 1
+
+    def _next_due(self, entry):
+        _, first_change, last_change = entry
+        return min(last_change + self.debounce, first_change + self.max_delay)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                for name in [name for name, entry in self._pending.items() if self._next_due(entry) <= now]:
+                    values, _, _ = self._pending.pop(name)
+                    try:
+                        self._write(name, values)
+                    except sqlite3.Error:
+                        pass
+                wait = min((self._next_due(entry) - now for entry in self._pending.values()), default=None)
+            self._wakeup.wait(wait)
+            self._wakeup.clear()
+
+
+@st.cache_resource(show_spinner=False)
+def _draft_store(db_path):
+    return DraftStore(db_path)
+
+
+def get_draft_store():
+    """Process-wide draft store for the active reporting cycle (one SQLite connection and autosave thread)"""
+    return _draft_store(cycle_data_path(DRAFT_DB_FILE))
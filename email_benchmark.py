@@ -0,0 +1,200 @@
+"""
+Email Throughput Benchmark for HSCRC Survey System
+Runs email_sender against a local in-process SMTP sink (no Gmail account needed)
+
+Usage:
+    python email_benchmark.py --messages 200 --concurrency 4
+    python email_benchmark.py --messages 50 --fresh-connections   # one handshake per email (pre-pooling behaviour)
+    python email_benchmark.py --server-delay 20                   # simulate a slow mail server (ms per command)
+"""
+
+import argparse
+import base64
+import socketserver
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import email_sender
+
+SINK_USER = "benchmark@localhost"
+SINK_PASSWORD = "benchmark"
+
+
+# ==================== LOCAL SMTP SINK ====================
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP dialogue: EHLO, AUTH, MAIL, RCPT, DATA, NOOP, RSET, QUIT."""
+
+    def _reply(self, line):
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        self.wfile.write((line + "\r\n").encode("ascii"))
+
+    def handle(self):
+        sink = self.server
+        with sink.lock:
+            sink.connections += 1
+        self._reply("220 localhost HSCRC benchmark sink ready")
+
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            line = raw.decode("utf-8", "replace").rstrip("\r\n")
+            command = line[:4].upper()
+
+            if command in ("EHLO", "HELO"):
+                self.wfile.write(b"250-localhost\r\n250-AUTH PLAIN LOGIN\r\n250-8BITMIME\r\n")
+                self._reply("250 SMTPUTF8")
+            elif command == "AUTH":
+                parts = line.split()
+                if len(parts) == 3 and parts[1].upper() == "PLAIN":
+                    _, user, password = base64.b64decode(parts[2]).decode("utf-8").split("\0")
+                    ok = (user, password) == (SINK_USER, SINK_PASSWORD)
+                else:
+                    ok = False
+                if ok:
+                    with sink.lock:
+                        sink.handshakes += 1
+                    self._reply("235 2.7.0 Authentication successful")
+                else:
+                    self._reply("535 5.7.8 Authentication failed")
+            elif command in ("MAIL", "RCPT", "RSET", "NOOP"):
+                self._reply("250 OK")
+            elif command == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                size = 0
+                while True:
+                    data_line = self.rfile.readline()
+                    if not data_line or data_line == b".\r\n":
+                        break
+                    size += len(data_line)
+                with sink.lock:
+                    sink.messages += 1
+                    sink.bytes_received += size
+                self._reply("250 OK: queued")
+            elif command == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class LocalSMTPSink(socketserver.ThreadingTCPServer):
+    """In-process SMTP server that accepts and discards mail, counting what it sees."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=0, delay_ms=0):
+        super().__init__((host, port), _SMTPHandler)
+        self.delay = delay_ms / 1000.0
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.handshakes = 0
+        self.messages = 0
+        self.bytes_received = 0
+        self._thread = threading.Thread(target=self.serve_forever, name="smtp-sink", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
+
+    @property
+    def email_config(self):
+        """Config in the shape returned by email_sender.get_email_config()."""
+        host, port = self.server_address
+        return {
+            'smtp_server': host,
+            'smtp_port': port,
+            'sender_email': SINK_USER,
+            'sender_password': SINK_PASSWORD,
+            'sender_name': "HSCRC Benchmark",
+            'use_tls': False,
+        }
+
+
+# ==================== BENCHMARK ====================
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_benchmark(messages=100, concurrency=1, fresh_connections=False, server_delay_ms=0):
+    """
+    Send `messages` emails (alternating submission/approval) through email_sender.
+
+    Returns:
+        dict with sent, failed, seconds, msgs_per_sec, p50_ms, p99_ms, handshakes, connections
+    """
+    submission_data = {
+        'timestamp': '2025-01-01 09:00:00',
+        'bp1': 'BP1', 'bp1_tier': 2,
+        'bp2': 'BP4', 'bp2_tier': 3,
+    }
+
+    with LocalSMTPSink(delay_ms=server_delay_ms) as sink:
+        config = sink.email_config
+        pool = email_sender.get_smtp_pool(config)
+
+        def send_one(i):
+            start = time.perf_counter()
+            if i % 2 == 0:
+                ok = email_sender.send_submission_email(
+                    f"hospital{i}@example.org", f"Hospital {i}", "Benchmark Contact", submission_data
+                )
+            else:
+                ok = email_sender.send_approval_email(
+                    f"hospital{i}@example.org", f"Hospital {i}", "Benchmark Contact",
+                    "HSCRC Staff", '2025-01-02 10:00:00'
+                )
+            if fresh_connections:
+                pool.close_all()
+            return ok, time.perf_counter() - start
+
+        with mock.patch.object(email_sender, 'get_email_config', return_value=config):
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                results = list(executor.map(send_one, range(messages)))
+            elapsed = time.perf_counter() - started
+        pool.close_all()
+
+        latencies = [seconds * 1000 for ok, seconds in results if ok]
+        return {
+            'sent': sink.messages,
+            'failed': sum(1 for ok, _ in results if not ok),
+            'seconds': elapsed,
+            'msgs_per_sec': messages / elapsed if elapsed else 0.0,
+            'p50_ms': statistics.median(latencies) if latencies else 0.0,
+            'p99_ms': _percentile(latencies, 99) if latencies else 0.0,
+            'handshakes': sink.handshakes,
+            'connections': sink.connections,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark email_sender against a local SMTP sink")
+    parser.add_argument("--messages", type=int, default=100, help="Number of emails to send")
+    parser.add_argument("--concurrency", type=int, default=1, help="Concurrent sending threads")
+    parser.add_argument("--fresh-connections", action="store_true",
+                        help="Close pooled sessions after every email (one handshake per email)")
+    parser.add_argument("--server-delay", type=float, default=0, help="Sink reply delay per command (ms)")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.messages, args.concurrency, args.fresh_connections, args.server_delay)
+    print(f"Sent:        {result['sent']} ({result['failed']} failed)")
+    print(f"Elapsed:     {result['seconds']:.2f} s")
+    print(f"Throughput:  {result['msgs_per_sec']:.1f} msgs/sec")
+    print(f"Latency:     p50 {result['p50_ms']:.1f} ms | p99 {result['p99_ms']:.1f} ms")
+    print(f"Handshakes:  {result['handshakes']} logins over {result['connections']} connections")
+
+
+if __name__ == "__main__":
+    main()
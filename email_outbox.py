@@ -0,0 +1,313 @@
+"""
+Email Outbox for HSCRC Survey System
+Persists notification emails and delivers them from a background worker
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+
+import streamlit as st
+
+from settings import data_path
+
+logger = logging.getLogger(__name__)
+
+# Local SQLite file inside storage.data_dir (survives app restarts)
+OUTBOX_DB_FILE = "email_outbox.db"
+
+# Delivery policy
+MAX_ATTEMPTS = 5            # Give up (status 'failed') after this many tries
+BACKOFF_BASE = 30           # Seconds before the first retry, doubled on each attempt
+BACKOFF_MAX = 3600          # Never wait longer than this between retries
+POLL_INTERVAL = 5           # Worker wake-up interval when idle (seconds)
+# The portal and the dashboard each run a worker on the same outbox, so a 'sending' claim is
+# only taken over once it is this old (its worker died mid-send); well above any SMTP exchange
+SENDING_LEASE = 600
+
+# Status values
+PENDING = 'pending'
+SENDING = 'sending'
+SENT = 'sent'
+FAILED = 'failed'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    idempotency_key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    recipient TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox (status, next_attempt_at);
+"""
+
+
+def _connect(db_path=None):
+    db_path = db_path or data_path(OUTBOX_DB_FILE)
+    conn = sqlite3.connect(db_path, timeout=10, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def make_idempotency_key(kind, hospital_name, event_time, recipient):
+    """Key identifying one logical email, so repeated enqueues send it only once."""
+    return f"{kind}:{hospital_name}:{event_time}:{str(recipient).strip().lower()}"
+
+
+def enqueue_email(kind, idempotency_key, **fields):
+    """
+    Add an email to the outbox for background delivery.
+    Enqueuing the same idempotency key again is a no-op.
+
+    Args:
+        kind: Email type understood by email_sender.deliver_email ('submission', 'approval')
+        idempotency_key: Unique key for this email (see make_idempotency_key)
+        **fields: Message fields; must include recipient_email
+
+    Returns:
+        str: The idempotency key, used to poll delivery status (None if email isn't configured)
+    """
+    keys = enqueue_emails([(kind, idempotency_key, fields)])
+    return keys[0] if keys else None
+
+
+def enqueue_emails(emails):
+    """
+    Add many emails to the outbox in one transaction and wake the worker once.
+
+    Args:
+        emails: Iterable of (kind, idempotency_key, fields) as for enqueue_email
+
+    Returns:
+        list: The idempotency keys, in order (empty, with an error shown, if email isn't configured)
+    """
+    from email_sender import email_config_problem
+
+    emails = list(emails)
+    if not emails:
+        return []
+    problem = email_config_problem()
+    if problem:
+        st.error(f"❌ {problem}. No email was queued.")
+        return []
+
+    now = time.time()
+    conn = _connect()
+    try:
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(
+                "INSERT OR IGNORE INTO outbox "
+                "(idempotency_key, kind, recipient, payload, status, attempts, next_attempt_at, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, 0, ?, ?, ?)",
+                [(key, kind, fields['recipient_email'], json.dumps(fields, default=str), PENDING, now, now, now)
+                 for kind, key, fields in emails]
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+
+    get_outbox_worker().wake()
+    return [key for _, key, _ in emails]
+
+
+def notification_emails(kind, submission, event_time, **fields):
+    """
+    Emails to the primary and (optional) secondary contact of a submission.
+
+    Returns:
+        list: (kind, idempotency_key, fields) ready for enqueue_emails
+    """
+    recipients = [(submission.get('email'), submission.get('contact_name'))]
+    secondary_email_addr = submission.get('secondary_email')
+    if secondary_email_addr and str(secondary_email_addr).strip():
+        recipients.append((secondary_email_addr, submission.get('secondary_contact_name') or "Secondary Contact"))
+
+    emails = []
+    for recipient, contact in recipients:
+        if not recipient or not str(recipient).strip():
+            continue
+        key = make_idempotency_key(kind, submission.get('hospital_name'), event_time, recipient)
+        emails.append((kind, key, dict(
+            fields,
+            recipient_email=str(recipient).strip(),
+            hospital_name=submission.get('hospital_name'),
+            contact_name=contact,
+        )))
+    return emails
+
+
+def get_delivery_status(keys):
+    """
+    Look up delivery status for the given idempotency keys.
+
+    Returns:
+        dict: key -> {'status', 'attempts', 'last_error', 'recipient'}
+    """
+    keys = list(keys)
+    if not keys:
+        return {}
+
+    conn = _connect()
+    try:
+        placeholders = ','.join('?' * len(keys))
+        rows = conn.execute(
+            f"SELECT idempotency_key, status, attempts, last_error, recipient "
+            f"FROM outbox WHERE idempotency_key IN ({placeholders})",
+            keys
+        ).fetchall()
+    finally:
+        conn.close()
+    return {row['idempotency_key']: dict(row) for row in rows}
+
+
+# ==================== BACKGROUND WORKER ====================
+class OutboxWorker:
+    """Daemon thread that delivers due outbox emails with retries and backoff."""
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="email-outbox", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def wake(self):
+        self._wakeup.set()
+
+    def _claim_next(self, conn):
+        """
+        Atomically mark the next due email as 'sending' and return it. A 'sending' claim
+        older than SENDING_LEASE was abandoned by a worker that stopped mid-send and is due again.
+        """
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT * FROM outbox WHERE (status = ? AND next_attempt_at <= ?) OR (status = ? AND updated_at <= ?) "
+                "ORDER BY next_attempt_at LIMIT 1",
+                (PENDING, now, SENDING, now - SENDING_LEASE)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE outbox SET status = ?, attempts = attempts + 1, updated_at = ? "
+                    "WHERE idempotency_key = ?",
+                    (SENDING, now, row['idempotency_key'])
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return row
+
+    def _deliver(self, conn, row):
+        from email_sender import deliver_email
+        from audit_log import log_event, EMAIL_SENT, EMAIL_FAILED
+
+        attempts = row['attempts'] + 1
+        payload = json.loads(row['payload'])
+        try:
+            deliver_email(row['kind'], **payload)
+        except Exception as e:
+            if self._reschedule(conn, row, e) == FAILED:
+                log_event(EMAIL_FAILED, payload.get('hospital_name'), 'outbox', kind=row['kind'],
+                          recipient=row['recipient'], attempts=attempts, error=str(e)[:200])
+            return
+        
+        # The email is out: from here on nothing may send it back to 'pending'
+        self._mark_sent(conn, row)
+        try:
+            log_event(EMAIL_SENT, payload.get('hospital_name'), 'outbox', kind=row['kind'],
+                      recipient=row['recipient'], attempts=attempts)
+        except Exception:
+            logger.exception("Could not audit-log sent outbox email %s", row['idempotency_key'])
+
+    def _mark_sent(self, conn, row):
+        """
+        Record a delivered email as 'sent', retrying (e.g. 'database is locked') until it sticks.
+        A delivered email is never rescheduled, so a bookkeeping failure can't send it twice.
+        """
+        delay = 1
+        while True:
+            try:
+                conn.execute(
+                    "UPDATE outbox SET status = ?, last_error = NULL, updated_at = ? WHERE idempotency_key = ?",
+                    (SENT, time.time(), row['idempotency_key'])
+                )
+                return
+            except sqlite3.Error:
+                logger.exception("Could not mark outbox email %s sent; retrying in %ss", row['idempotency_key'], delay)
+                time.sleep(delay)
+                delay = min(delay * 2, POLL_INTERVAL * 12)
+
+    def _reschedule(self, conn, row, error):
+        """
+        Put a claimed email back to 'pending' with backoff, or mark it 'failed'
+        once it has used up MAX_ATTEMPTS. Only a row still 'sending' is touched.
+
+        Returns:
+            str: The new status
+        """
+        attempts = row['attempts'] + 1
+        now = time.time()
+        if attempts >= MAX_ATTEMPTS:
+            status, next_at = FAILED, now
+        else:
+            status = PENDING
+            next_at = now + min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX)
+        conn.execute(
+            "UPDATE outbox SET status = ?, next_attempt_at = ?, last_error = ?, updated_at = ? "
+            "WHERE idempotency_key = ? AND status = ?",
+            (status, next_at, str(error)[:500], now, row['idempotency_key'], SENDING)
+        )
+        return status
+
+    def _run(self):
+        conn = None
+        while True:
+            row = None
+            try:
+                conn = conn or _connect(self.db_path)
+                row = self._claim_next(conn)
+                if row is not None:
+                    self._deliver(conn, row)
+            except Exception as e:
+                # The worker must outlive any one email: log, release the claimed row, keep looping
+                logger.exception("Email outbox worker error")
+                if conn is not None:
+                    conn.close()
+                    conn = None
+                if row is not None:
+                    try:
+                        conn = _connect(self.db_path)
+                        self._reschedule(conn, row, e)
+                    except Exception:
+                        logger.exception("Could not reschedule outbox email %s", row['idempotency_key'])
+                        conn = None
+                self._wakeup.wait(POLL_INTERVAL)
+                self._wakeup.clear()
+                continue
+            if row is None:
+                self._wakeup.wait(POLL_INTERVAL)
+                self._wakeup.clear()
+
+
+@st.cache_resource(show_spinner=False)
+def get_outbox_worker():
+    """Start (once per process) and return the outbox delivery worker"""
+    return OutboxWorker().start()
@@ -5,62 +5,288 @@ Sends emails on submission and approval
 
 import streamlit as st
 import smtplib
+import html
+import re
+import queue
+import threading
+import time
+from contextlib import contextmanager
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
+from html.parser import HTMLParser
 
-def get_email_config():
-    """Get email configuration from Streamlit secrets"""
+from settings import get_settings, SettingsError
+
+# SMTP connection pool settings
+SMTP_POOL_SIZE = 2          # Default sessions kept open per sender account (email.pool_size)
+SMTP_TIMEOUT = 30           # Socket timeout (seconds)
+SMTP_NOOP_AFTER = 10        # Check idle sessions with NOOP after this many seconds
+SMTP_MAX_IDLE = 240         # Drop sessions idle longer than this (servers close them anyway)
+
+def email_config_problem():
+    """Why email can't be sent ('' when it is configured)"""
     try:
-        return {
-            'smtp_server': st.secrets.get("email", {}).get("smtp_server", "smtp.gmail.com"),
-            'smtp_port': st.secrets.get("email", {}).get("smtp_port", 587),
-            'sender_email': st.secrets["email"]["sender_email"],
-            'sender_password': st.secrets["email"]["sender_password"],
-            'sender_name': st.secrets.get("email", {}).get("sender_name", "HSCRC Survey System")
-        }
-    except Exception as e:
-        st.error(f"❌ Email configuration not found in secrets: {str(e)}")
+        settings = get_settings()
+    except SettingsError:
+        # Reported once at app startup (see settings.require_settings)
+        return "Invalid configuration in .streamlit/secrets.toml"
+    if settings.email is None:
+        return "Email configuration not found in secrets: " + "; ".join(settings.email_problems)
+    return ''
+
+def get_email_config():
+    """Get email configuration from the cached app settings (None, with an error shown, if missing)"""
+    problem = email_config_problem()
+    if problem:
+        st.error(f"❌ {problem}")
         return None
+    return get_settings().email.as_config()
 
-def send_submission_email(recipient_email, hospital_name, contact_name, submission_data):
+# ==================== SMTP CONNECTION POOL ====================
+class SMTPConnectionPool:
     """
-    Send email notification when hospital submits survey
-    
-    Args:
-        recipient_email: Hospital's email address
-        hospital_name: Name of the hospital
-        contact_name: Name of contact person
-        submission_data: Dictionary with submission details
+    Thread-safe pool of authenticated SMTP sessions.
+
+    Sessions are opened (connect + STARTTLS + login) on demand and returned
+    to the pool after use, so back-to-back sends reuse one handshake.
+    Idle sessions are checked with NOOP before reuse and replaced if dead.
     """
-    config = get_email_config()
-    if not config:
-        return False
-    
-    try:
-        # Create message
+
+    def __init__(self, smtp_server, smtp_port, sender_email, sender_password,
+                 use_tls=True, max_size=SMTP_POOL_SIZE, timeout=SMTP_TIMEOUT):
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.sender_email = sender_email
+        self.sender_password = sender_password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=max_size)
+        self._lock = threading.Lock()
+        self.handshakes = 0
+
+    def _connect(self):
+        """Open a new authenticated session."""
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                server.starttls()
+            server.login(self.sender_email, self.sender_password)
+        except Exception:
+            self._close(server)
+            raise
+        with self._lock:
+            self.handshakes += 1
+        return server
+
+    @staticmethod
+    def _close(server):
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    @staticmethod
+    def _is_alive(server):
+        try:
+            return server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _acquire(self):
+        """Take a live session from the pool, or open a new one."""
+        while True:
+            try:
+                server, last_used = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+
+            idle_for = time.monotonic() - last_used
+            if idle_for > SMTP_MAX_IDLE:
+                self._close(server)
+            elif idle_for > SMTP_NOOP_AFTER and not self._is_alive(server):
+                self._close(server)
+            else:
+                return server
+
+    def _release(self, server):
+        try:
+            self._idle.put_nowait((server, time.monotonic()))
+        except queue.Full:
+            self._close(server)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a session; broken sessions are discarded instead of returned."""
+        server = self._acquire()
+        try:
+            yield server
+        except smtplib.SMTPServerDisconnected:
+            self._close(server)
+            raise
+        except smtplib.SMTPException:
+            # Protocol-level errors (e.g. rejected recipient) leave the session usable;
+            # caught before OSError, which SMTPException subclasses
+            self._release(server)
+            raise
+        except OSError:
+            self._close(server)
+            raise
+        except Exception:
+            self._release(server)
+            raise
+        else:
+            self._release(server)
+
+    def send_message(self, msg):
+        """Send a message, reconnecting once if a pooled session has gone stale."""
+        try:
+            with self.connection() as server:
+                server.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            with self.connection() as server:
+                server.send_message(msg)
+
+    def close_all(self):
+        """Close every idle session."""
+        while True:
+            try:
+                server, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(server)
+
+
+@st.cache_resource(show_spinner=False)
+def _get_smtp_pool(smtp_server, smtp_port, sender_email, sender_password, use_tls, max_size):
+    return SMTPConnectionPool(smtp_server, smtp_port, sender_email, sender_password, use_tls, max_size)
+
+def get_smtp_pool(config):
+    """Get the process-wide SMTP pool for this email configuration"""
+    return _get_smtp_pool(
+        config['smtp_server'], int(config['smtp_port']),
+        config['sender_email'], config['sender_password'],
+        bool(config.get('use_tls', True)),
+        int(config.get('pool_size', SMTP_POOL_SIZE))
+    )
+
+# ==================== TEMPLATES ====================
+_PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+class _TextExtractor(HTMLParser):
+    """Turns template HTML into readable plain text (keeps {{ placeholders }})."""
+
+    BLOCK_TAGS = {'p', 'div', 'h1', 'h2', 'h3', 'ul', 'li', 'br', 'tr'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.chunks = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ('head', 'style'):
+            self._skip += 1
+        elif tag == 'li':
+            self.chunks.append('\n- ')
+        elif tag in self.BLOCK_TAGS:
+            self.chunks.append('\n')
+
+    def handle_endtag(self, tag):
+        if tag in ('head', 'style'):
+            self._skip -= 1
+        elif tag in self.BLOCK_TAGS and tag != 'li':
+            self.chunks.append('\n')
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.chunks.append(re.sub(r"\s+", " ", data))
+
+    def text(self):
+        lines = (line.strip() for line in ''.join(self.chunks).split('\n'))
+        return re.sub(r"\n{3,}", "\n\n", '\n'.join(lines)).strip() + '\n'
+
+
+def _compile(source):
+    """Split template source into (is_field, text) segments."""
+    segments = []
+    pos = 0
+    for match in _PLACEHOLDER.finditer(source):
+        if match.start() > pos:
+            segments.append((False, source[pos:match.start()]))
+        segments.append((True, match.group(1)))
+        pos = match.end()
+    if pos < len(source):
+        segments.append((False, source[pos:]))
+    return tuple(segments)
+
+
+class EmailTemplate:
+    """
+    Notification template compiled once at import time.
+
+    The HTML (including the static <head>/CSS block) is split into literal
+    and {{ field }} segments up front, and a plain-text alternative is
+    derived from it once. Rendering only substitutes per-recipient fields.
+    """
+
+    def __init__(self, subject, html):
+        self._subject = _compile(subject)
+        self._html = _compile(html)
+        extractor = _TextExtractor()
+        extractor.feed(html)
+        self._text = _compile(extractor.text())
+
+    @staticmethod
+    def _render(segments, fields, escape):
+        return ''.join(
+            (escape(str(fields.get(text, ''))) if is_field else text)
+            for is_field, text in segments
+        )
+
+    def render(self, **fields):
+        """Return (subject, html, text) for these fields."""
+        subject = self._render(self._subject, fields, str)
+        html_body = self._render(self._html, fields, html.escape)
+        text_body = self._render(self._text, fields, str)
+        return subject, html_body, text_body
+
+    def build_message(self, config, recipient_email, **fields):
+        """Build a multipart/alternative message (plain text + HTML)."""
+        subject, html_body, text_body = self.render(**fields)
         msg = MIMEMultipart('alternative')
-        msg['Subject'] = f"HSCRC Survey Submitted - {hospital_name}"
+        msg['Subject'] = subject
         msg['From'] = f"{config['sender_name']} <{config['sender_email']}>"
         msg['To'] = recipient_email
-        
-        # Email body
-        bp1 = submission_data.get('bp1', 'N/A')
-        bp1_tier = submission_data.get('bp1_tier', 'N/A')
-        bp2 = submission_data.get('bp2', 'N/A')
-        bp2_tier = submission_data.get('bp2_tier', 'N/A')
-        timestamp = submission_data.get('timestamp', datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        
-        html_content = f"""
+        msg.attach(MIMEText(text_body, 'plain', 'utf-8'))
+        msg.attach(MIMEText(html_body, 'html', 'utf-8'))
+        return msg
+
+
+_FOOTER = """
+            <div class="footer">
+                <p>Maryland Health Services Cost Review Commission</p>
+                <p>This is an automated message. Please do not reply to this email.</p>
+            </div>
+        </body>
+        </html>
+"""
+
+SUBMISSION_TEMPLATE = EmailTemplate(
+    subject="HSCRC Survey Submitted - {{ hospital_name }}",
+    html="""
         <html>
         <head>
             <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .header {{ background-color: #0066cc; color: white; padding: 20px; text-align: center; }}
-                .content {{ padding: 20px; }}
-                .info-box {{ background-color: #f8f9fa; padding: 15px; border-left: 4px solid #0066cc; margin: 15px 0; }}
-                .footer {{ background-color: #f8f9fa; padding: 15px; text-align: center; font-size: 12px; color: #666; }}
-                .button {{ background-color: #0066cc; color: white; padding: 12px 24px; text-decoration: none; border-radius: 5px; display: inline-block; margin: 10px 0; }}
+                body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+                .header { background-color: #0066cc; color: white; padding: 20px; text-align: center; }
+                .content { padding: 20px; }
+                .info-box { background-color: #f8f9fa; padding: 15px; border-left: 4px solid #0066cc; margin: 15px 0; }
+                .footer { background-color: #f8f9fa; padding: 15px; text-align: center; font-size: 12px; color: #666; }
+                .button { background-color: #0066cc; color: white; padding: 12px 24px; text-decoration: none; border-radius: 5px; display: inline-block; margin: 10px 0; }
             </style>
         </head>
         <body>
@@ -69,21 +295,21 @@ def send_submission_email(recipient_email, hospital_name, contact_name, submissi
             </div>
             
             <div class="content">
-                <p>Dear {contact_name},</p>
+                <p>Dear {{ contact_name }},</p>
                 
-                <p>Thank you for submitting your HSCRC Best Practices Survey for <strong>{hospital_name}</strong>.</p>
+                <p>Thank you for submitting your HSCRC Best Practices Survey for <strong>{{ hospital_name }}</strong>.</p>
                 
                 <div class="info-box">
                     <h3>📋 Submission Summary</h3>
-                    <p><strong>Submitted:</strong> {timestamp}</p>
-                    <p><strong>Hospital:</strong> {hospital_name}</p>
-                    <p><strong>Contact:</strong> {contact_name}</p>
+                    <p><strong>Submitted:</strong> {{ timestamp }}</p>
+                    <p><strong>Hospital:</strong> {{ hospital_name }}</p>
+                    <p><strong>Contact:</strong> {{ contact_name }}</p>
                 </div>
                 
                 <div class="info-box">
                     <h3>🎯 Best Practices Selected</h3>
-                    <p><strong>First Best Practice:</strong> {bp1} (Tier {bp1_tier})</p>
-                    <p><strong>Second Best Practice:</strong> {bp2} (Tier {bp2_tier})</p>
+                    <p><strong>First Best Practice:</strong> {{ bp1 }} (Tier {{ bp1_tier }})</p>
+                    <p><strong>Second Best Practice:</strong> {{ bp2 }} (Tier {{ bp2_tier }})</p>
                 </div>
                 
                 <p><strong>Status:</strong> 📝 DRAFT - Your submission is currently under review by HSCRC staff.</p>
@@ -97,63 +323,21 @@ def send_submission_email(recipient_email, hospital_name, contact_name, submissi
                 
                 <p>You will receive another email once your submission has been approved by HSCRC staff.</p>
             </div>
-            
-            <div class="footer">
-                <p>Maryland Health Services Cost Review Commission</p>
-                <p>This is an automated message. Please do not reply to this email.</p>
-            </div>
-        </body>
-        </html>
-        """
-        
-        # Attach HTML content
-        msg.attach(MIMEText(html_content, 'html'))
-        
-        # Send email
-        with smtplib.SMTP(config['smtp_server'], config['smtp_port']) as server:
-            server.starttls()
-            server.login(config['sender_email'], config['sender_password'])
-            server.send_message(msg)
-        
-        return True
-        
-    except Exception as e:
-        st.error(f"❌ Failed to send submission email: {str(e)}")
-        return False
+""" + _FOOTER
+)
 
-def send_approval_email(recipient_email, hospital_name, contact_name, approved_by, approved_at):
-    """
-    Send email notification when submission is approved
-    
-    Args:
-        recipient_email: Hospital's email address
-        hospital_name: Name of the hospital
-        contact_name: Name of contact person
-        approved_by: Name of person who approved
-        approved_at: Timestamp of approval
-    """
-    config = get_email_config()
-    if not config:
-        return False
-    
-    try:
-        # Create message
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = f"✅ HSCRC Survey APPROVED - {hospital_name}"
-        msg['From'] = f"{config['sender_name']} <{config['sender_email']}>"
-        msg['To'] = recipient_email
-        
-        # Email body
-        html_content = f"""
+APPROVAL_TEMPLATE = EmailTemplate(
+    subject="✅ HSCRC Survey APPROVED - {{ hospital_name }}",
+    html="""
         <html>
         <head>
             <style>
-                body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                .header {{ background-color: #28a745; color: white; padding: 20px; text-align: center; }}
-                .content {{ padding: 20px; }}
-                .info-box {{ background-color: #d4edda; padding: 15px; border-left: 4px solid #28a745; margin: 15px 0; }}
-                .footer {{ background-color: #f8f9fa; padding: 15px; text-align: center; font-size: 12px; color: #666; }}
-                .checkmark {{ font-size: 48px; color: #28a745; text-align: center; margin: 20px 0; }}
+                body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+                .header { background-color: #28a745; color: white; padding: 20px; text-align: center; }
+                .content { padding: 20px; }
+                .info-box { background-color: #d4edda; padding: 15px; border-left: 4px solid #28a745; margin: 15px 0; }
+                .footer { background-color: #f8f9fa; padding: 15px; text-align: center; font-size: 12px; color: #666; }
+                .checkmark { font-size: 48px; color: #28a745; text-align: center; margin: 20px 0; }
             </style>
         </head>
         <body>
@@ -164,15 +348,15 @@ def send_approval_email(recipient_email, hospital_name, contact_name, approved_b
             <div class="content">
                 <div class="checkmark">✓</div>
                 
-                <p>Dear {contact_name},</p>
+                <p>Dear {{ contact_name }},</p>
                 
-                <p>Great news! Your HSCRC Best Practices Survey for <strong>{hospital_name}</strong> has been officially approved.</p>
+                <p>Great news! Your HSCRC Best Practices Survey for <strong>{{ hospital_name }}</strong> has been officially approved.</p>
                 
                 <div class="info-box">
                     <h3>✅ Approval Details</h3>
-                    <p><strong>Hospital:</strong> {hospital_name}</p>
-                    <p><strong>Approved By:</strong> {approved_by}</p>
-                    <p><strong>Approved On:</strong> {approved_at}</p>
+                    <p><strong>Hospital:</strong> {{ hospital_name }}</p>
+                    <p><strong>Approved By:</strong> {{ approved_by }}</p>
+                    <p><strong>Approved On:</strong> {{ approved_at }}</p>
                 </div>
                 
                 <p><strong>What this means:</strong></p>
@@ -186,24 +370,154 @@ def send_approval_email(recipient_email, hospital_name, contact_name, approved_b
                 
                 <p>If you need to make any changes to your approved submission, please contact HSCRC staff directly.</p>
             </div>
+""" + _FOOTER
+)
+
+REMINDER_TEMPLATE = EmailTemplate(
+    subject="Reminder: HSCRC Best Practices Survey - {{ hospital_name }}",
+    html="""
+        <html>
+        <head>
+            <style>
+                body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+                .header { background-color: #f39c12; color: white; padding: 20px; text-align: center; }
+                .content { padding: 20px; }
+                .info-box { background-color: #fff3cd; padding: 15px; border-left: 4px solid #f39c12; margin: 15px 0; }
+                .footer { background-color: #f8f9fa; padding: 15px; text-align: center; font-size: 12px; color: #666; }
+            </style>
+        </head>
+        <body>
+            <div class="header">
+                <h1>⏰ Survey Reminder</h1>
+            </div>
             
-            <div class="footer">
-                <p>Maryland Health Services Cost Review Commission</p>
-                <p>This is an automated message. Please do not reply to this email.</p>
+            <div class="content">
+                <p>Dear {{ contact_name }},</p>
+                
+                <p>This is a friendly reminder that the HSCRC Best Practices Survey for <strong>{{ hospital_name }}</strong> has not been submitted yet.</p>
+                
+                <div class="info-box">
+                    <h3>📋 Current Status</h3>
+                    <p><strong>Hospital:</strong> {{ hospital_name }}</p>
+                    <p><strong>Status:</strong> {{ status }}</p>
+                </div>
+                
+                <p>Please log into the hospital portal to complete and submit your survey.</p>
+                
+                <p>If you have questions, please contact HSCRC staff.</p>
             </div>
-        </body>
-        </html>
-        """
-        
-        # Attach HTML content
-        msg.attach(MIMEText(html_content, 'html'))
-        
-        # Send email
-        with smtplib.SMTP(config['smtp_server'], config['smtp_port']) as server:
-            server.starttls()
-            server.login(config['sender_email'], config['sender_password'])
-            server.send_message(msg)
+""" + _FOOTER
+)
+
+# ==================== MESSAGES ====================
+def build_submission_message(config, recipient_email, hospital_name, contact_name, submission_data):
+    """Build the message sent when a hospital submits its survey"""
+    return SUBMISSION_TEMPLATE.build_message(
+        config, recipient_email,
+        hospital_name=hospital_name,
+        contact_name=contact_name,
+        bp1=submission_data.get('bp1', 'N/A'),
+        bp1_tier=submission_data.get('bp1_tier', 'N/A'),
+        bp2=submission_data.get('bp2', 'N/A'),
+        bp2_tier=submission_data.get('bp2_tier', 'N/A'),
+        timestamp=submission_data.get('timestamp', datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+    )
+
+def build_approval_message(config, recipient_email, hospital_name, contact_name, approved_by, approved_at):
+    """Build the message sent when a submission is approved"""
+    return APPROVAL_TEMPLATE.build_message(
+        config, recipient_email,
+        hospital_name=hospital_name,
+        contact_name=contact_name,
+        approved_by=approved_by,
+        approved_at=approved_at
+    )
+
+def build_reminder_message(config, recipient_email, hospital_name, contact_name, status):
+    """Build the reminder sent to hospitals that have not submitted yet"""
+    return REMINDER_TEMPLATE.build_message(
+        config, recipient_email,
+        hospital_name=hospital_name,
+        contact_name=contact_name,
+        status=status
+    )
+
+EMAIL_BUILDERS = {
+    'submission': build_submission_message,
+    'approval': build_approval_message,
+    'reminder': build_reminder_message,
+}
+
+def deliver_email(kind, config=None, **fields):
+    """
+    Build and send one notification, raising on failure.
+    Used by the background outbox worker, which handles retries itself.
+    
+    Args:
+        kind: 'submission', 'approval' or 'reminder'
+        config: Email configuration (read from secrets when omitted)
+        **fields: Keyword arguments for the matching message builder
+    """
+    if not config:
+        problem = email_config_problem()
+        if problem:
+            raise RuntimeError(problem)
+        config = get_settings().email.as_config()
+    
+    msg = EMAIL_BUILDERS[kind](config, **fields)
+    
+    # Send email (reuses a pooled, already authenticated session)
+    get_smtp_pool(config).send_message(msg)
+
+# ==================== NOTIFICATIONS ====================
+def send_submission_email(recipient_email, hospital_name, contact_name, submission_data):
+    """
+    Send email notification when hospital submits survey
+    
+    Args:
+        recipient_email: Hospital's email address
+        hospital_name: Name of the hospital
+        contact_name: Name of contact person
+        submission_data: Dictionary with submission details
+    """
+    config = get_email_config()
+    if not config:
+        return False
+    
+    try:
+        deliver_email('submission', config,
+                      recipient_email=recipient_email,
+                      hospital_name=hospital_name,
+                      contact_name=contact_name,
+                      submission_data=submission_data)
+        return True
         
+    except Exception as e:
+        st.error(f"❌ Failed to send submission email: {str(e)}")
+        return False
+
+def send_approval_email(recipient_email, hospital_name, contact_name, approved_by, approved_at):
+    """
+    Send email notification when submission is approved
+    
+    Args:
+        recipient_email: Hospital's email address
+        hospital_name: Name of the hospital
+        contact_name: Name of contact person
+        approved_by: Name of person who approved
+        approved_at: Timestamp of approval
+    """
+    config = get_email_config()
+    if not config:
+        return False
+    
+    try:
+        deliver_email('approval', config,
+                      recipient_email=recipient_email,
+                      hospital_name=hospital_name,
+                      contact_name=contact_name,
+                      approved_by=approved_by,
+                      approved_at=approved_at)
         return True
         
     except Exception as e:
@@ -218,7 +532,8 @@ def test_email_config():
     
     try:
         with smtplib.SMTP(config['smtp_server'], config['smtp_port']) as server:
-            server.starttls()
+            if config.get('use_tls', True):
+                server.starttls()
             server.login(config['sender_email'], config['sender_password'])
         return True
     except Exception as e:
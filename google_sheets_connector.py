@@ -4,69 +4,239 @@ Each hospital has ONE row that gets updated
 """
 
 import streamlit as st
-import gspread
-from google.oauth2.service_account import Credentials
 import pandas as pd
 
-# Google Sheets configuration
-SPREADSHEET_NAME = "HSCRC Survey Submissions"
+from settings import get_settings, CYCLE_NAME
+from survey_schema import sheet_columns, is_blank, CORE_COLUMNS, BP_SLOTS
+from long_format import LONG_COLUMNS, split_submission, to_wide
+
+# Google Sheets configuration (spreadsheet name and credentials come from settings)
 SCOPES = [
     "https://www.googleapis.com/auth/spreadsheets",
     "https://www.googleapis.com/auth/drive"
 ]
 
+ROW_INDEX_TTL = 300     # Seconds the hospital -> row index is trusted before it is re-read
+CYCLE_SHEET_ROWS = 100  # Initial size of a new reporting cycle's worksheet (grows on append)
+ANSWERS_SHEET_SUFFIX = " answers"   # Long layout: "<cycle worksheet> answers" holds the BP answers
+
 @st.cache_resource
+def _authorize(service_account_items):
+    # gspread / google-auth are imported on first connection, not at app start
+    import gspread
+    from google.oauth2.service_account import Credentials
+    
+    credentials = Credentials.from_service_account_info(dict(service_account_items), scopes=SCOPES)
+    return gspread.authorize(credentials)
+
 def get_google_sheets_connection():
     """
     Establish connection to Google Sheets using service account credentials.
-    This connection is cached and reused across the app.
+    This connection is cached and reused across the app (and re-created if
+    the credentials in settings change).
     """
     try:
-        credentials = Credentials.from_service_account_info(
-            st.secrets["gcp_service_account"],
-            scopes=SCOPES
-        )
-        client = gspread.authorize(credentials)
-        return client
+        service_account = get_settings().sheets.service_account
+        return _authorize(tuple(sorted(service_account.items())))
     except Exception as e:
         st.error(f"❌ Failed to connect to Google Sheets: {str(e)}")
         st.stop()
 
-def get_worksheet():
-    """Get the active worksheet from the Google Sheet."""
+@st.cache_resource(show_spinner=False)
+def _open_spreadsheet(service_account_items, spreadsheet_name):
+    # Opening by name searches Drive and fetches sheet metadata, so it is done once per process
+    return _authorize(service_account_items).open(spreadsheet_name)
+
+@st.cache_resource(show_spinner=False)
+def _open_worksheet(service_account_items, spreadsheet_name, cycle):
+    from gspread.exceptions import WorksheetNotFound
+    
+    spreadsheet = _open_spreadsheet(service_account_items, spreadsheet_name)
+    if not cycle:
+        return spreadsheet.sheet1
+    # Each reporting cycle has its own worksheet, created the first time the cycle is used
     try:
-        client = get_google_sheets_connection()
-        spreadsheet = client.open(SPREADSHEET_NAME)
-        worksheet = spreadsheet.sheet1
-        return worksheet
+        return spreadsheet.worksheet(cycle)
+    except WorksheetNotFound:
+        return spreadsheet.add_worksheet(title=cycle, rows=CYCLE_SHEET_ROWS, cols=len(sheet_columns()))
+
+def get_worksheet(cycle=None):
+    """
+    Get a reporting cycle's worksheet from the Google Sheet (opened once and reused).
+    Defaults to the active cycle (settings sheets.cycle; the first worksheet if unset).
+    """
+    try:
+        sheets = get_settings().sheets
+        cycle = sheets.cycle if cycle is None else cycle
+        # Checked before anything is opened, so a bad name never creates a stray worksheet
+        if cycle and not CYCLE_NAME.match(cycle):
+            raise ValueError(f"'{cycle}' is not a valid reporting cycle name")
+        return _open_worksheet(tuple(sorted(sheets.service_account.items())), sheets.spreadsheet_name, cycle)
     except Exception as e:
         st.error(f"❌ Error accessing worksheet: {str(e)}")
         st.stop()
 
-def load_data_from_sheets():
-    """Load all data from Google Sheets as a pandas DataFrame."""
+@st.cache_resource(show_spinner=False)
+def _open_answers_worksheet(service_account_items, spreadsheet_name, title):
+    from gspread.exceptions import WorksheetNotFound
+    
+    spreadsheet = _open_spreadsheet(service_account_items, spreadsheet_name)
     try:
-        worksheet = get_worksheet()
+        return spreadsheet.worksheet(title)
+    except WorksheetNotFound:
+        worksheet = spreadsheet.add_worksheet(title=title, rows=CYCLE_SHEET_ROWS, cols=len(LONG_COLUMNS))
+        worksheet.update('A1', [LONG_COLUMNS])
+        return worksheet
+
+def get_answers_worksheet(cycle=None):
+    """Long layout: the worksheet of (hospital_name, slot, bp, field, value) rows paired with a cycle's worksheet."""
+    sheets = get_settings().sheets
+    title = get_worksheet(cycle).title + ANSWERS_SHEET_SUFFIX
+    return _open_answers_worksheet(tuple(sorted(sheets.service_account.items())), sheets.spreadsheet_name, title)
+
+def _long_layout():
+    return get_settings().storage.layout == 'long'
+
+def _answer_records(cycle=None):
+    records = get_answers_worksheet(cycle).get_all_records()
+    return pd.DataFrame(records).reindex(columns=LONG_COLUMNS)
+
+@st.cache_data(ttl=ROW_INDEX_TTL, show_spinner=False)
+def _answer_row_index(spreadsheet_name, cycle):
+    """Long layout: hospital_name -> sheet row numbers of its rows in a cycle's answers worksheet"""
+    rows = {}
+    for index, name in enumerate(get_answers_worksheet(cycle).col_values(1)):
+        if index > 0 and name:
+            rows.setdefault(name, []).append(index + 1)
+    return rows
+
+def _hospital_answers(hospital_name):
+    """
+    Long layout: one hospital's rows of the active cycle's answers worksheet, read on their own
+    (row numbers from a cached index, all rows in one request), like get_row for the main sheet.
+
+    Returns:
+        list: (row number, [hospital_name, slot, bp, field, value]) with values as text
+    """
+    sheets = get_settings().sheets
+    worksheet = get_answers_worksheet()
+    for attempt in range(2):
+        row_numbers = _answer_row_index(sheets.spreadsheet_name, sheets.cycle).get(hospital_name, [])
+        if not row_numbers:
+            return []
+        ranges = worksheet.batch_get([f'A{row_number}:E{row_number}' for row_number in row_numbers])
+        rows = [
+            (row_number, ((list(cells[0]) if cells else []) + [''] * len(LONG_COLUMNS))[:len(LONG_COLUMNS)])
+            for row_number, cells in zip(row_numbers, ranges)
+        ]
+        if all(row[0] == hospital_name for _, row in rows):
+            return rows
+        
+        # Answer rows were added or deleted since the index was built
+        _answer_row_index.clear()
+    return []
+
+def current_cycle():
+    """Name of the active reporting cycle (its worksheet title)."""
+    return get_settings().sheets.cycle or get_worksheet().title
+
+def _get_spreadsheet():
+    sheets = get_settings().sheets
+    return _open_spreadsheet(tuple(sorted(sheets.service_account.items())), sheets.spreadsheet_name)
+
+def list_cycle_worksheets():
+    """Titles of every cycle worksheet in the spreadsheet (answers worksheets and other names left out)."""
+    return [
+        worksheet.title for worksheet in _get_spreadsheet().worksheets()
+        if CYCLE_NAME.match(worksheet.title) and not worksheet.title.endswith(ANSWERS_SHEET_SUFFIX)
+    ]
+
+def load_data_from_sheets(cycle=None):
+    """Load all data for a reporting cycle (default: the active one) as a pandas DataFrame."""
+    try:
+        worksheet = get_worksheet(cycle)
         records = worksheet.get_all_records()
         
         if not records:
-            return pd.DataFrame(columns=[
-                'timestamp', 'hospital_name', 'contact_name', 'email', 'phone',
-                'bp1', 'bp1_tier', 'bp2', 'bp2_tier',
-                'bp1_rationale', 'bp1_success', 'bp2_rationale', 'bp2_success',
-                'approved', 'approved_by', 'approved_at'
-            ])
+            return pd.DataFrame(columns=list(sheet_columns()))
         
         df = pd.DataFrame(records)
         df.columns = df.columns.str.strip()
+        if _long_layout():
+            # BP answers live in the answers worksheet; pivot them back into bp{n}_ columns
+            df = to_wide(df, _answer_records(cycle))
         return df
     except Exception as e:
         st.error(f"❌ Error loading data from Google Sheets: {str(e)}")
         return pd.DataFrame()
 
+def _first_rows(names):
+    """
+    hospital_name -> sheet row number of the hospital's first row. Every read and write
+    uses this, so a hospital with duplicate rows is always shown and edited in the same row.
+
+    Args:
+        names: The hospital_name column, header cell included
+    """
+    rows = {}
+    for index, name in enumerate(names):
+        if index > 0 and name:
+            rows.setdefault(name, index + 1)
+    return rows
+
+def _header_row(worksheet):
+    """The worksheet's header row with stray whitespace stripped (used for every lookup and write)."""
+    return [header.strip() for header in worksheet.row_values(1)]
+
+@st.cache_data(ttl=ROW_INDEX_TTL, show_spinner=False)
+def _hospital_row_index(spreadsheet_name, cycle):
+    """hospital_name -> sheet row number (see _first_rows) in a cycle's worksheet"""
+    worksheet = get_worksheet(cycle)
+    headers = _header_row(worksheet)
+    if 'hospital_name' not in headers:
+        return {}
+    return _first_rows(worksheet.col_values(headers.index('hospital_name') + 1))
+
+def get_row(hospital_name):
+    """
+    Read one hospital's row of the active cycle instead of the whole sheet.
+    The row number comes from a cached hospital -> row index; the header and the row are
+    fetched together in one request, and values are converted like get_all_records.
+    If the row no longer belongs to the hospital (rows moved in the sheet), the index is rebuilt once.
+
+    Returns:
+        dict: header -> value for the hospital's row, or None if it has no row
+
+    Raises:
+        Exception: any Google Sheets error (callers decide how to report it)
+    """
+    from gspread.utils import numericise_all
+
+    sheets = get_settings().sheets
+    for attempt in range(2):
+        row_number = _hospital_row_index(sheets.spreadsheet_name, sheets.cycle).get(hospital_name)
+        if row_number is None:
+            return None
+
+        header_range, row_range = get_worksheet().batch_get(['1:1', f'{row_number}:{row_number}'])
+        headers = [header.strip() for header in (header_range[0] if header_range else [])]
+        values = list(row_range[0]) if row_range else []
+        values += [''] * (len(headers) - len(values))
+        row = dict(zip(headers, numericise_all(values[:len(headers)])))
+        if row.get('hospital_name') == hospital_name:
+            if _long_layout():
+                answers = [answer for _, answer in _hospital_answers(hospital_name)]
+                values = numericise_all([value for _, _, _, _, value in answers])
+                row.update((f"{slot}_{field}", value) for (_, slot, _, field, _), value in zip(answers, values))
+            return row
+
+        # Rows were moved or deleted in the sheet since the index was built
+        _hospital_row_index.clear()
+    return None
+
 def save_or_update_submission(hospital_name, data_dict):
     """
-    Save or update a hospital's submission.
+    Save or update a hospital's submission for the active reporting cycle.
     If hospital exists, UPDATE the row.
     If hospital doesn't exist, APPEND a new row.
     
@@ -80,22 +250,25 @@ def save_or_update_submission(hospital_name, data_dict):
     try:
         worksheet = get_worksheet()
         
-        # Get all data
-        all_records = worksheet.get_all_records()
-        headers = worksheet.row_values(1)
+        # Long layout: BP answers go to the answers worksheet, only core fields to this row
+        answers = None
+        if _long_layout():
+            data_dict, answers = split_submission(data_dict)
+        
+        headers = _header_row(worksheet)
         
-        # If no headers exist, create them
+        # If no headers exist, create them (every schema column, so later hospitals' BPs fit)
         if not headers or headers == ['']:
-            headers = list(data_dict.keys())
-            worksheet.update('A1', [headers])
-            all_records = []
+            columns = CORE_COLUMNS if answers is not None else sheet_columns()
+            headers = _extend_header(worksheet, [], list(columns) + [key for key in data_dict if key not in columns])
+            names = []
+        else:
+            # Fields the sheet has no column for yet (e.g. a new question) get one instead of being dropped
+            headers = _extend_header(worksheet, headers, [key for key, value in data_dict.items() if not is_blank(value)])
+            names = worksheet.col_values(headers.index('hospital_name') + 1)
         
         # Find existing row for this hospital
-        hospital_row_index = None
-        for idx, record in enumerate(all_records):
-            if record.get('hospital_name') == hospital_name:
-                hospital_row_index = idx + 2  # +2 because: +1 for 0-index, +1 for header row
-                break
+        hospital_row_index = _first_rows(names).get(hospital_name)
         
         # Prepare row values in header order
         row_values = []
@@ -109,17 +282,206 @@ def save_or_update_submission(hospital_name, data_dict):
             # UPDATE existing row
             range_notation = f'A{hospital_row_index}'
             worksheet.update(range_notation, [row_values], value_input_option='USER_ENTERED')
-            return True
         else:
             # APPEND new row (first submission for this hospital)
             worksheet.append_row(row_values, value_input_option='USER_ENTERED')
-            return True
+            _hospital_row_index.clear()
+        
+        if answers is not None:
+            _write_answers(hospital_name, answers, _slot_bps(data_dict), replace=True)
+        return True
     
     except Exception as e:
         st.error(f"❌ Error saving to Google Sheets: {str(e)}")
         st.error(f"Data that failed to save: {data_dict.get('hospital_name', 'Unknown')}")
         return False
 
+def update_submission_fields(hospital_name, patch, fallback_data=None):
+    """
+    Write only the changed fields of a hospital's existing row (one batch request).
+    Missing columns are added to the header first; falls back to a full
+    save_or_update_submission with fallback_data when the hospital has no row yet.
+    
+    Args:
+        hospital_name: Name of the hospital
+        patch: Dictionary of column -> new value (only the fields that changed)
+        fallback_data: Full submission used if a patch can't be applied
+    
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    if not patch:
+        return True
+    
+    try:
+        worksheet = get_worksheet()
+        headers = _header_row(worksheet)
+        
+        # Long layout: changed BP answers are upserted in the answers worksheet
+        answer_patch = None
+        if _long_layout():
+            patch, answer_patch = split_submission(patch)
+        
+        hospital_row_index = None
+        if 'hospital_name' in headers:
+            hospital_row_index = _first_rows(worksheet.col_values(headers.index('hospital_name') + 1)).get(hospital_name)
+        
+        if hospital_row_index is None:
+            if fallback_data is None:
+                st.error(f"❌ Can't update {hospital_name}: row not found")
+                return False
+            return save_or_update_submission(hospital_name, fallback_data)
+        
+        headers = _extend_header(worksheet, headers, [key for key, value in patch.items() if not is_blank(value)])
+        patch = {key: value for key, value in patch.items() if key in headers}
+        if patch:
+            worksheet.batch_update(_patch_cells(headers, hospital_row_index, patch), value_input_option='USER_ENTERED')
+        if answer_patch is not None and (answer_patch or any(slot in patch for slot in BP_SLOTS)):
+            _write_answers(hospital_name, answer_patch, _slot_bps({**(fallback_data or {}), **patch}))
+        return True
+    
+    except Exception as e:
+        st.error(f"❌ Error saving to Google Sheets: {str(e)}")
+        st.error(f"Data that failed to save: {hospital_name}")
+        return False
+
+def update_submissions_fields(patches):
+    """
+    Write field changes to many hospitals' rows in one batch request (e.g. bulk approval).
+    Hospitals without a row are skipped; missing columns are added to the header first.
+    
+    Args:
+        patches: Dictionary of hospital_name -> {column: new value}
+    
+    Returns:
+        list: Hospitals whose rows were updated ([] on failure)
+    """
+    if not patches:
+        return []
+    
+    try:
+        worksheet = get_worksheet()
+        headers = _header_row(worksheet)
+        
+        if 'hospital_name' not in headers:
+            st.error("❌ Sheet is missing column(s): hospital_name")
+            return []
+        headers = _extend_header(worksheet, headers, [key for patch in patches.values() for key, value in patch.items() if not is_blank(value)])
+        
+        rows = _first_rows(worksheet.col_values(headers.index('hospital_name') + 1))
+        
+        updated = [hospital for hospital in patches if hospital in rows]
+        cells = []
+        for hospital in updated:
+            cells.extend(_patch_cells(headers, rows[hospital], patches[hospital]))
+        if cells:
+            worksheet.batch_update(cells, value_input_option='USER_ENTERED')
+        return updated
+    
+    except Exception as e:
+        st.error(f"❌ Error saving to Google Sheets: {str(e)}")
+        return []
+
+def _extend_header(worksheet, headers, keys):
+    """
+    Add a header cell for every key the sheet has no column for, in one batched request
+    that also grows the grid when the new columns don't fit.
+    
+    Args:
+        worksheet: The cycle worksheet
+        headers: Its header row as read by _header_row
+        keys: Columns the write needs
+    
+    Returns:
+        list: The header row including the new columns
+    """
+    missing = [key for key in dict.fromkeys(keys) if key not in headers]
+    if not missing:
+        return headers
+    
+    # The cached worksheet's grid size goes stale once columns are added, so read it fresh
+    spreadsheet = _get_spreadsheet()
+    metadata = spreadsheet.fetch_sheet_metadata({'fields': 'sheets.properties'})
+    grid_columns = next(
+        sheet['properties']['gridProperties']['columnCount']
+        for sheet in metadata['sheets'] if sheet['properties']['sheetId'] == worksheet.id
+    )
+    column_count = len(headers) + len(missing)
+    requests = []
+    if column_count > grid_columns:
+        requests.append({'appendDimension': {'sheetId': worksheet.id, 'dimension': 'COLUMNS',
+                                             'length': column_count - grid_columns}})
+    requests.append({'updateCells': {
+        'start': {'sheetId': worksheet.id, 'rowIndex': 0, 'columnIndex': len(headers)},
+        'rows': [{'values': [{'userEnteredValue': {'stringValue': key}} for key in missing]}],
+        'fields': 'userEnteredValue',
+    }})
+    spreadsheet.batch_update({'requests': requests})
+    return list(headers) + missing
+
+def _slot_bps(data):
+    """slot -> Best Practice chosen in it, for the slots the data sets."""
+    return {slot: str(data[slot]) for slot in BP_SLOTS if not is_blank(data.get(slot))}
+
+def _write_answers(hospital_name, answers, slot_bps, replace=False):
+    """
+    Long layout: upsert a hospital's rows in the answers worksheet with one read of just those
+    rows and at most three writes (changed values in place, cleared answers deleted, new answers appended).
+    
+    Args:
+        hospital_name: Name of the hospital
+        answers: (slot, field) -> value; blank values delete the answer
+        slot_bps: slot -> Best Practice, stored with each answer
+        replace: Also delete the hospital's answers missing from `answers` (full save)
+    """
+    worksheet = get_answers_worksheet()
+    existing = {}
+    for row_number, (_, slot, bp, field, value) in _hospital_answers(hospital_name):
+        existing[(slot, field)] = (row_number, bp, value)
+    
+    updates, deletes, appends = [], [], []
+    for (slot, field), value in answers.items():
+        value = '' if is_blank(value) else str(value)
+        current = existing.pop((slot, field), None)
+        bp = slot_bps.get(slot) or (current[1] if current else '')
+        if current is None:
+            if value:
+                appends.append([hospital_name, slot, bp, field, value])
+        elif not value:
+            deletes.append(current[0])
+        elif (bp, value) != (current[1], current[2]):
+            updates.append({'range': f'C{current[0]}:E{current[0]}', 'values': [[bp, field, value]]})
+    
+    for (slot, field), (row_number, bp, value) in existing.items():
+        if replace:
+            deletes.append(row_number)
+        elif slot_bps.get(slot, bp) != bp:
+            # The slot's BP changed; keep its untouched answers tagged with the new one
+            updates.append({'range': f'C{row_number}', 'values': [[slot_bps[slot]]]})
+    
+    if updates:
+        worksheet.batch_update(updates, value_input_option='USER_ENTERED')
+    if deletes:
+        # Bottom-up, so earlier deletions don't shift the rows still to delete
+        _get_spreadsheet().batch_update({'requests': [
+            {'deleteDimension': {'range': {'sheetId': worksheet.id, 'dimension': 'ROWS',
+                                           'startIndex': row_number - 1, 'endIndex': row_number}}}
+            for row_number in sorted(deletes, reverse=True)
+        ]})
+    if appends:
+        worksheet.append_rows(appends, value_input_option='USER_ENTERED')
+    if deletes or appends:
+        # Rows moved (deletes shift everything below them) or were added
+        _answer_row_index.clear()
+
+def _patch_cells(headers, row_number, patch):
+    from gspread.utils import rowcol_to_a1
+    
+    return [
+        {'range': rowcol_to_a1(row_number, headers.index(key) + 1), 'values': [['' if value is None else str(value)]]}
+        for key, value in patch.items()
+    ]
+
 # Keep these for backwards compatibility
 def append_row_to_sheets(data_dict):
     """Backwards compatibility - now calls save_or_update_submission"""
@@ -130,7 +492,7 @@ def get_spreadsheet_url():
     """Get the URL of the connected Google Sheet."""
     try:
         client = get_google_sheets_connection()
-        spreadsheet = client.open(SPREADSHEET_NAME)
+        spreadsheet = client.open(get_settings().sheets.spreadsheet_name)
         return spreadsheet.url
     except:
         return None
@@ -14,6 +14,7 @@ from reportlab.lib.enums import TA_CENTER, TA_LEFT
 
 # Import Google Sheets connector
 from google_sheets_connector import load_data_from_sheets
+from survey_registry import require_registry
 
 # ==================== 2. SET_PAGE_CONFIG (MUST BE HERE!) ====================
 st.set_page_config(
@@ -38,14 +39,9 @@ HOSPITAL_CREDS = {
 }
 
 # BP Names mapping
-BP_NAMES = {
-    "BP1": "BP1: Interdisciplinary Rounds & Early Discharge Planning",
-    "BP2": "BP2: Bed Capacity Alert System",
-    "BP3": "BP3: Standardized Daily Shift Huddles",
-    "BP4": "BP4: Expedited Care Intervention",
-    "BP5": "BP5: Patient Flow Throughput Performance Council",
-    "BP6": "BP6: Clinical Pathways & Observation Management"
-}
+# Hospitals and Best Practices are shared across apps (survey_registry.json)
+REGISTRY = require_registry()
+BP_NAMES = REGISTRY.bp_names
 
 # ==================== CUSTOM STYLING ====================
 st.markdown("""
@@ -11,6 +11,7 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from survey_registry import require_registry
 
 # ==================== PAGE CONFIG ====================
 st.set_page_config(
@@ -22,61 +23,15 @@ st.set_page_config(
 
 # ==================== CONFIGURATION ====================
 
+# Hospitals and Best Practices are shared across apps (survey_registry.json)
+REGISTRY = require_registry()
+
 # Hospital credentials (DEMO - Replace with real auth system)
-HOSPITAL_CREDS = {
-    "Adventist White Oak": "demo123",
-    "Ascension St Agnes": "demo123",
-    "Atlantic General": "demo123",
-    "Calvert Health": "demo123",
-    "Carroll Hospital Center": "demo123",
-    "Christiana Care-Union Hospital": "demo123",
-    "Fort Washington": "demo123",
-    "Frederick Health": "demo123",
-    "Garrett Regional": "demo123",
-    "GBMC": "demo123",
-    "Holy Cross Germantown": "demo123",
-    "Holy Cross Silver Spring": "demo123",
-    "Johns Hopkins Bayview": "demo123",
-    "Johns Hopkins Hospital": "demo123",
-    "Johns Hopkins Howard County": "demo123",
-    "Luminis Anne Arundel Medical Ctr": "demo123",
-    "Luminis Health-Doctors": "demo123",
-    "Medstar Franklin Square": "demo123",
-    "Medstar Good Samaritan": "demo123",
-    "Medstar Harbor": "demo123",
-    "Medstar Montgomery": "demo123",
-    "Medstar Southern Maryland": "demo123",
-    "Medstar St Mary's": "demo123",
-    "Medstar Union Memorial": "demo123",
-    "Mercy Medical Center": "demo123",
-    "Meritus": "demo123",
-    "Northwest": "demo123",
-    "Shady Grove": "demo123",
-    "Sinai": "demo123",
-    "Suburban": "demo123",
-    "Tidal Health": "demo123",
-    "UM BWMC": "demo123",
-    "UM Capital Region Medical Center": "demo123",
-    "UM Charles Regional": "demo123",
-    "UM Shore Regional": "demo123",
-    "UM St Joseph Medical Center": "demo123",
-    "UM Upper Chesapeake": "demo123",
-    "UMMC Downtown": "demo123",
-    "UMMC-Midtown": "demo123",
-    "UPMC Western Maryland": "demo123"
-}
+HOSPITAL_CREDS = REGISTRY.hospital_creds
 
 DATA_FILE = "hscrc_survey_submissions.csv"
 
-BP_OPTIONS = {
-    "": "-- Select Best Practice --",
-    "BP1": "BP1: Interdisciplinary Rounds & Early Discharge Planning",
-    "BP2": "BP2: Bed Capacity Alert System",
-    "BP3": "BP3: Standardized Daily Shift Huddles",
-    "BP4": "BP4: Expedited Care Intervention",
-    "BP5": "BP5: Patient Flow Throughput Performance Council",
-    "BP6": "BP6: Clinical Pathways & Observation Management"
-}
+BP_OPTIONS = REGISTRY.bp_options
 
 TIER_DESCRIPTIONS = {
     "BP1": {
@@ -1,21 +1,35 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-import plotly.express as px
-import plotly.graph_objects as go
 from io import BytesIO
-from reportlab.lib.pagesizes import letter
-from reportlab.lib import colors
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from html import escape
 
 # Import Google Sheets connector
-from google_sheets_connector import load_data_from_sheets, save_or_update_submission
+from google_sheets_connector import get_row, save_or_update_submission, update_submission_fields
 
-# Import email sender
-from email_sender import send_submission_email, send_approval_email
+# App settings (email, Google Sheets, storage, cache)
+from settings import require_settings
+
+# Shared hospital / Best Practice registry
+from survey_registry import require_registry
+
+# Import email outbox (emails are delivered by a background worker)
+from email_outbox import enqueue_emails, notification_emails, get_delivery_status, SENT, FAILED
+
+# Local draft autosave (promoted to Google Sheets only on Save Draft / Submit)
+from draft_store import get_draft_store
+
+# Version history of every save / approve / un-approve
+from submission_history import record_version
+
+# Buffered audit log of logins, edits and approvals
+from audit_log import log_event, LOGIN, LOGIN_FAILED, EDIT, APPROVE, UNAPPROVE
+
+# Declarative question schema (rendering, validation and PDF rows all come from it)
+from survey_schema import (
+    compile_plan, validate_answers, answered_questions, changed_fields, stored_text, parse_checklist, tier_number,
+    HEADER, DIVIDER, TOGGLE, TEXT, TEXTAREA, CHECKLIST, CHOICE, MULTI, ANSWER_KINDS
+)
 
 # ==================== PAGE CONFIG ====================
 st.set_page_config(
@@ -25,145 +39,21 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Secrets are parsed and validated once per process; stop here with one clear error if invalid
+SETTINGS = require_settings()
+
 # ==================== CONFIGURATION ====================
 
 # Google Sheets storage - no local CSV needed!
 # Data is stored in: "HSCRC Survey Submissions" spreadsheet
-HOSPITAL_CREDS = {
-    "Adventist White Oak": "demo123",
-    "Ascension St Agnes": "demo123",
-    "Atlantic General": "demo123",
-    "Calvert Health": "demo123",
-    "Carroll Hospital Center": "demo123",
-    "Christiana Care-Union Hospital": "demo123",
-    "Fort Washington": "demo123",
-    "Frederick Health": "demo123",
-    "Garrett Regional": "demo123",
-    "GBMC": "demo123",
-    "Holy Cross Germantown": "demo123",
-    "Holy Cross Silver Spring": "demo123",
-    "Johns Hopkins Bayview": "demo123",
-    "Johns Hopkins Hospital": "demo123",
-    "Johns Hopkins Howard County": "demo123",
-    "Luminis Anne Arundel Medical Ctr": "demo123",
-    "Luminis Health-Doctors": "demo123",
-    "Medstar Franklin Square": "demo123",
-    "Medstar Good Samaritan": "demo123",
-    "Medstar Harbor": "demo123",
-    "Medstar Montgomery": "demo123",
-    "Medstar Southern Maryland": "demo123",
-    "Medstar St Mary's": "demo123",
-    "Medstar Union Memorial": "demo123",
-    "Mercy Medical Center": "demo123",
-    "Meritus": "demo123",
-    "Northwest": "demo123",
-    "Shady Grove": "demo123",
-    "Sinai": "demo123",
-    "Suburban": "demo123",
-    "Tidal Health": "demo123",
-    "UM BWMC": "demo123",
-    "UM Capital Region Medical Center": "demo123",
-    "UM Charles Regional": "demo123",
-    "UM Shore Regional": "demo123",
-    "UM St Joseph Medical Center": "demo123",
-    "UM Upper Chesapeake": "demo123",
-    "UMMC Downtown": "demo123",
-    "UMMC-Midtown": "demo123",
-    "UPMC Western Maryland": "demo123"
-}
-
-BP_OPTIONS = {
-    "": "-- Select Best Practice --",
-    "BP1": "BP1: Interdisciplinary Rounds & Early Discharge Planning",
-    "BP2": "BP2: Bed Capacity Alert System",
-    "BP3": "BP3: Standardized Daily Shift Huddles",
-    "BP4": "BP4: Expedited Care Intervention",
-    "BP5": "BP5: Patient Flow Throughput Performance Council",
-    "BP6": "BP6: Clinical Pathways & Observation Management"
-}
-
-# Hospital Best Practice Assignments (Updated List)
-HOSPITAL_BP_ASSIGNMENTS = {
-    "Adventist White Oak": ["BP1", "BP4"],
-    "Ascension St Agnes": ["BP2", "BP5"], 
-    "Atlantic General": ["BP1", "BP3"],
-    "Calvert Health": ["BP3", "BP4"],
-    "Carroll Hospital Center": ["BP2", "BP5"],
-    "Christiana Care-Union Hospital": ["BP3", "BP4"],
-    "Fort Washington": ["BP4", "BP6"],
-    "Frederick Health": ["BP4", "BP5"],
-    "Garrett Regional": ["BP3", "BP5"],
-    "GBMC": ["BP4", "BP5"],
-    "Holy Cross Germantown": ["BP3", "BP5"],
-    "Holy Cross Silver Spring": ["BP3", "BP5"],
-    "Johns Hopkins Bayview": ["BP1", "BP5"],
-    "Johns Hopkins Hospital": ["BP2", "BP3"],
-    "Johns Hopkins Howard County": ["BP2", "BP4"],
-    "Luminis Anne Arundel Medical Ctr": ["BP4", "BP5"],
-    "Luminis Health-Doctors": ["BP2", "BP5"],
-    "Medstar Franklin Square": ["BP3", "BP6"],
-    "Medstar Good Samaritan": ["BP1", "BP4"],
-    "Medstar Harbor": ["BP1", "BP2"],
-    "Medstar Montgomery": ["BP1", "BP4"],
-    "Medstar Southern Maryland": ["BP2", "BP3"],
-    "Medstar St Mary's": ["BP1", "BP5"],
-    "Medstar Union Memorial": ["BP1", "BP4"],
-    "Mercy Medical Center": ["BP1", "BP4"],
-    "Meritus": ["BP4", "BP5"],
-    "Northwest": ["BP4", "BP5"],
-    "Shady Grove": ["BP4", "BP6"],
-    "Sinai": ["BP3", "BP5"],
-    "Suburban": ["BP2", "BP3"],
-    "Tidal Health": ["BP2", "BP6"],
-    "UM BWMC": ["BP5", "BP6"],
-    "UM Capital Region Medical Center": ["BP2", "BP5"],
-    "UM Charles Regional": ["BP1", "BP3"],
-    "UM Shore Regional": ["BP3", "BP5"],
-    "UM St Joseph Medical Center": ["BP1", "BP3"],
-    "UM Upper Chesapeake": ["BP3", "BP4"],
-    "UMMC Downtown": ["BP1", "BP3"],
-    "UMMC-Midtown": ["BP1", "BP3"],
-    "UPMC Western Maryland": ["BP2", "BP6"],
-}
-
-TIER_DESCRIPTIONS = {
-    "BP1": {
-        "name": "Interdisciplinary Rounds & Early Discharge Planning",
-        1: {"title": "Tier 1: Discharge Planning", "description": "Discharge planning adult general medical and surgical inpatient admissions\n\nAccountable Measure or Outcome:\n- Documentation within 48 hours of admission discharge plan\n- KPI: 70% of inpatient admissions have documented discharge planning OR 10% improvement from baseline"},
-        2: {"title": "Tier 2: HRSN Screening", "description": "Includes Tier 1 PLUS: Adult inpatients offered screening for the 5 HRSN prior to discharge\n\nAccountable Measure or Outcome:\n- Documentation of SDOH for inpatients who are screened\n- KPI: 50% OR 10% improvement from baseline of all inpatients identified in Tier 2 offered screening for HRSN"},
-        3: {"title": "Tier 3: Community Referrals", "description": "Tier 3: Adult inpatients screening positive for HRSN are given referrals to community resources prior to discharge\n\nAccountable Measure or Outcome:\n- Documentation of community resources access or referral for patients screening positive for one or more of HRSN\n- KPI: 75% OR 10% improvement from baseline of all positive screens for HRSN are given referral prior to discharge identified from tier two"}
-    },
-    "BP2": {
-        "name": "Bed Capacity Alert System",
-        1: {"title": "Tier 1: Establish Capacity Metrics", "description": "Organization establishes one or more capacity metrics\n\nExamples: Total patients in hospital, % beds occupied, ED boarder patients/ total ED beds, NEDOC score"},
-        2: {"title": "Tier 2: Bed Capacity Alert Process", "description": "Includes Tier 1 PLUS: Organization establishes a capacity alert process (surge plan)\n\nDriven by capacity metrics that trigger defined actions that achieve expedited throughput."},
-        3: {"title": "Tier 3: Demonstrate Activation", "description": "Includes Tier 1 & 2 PLUS: Organization quantitatively demonstrates consistent activation of surge plans in response to bed capacity triggers.\n\nInternal metrics to be hospital-defined"}
-    },
-    "BP3": {
-        "name": "Standardized Daily Shift Huddles",
-        1: {"title": "Tier 1: Daily Huddles", "description": "Daily huddles using multidisciplinary team approach\n\nFocus on throughput and discharges\n\n**Accountable Measure or Outcome:**\n- KPI: Multidisciplinary daily huddles are being completed at X frequency as defined by each organization"},
-        2: {"title": "Tier 2: Standardized Infrastructure and an escalation process for addressing clinical and/or non-clinical barriers to discharge or throughput.", "description": "Includes Tier 1 PLUS: Standardized infrastructure\n\nExamples: standard scripting, documentation, huddle boards"},
-        3: {"title": "Tier 3: KPI Monitoring", "description": "Includes Tier 1 & 2 PLUS: Monitoring and reporting of KPIs\n\nExample: % discharge orders by noon"}
-    },
-    "BP4": {
-        "name": "Expedited Care Intervention",
-        1: {"title": "Tier 1: One Practice", "description": "Implement ONE expedited care practice\n\nOptions: Nurse Expediter, Discharge Lounge, Observation Unit, Provider Screening, Dedicated CM/SW Resources in ED\n\nReport KPI for chosen practice."},
-        2: {"title": "Tier 2: Two Practices", "description": "Implement TWO expedited care practices\n\nReport KPI for each practice"},
-        3: {"title": "Tier 3: Three Practices", "description": "Implement THREE expedited care practices\n\nReport KPI for each practice"}
-    },
-    "BP5": {
-        "name": "Patient Flow Throughput Performance Council",
-        1: {"title": "Tier 1: Create Structure", "description": "Create multidisciplinary team\n\nExecutive sponsor, committee charter, monthly meetings"},
-        2: {"title": "Tier 2: Establish Accountability", "description": "Includes Tier 1 PLUS: Monthly meetings with stakeholders\n\n**Accountable Measure:**\n- Committee meetings include regular 'report outs' on relevant KPIs and data\n- The report outs include participation from at least one hospital executive\n- KPIs are evidence-based and shown to improve capacity or throughput or enhance patient care"},
-        3: {"title": "Tier 3: Change Culture", "description": "Includes Tier 1 & 2 PLUS: Cascade goals to nursing units to ensure front line staff awareness & engagement.\n\n**Accountable Measure:**\n- KPIs are reported for key units or service lines as determined by the hospital\n- The committee ensures routine capacity/throughput huddles to drive patient flow and reduce delays\n- The committee ensures that any observation patients have built-in efficiencies & protocols that promote discharge within two midnights. Observation LOS is tracked, data is shared, and OBS PI processes are implemented on units with OBS patients"}
-    },
-    "BP6": {
-        "name": "Clinical Pathways & Observation Management",
-        1: {"title": "Tier 1: Design and Implement", "description": "Organization selects and implements a clinical pathway tailored to patient population\n\nBased on facility's unique needs"},
-        2: {"title": "Tier 2: Develop Data Infrastructure", "description": "Includes Tier 1 PLUS: Data collection and analysis systems\n\nMonitor and evaluate outcomes. These systems should emphasize comparing the effectiveness of inpatient and ambulatory management strategies for the selected patient population, enabling data-driven decision-making and continuous improvement."},
-        3: {"title": "Tier 3: Demonstrate Improvement", "description": "Includes Tier 1 & 2 PLUS: Demonstrate measurable results\n\nThe results will demonstrate a measurable decrease in unwarranted clinical variation and/or measurable improvement in outcomes specific to their chosen intervention."}
-    }
-}
+
+# Hospitals, logins, BP assignments and tier text live in survey_registry.json
+# (loaded once per process, reloaded when the file changes)
+REGISTRY = require_registry()
+HOSPITAL_CREDS = REGISTRY.hospital_creds
+BP_OPTIONS = REGISTRY.bp_options
+HOSPITAL_BP_ASSIGNMENTS = REGISTRY.hospital_bps
+TIER_DESCRIPTIONS = REGISTRY.tier_descriptions
 
 # ==================== CUSTOM CSS ====================
 st.markdown("""
@@ -258,36 +148,15 @@ st.markdown("""
         color: #721c24;
         border: 1px solid #f5c6cb;
     }
-    .char-counter {
-        font-size: 0.85em;
-        color: #666;
-        text-align: right;
-        margin-top: -10px;
-        margin-bottom: 10px;
-    }
-    .char-counter.warning {
-        color: #ff9800;
-        font-weight: bold;
-    }
-    .char-counter.error {
-        color: #f44336;
-        font-weight: bold;
-    }
 </style>
 """, unsafe_allow_html=True)
 
 # ==================== HELPER FUNCTIONS ====================
-def char_counter_display(current_len, max_len):
-    """Display character counter with color coding"""
-    if current_len > max_len:
-        return f'<div class="char-counter error">⚠️ {current_len}/{max_len} characters (exceeds limit!)</div>'
-    elif current_len > max_len * 0.9:
-        return f'<div class="char-counter warning">{current_len}/{max_len} characters</div>'
-    else:
-        return f'<div class="char-counter">{current_len}/{max_len} characters</div>'
-
 def text_area_with_counter(label, key, height=150, max_chars=1000, value='', tier_label=None):
-    """Text area with character counter and optional tier badge"""
+    """
+    Text area with optional tier badge. The character counter and max_chars limit
+    are handled in the browser by Streamlit, so typing never costs a rerun.
+    """
     if tier_label:
         tier_class = f"tier-{tier_label}-badge"
         display_label = f"{label} <span class='tier-badge {tier_class}'>Tier {tier_label}</span>"
@@ -295,9 +164,13 @@ def text_area_with_counter(label, key, height=150, max_chars=1000, value='', tie
     else:
         st.markdown(f"**{label}**")
     
-    text = st.text_area("", key=key, height=height, value=value, label_visibility="collapsed")
-    st.markdown(char_counter_display(len(text), max_chars), unsafe_allow_html=True)
-    return text
+    # Answers saved before the limit existed would be truncated silently; let them be shortened instead
+    if len(value) > max_chars:
+        st.warning(f"⚠️ This answer is {len(value)} characters; the limit is {max_chars}. Please shorten it.")
+        max_chars = None
+    
+    return st.text_area(label, key=key, height=height, value=value, max_chars=max_chars,
+                        label_visibility="collapsed")
 
 def text_input_with_tier(label, key, value='', tier_label=None):
     """Text input with optional tier badge"""
@@ -319,38 +192,109 @@ def checkbox_with_tier(label, key, value=False, tier_label=None):
     else:
         return st.checkbox(label, key=key, value=value)
 
+# ==================== EMAIL NOTIFICATIONS ====================
+def queue_notification_emails(kind, submission, event_time, **fields):
+    """
+    Queue a notification email for the primary and (optional) secondary contact.
+    Returns the outbox keys so the portal can show delivery status.
+    """
+    return enqueue_emails(notification_emails(kind, submission, event_time, **fields))
+
+@st.fragment(run_every=3)
+def poll_email_status(keys):
+    """Re-check queued emails every few seconds without rerunning the page"""
+    statuses = get_delivery_status(keys)
+    if len(statuses) == len(keys) and all(s['status'] in (SENT, FAILED) for s in statuses.values()):
+        st.rerun()
+    retrying = any(s['attempts'] > 0 and s['status'] not in (SENT, FAILED) for s in statuses.values())
+    st.caption("📧 Email delivery is being retried..." if retrying else "📧 Sending email confirmation...")
+
+def show_email_status():
+    """Show delivery status for emails queued by the last Submit/Approve"""
+    keys = st.session_state.get('email_keys', [])
+    if not keys:
+        return
+    
+    statuses = get_delivery_status(keys)
+    if len(statuses) == len(keys) and all(s['status'] in (SENT, FAILED) for s in statuses.values()):
+        for key in keys:
+            status = statuses[key]
+            if status['status'] == SENT:
+                st.success(f"📧 Email sent to {status['recipient']}")
+            else:
+                st.error(f"❌ Failed to send email to {status['recipient']}. Your submission was saved.")
+        st.session_state.email_keys = []
+    else:
+        poll_email_status(keys)
+
 # ==================== DATA FUNCTIONS ====================
-@st.cache_data(ttl=60)
-def load_data():
-    """Load data"""
+@st.cache_data(ttl=SETTINGS.cache.data_ttl, show_spinner=False)
+def load_hospital_submission(hospital_name):
+    """One hospital's row, read on its own (the full sheet is never loaded by the portal)"""
+    return get_row(hospital_name)
+
+def get_hospital_submission(hospital_name):
+    """Get the submission for a hospital from Google Sheets (its cached row)."""
     try:
-        df = load_data_from_sheets()
-        if not df.empty:
-            df.columns = df.columns.str.strip()
-        return df
+        row = load_hospital_submission(hospital_name)
     except Exception as e:
         st.error(f"Error loading data: {e}")
-        return pd.DataFrame()
-
-def get_hospital_submission(hospital_name):
-    """
-    Get the latest submission for a hospital from Google Sheets.
-    Returns the most recent row (last row) for this hospital.
-    """
-    df = load_data()
-    if df.empty:
         return None
     
-    # Filter for this hospital
-    hospital_data = df[df['hospital_name'] == hospital_name]
-    if hospital_data.empty:
+    if row is None:
         return None
-    
-    # Return the last row (most recent)
-    return hospital_data.iloc[-1]
+    return pd.Series(row)
+
+def save_submission_changes(hospital_name, data, saved_row, action='save', saved_by=None):
+    """
+    Save a submission, writing only the fields that differ from the saved row,
+    and add the result to the hospital's version history.
+    
+    Args:
+        hospital_name: Name of the hospital
+        data: Full submission dictionary
+        saved_row: The hospital's current row as a dict ({} if it has none)
+        action: Recorded in the version history ('draft', 'submit', 'approve', 'unapprove')
+        saved_by: Who made the change, for the version history
+    
+    Returns:
+        tuple: (success, patch) - patch is {} when nothing changed and nothing was written
+    """
+    if not saved_row:
+        success, patch = save_or_update_submission(hospital_name, data), dict(data)
+    else:
+        patch = changed_fields(saved_row, data)
+        if not patch:
+            return True, {}
+        if 'timestamp' in data and data['timestamp'] != saved_row.get('timestamp'):
+            patch['timestamp'] = data['timestamp']
+        success = update_submission_fields(hospital_name, patch, fallback_data=data)
+    
+    if success:
+        event_type = {'approve': APPROVE, 'unapprove': UNAPPROVE}.get(action, EDIT)
+        log_event(event_type, hospital_name, saved_by, action=action, fields=len(patch))
+        try:
+            record_version(hospital_name, {**saved_row, **patch}, action=action, saved_by=saved_by, previous=saved_row)
+        except Exception as e:
+            # The sheet is the system of record; a history failure never undoes a save
+            st.warning(f"⚠️ Saved, but this version could not be added to the history: {e}")
+    return success, patch
+
+@st.cache_data(show_spinner=False, max_entries=20)
+def hospital_pdf_bytes(submission_items):
+    """PDF for a submission, rebuilt only when the submission's content changes"""
+    return generate_hospital_pdf(dict(submission_items)).getvalue()
 
 def generate_hospital_pdf(latest_submission):
     """Generate PDF report for a hospital submission"""
+    # ReportLab is only needed for PDFs, so it is imported here rather than at app start
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib import colors
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.lib.enums import TA_CENTER
+    
     buffer = BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter, rightMargin=72, leftMargin=72, topMargin=72, bottomMargin=18)
     
@@ -409,796 +353,328 @@ def generate_hospital_pdf(latest_submission):
     story.append(info_table)
     story.append(Spacer(1, 0.3*inch))
     
-    # BP1
-    bp1_code = latest_submission.get('bp1')
-    if pd.notna(bp1_code) and bp1_code != '':
-        bp1_name = BP_OPTIONS.get(bp1_code, bp1_code)
-        bp1_tier = latest_submission.get('bp1_tier', '')
-        bp1_rationale = latest_submission.get('bp1_rationale', '')
-        bp1_success = latest_submission.get('bp1_success', '')
-        
-        story.append(Paragraph(f"<b>First Best Practice: {bp1_name}</b>", styles['Heading2']))
-        
-        bp1_data = [['Tier:', f"Tier {bp1_tier}"]]
-        
-        if bp1_rationale and str(bp1_rationale).strip() not in ('', 'None', 'nan'):
-            bp1_data.append(['Rationale:', str(bp1_rationale)[:500]])
-        
-        if bp1_success and str(bp1_success).strip() not in ('', 'None', 'nan'):
-            bp1_data.append(['Success/Barriers:', str(bp1_success)[:500]])
-        
-        bp1_table = Table(bp1_data, colWidths=[2*inch, 4*inch])
-        bp1_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8f4f8')),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-        ]))
-        story.append(bp1_table)
-        story.append(Spacer(1, 0.2*inch))
+    # Best Practices - one table per slot, rows taken from the question schema
+    cell_style = ParagraphStyle('Cell', parent=styles['Normal'], fontSize=9, leading=11)
+    label_style = ParagraphStyle('CellLabel', parent=cell_style, fontName='Helvetica-Bold')
     
-    # BP2
-    bp2_code = latest_submission.get('bp2')
-    if pd.notna(bp2_code) and bp2_code != '':
-        bp2_name = BP_OPTIONS.get(bp2_code, bp2_code)
-        bp2_tier = latest_submission.get('bp2_tier', '')
-        bp2_rationale = latest_submission.get('bp2_rationale', '')
-        bp2_success = latest_submission.get('bp2_success', '')
+    for prefix, heading in (('bp1', 'First Best Practice'), ('bp2', 'Second Best Practice')):
+        bp_code = latest_submission.get(prefix)
+        if pd.isna(bp_code) or bp_code == '':
+            continue
         
-        story.append(Paragraph(f"<b>Second Best Practice: {bp2_name}</b>", styles['Heading2']))
+        bp_name = BP_OPTIONS.get(bp_code, bp_code)
+        bp_tier = latest_submission.get(f'{prefix}_tier', '')
         
-        bp2_data = [['Tier:', f"Tier {bp2_tier}"]]
+        story.append(Paragraph(f"<b>{heading}: {bp_name}</b>", styles['Heading2']))
         
-        if bp2_rationale and str(bp2_rationale).strip() not in ('', 'None', 'nan'):
-            bp2_data.append(['Rationale:', str(bp2_rationale)[:500]])
+        bp_rows = [[Paragraph('Tier:', label_style), Paragraph(f"Tier {bp_tier}", cell_style)]]
+        for label, answer in answered_questions(bp_code, bp_tier, prefix, latest_submission):
+            bp_rows.append([
+                Paragraph(escape(f"{label}:"), label_style),
+                Paragraph(escape(answer[:500]).replace('\n', '<br/>'), cell_style)
+            ])
         
-        if bp2_success and str(bp2_success).strip() not in ('', 'None', 'nan'):
-            bp2_data.append(['Success/Barriers:', str(bp2_success)[:500]])
-        
-        bp2_table = Table(bp2_data, colWidths=[2*inch, 4*inch])
-        bp2_table.setStyle(TableStyle([
+        bp_table = Table(bp_rows, colWidths=[2*inch, 4*inch])
+        bp_table.setStyle(TableStyle([
             ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#e8f4f8')),
             ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
             ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
             ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
             ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
             ('GRID', (0, 0), (-1, -1), 1, colors.grey),
         ]))
-        story.append(bp2_table)
+        story.append(bp_table)
+        story.append(Spacer(1, 0.2*inch))
     
     # Build PDF
     doc.build(story)
     buffer.seek(0)
     return buffer
 
-# ==================== QUESTION RENDERERS ====================
+# ==================== QUESTION RENDERER ====================
 
-def render_bp1_questions(tier, prefix, existing_data=None):
-    """BP1: Interdisciplinary Rounds - with Tier 3 KPI 5/6 target/actual"""
-    st.markdown("### Select the KPIs you plan to achieve: *")
-    
-    data = {}
-    existing_data = existing_data or {}
-    
-    # Tier 1 KPIs
-    st.markdown("#### 🟢 Tier 1 KPIs:")
-    kpi1 = checkbox_with_tier(  # ← CHANGE FROM st.checkbox
-        "70% of inpatient admissions have documented discharge planning", 
-        f"{prefix}_kpi1",
-        value=bool(existing_data.get(f'{prefix}_kpi1_target')),
-        tier_label=1  # ← ADD THIS!
-    )
-    
-    kpi2 = checkbox_with_tier(  # ← CHANGE THIS
-        "10% improvement from baseline" if tier == 1 else "10% improvement from baseline of above KPI",
-        f"{prefix}_kpi2",
-        value=bool(existing_data.get(f'{prefix}_kpi2_target')),
-        tier_label=1  # ← ADD THIS
-    )
-    
-    # Tier 2 KPIs
-    kpi3 = kpi4 = False
-    if tier >= 2:
-        st.markdown("#### 🟡 Tier 2 KPIs (in addition to Tier 1):")  # ← ADD THIS
-        kpi3 = checkbox_with_tier(  # ← CHANGE FROM st.checkbox
-            "50% of adult inpatients were offered screening...",
-            f"{prefix}_kpi3",
-            value=bool(existing_data.get(f'{prefix}_kpi3_target')),
-            tier_label=2  # ← ADD THIS!
-        )
-    
-        kpi4 = checkbox_with_tier(
-            "10% improvement from baseline of all inpatients identified in tier one offered screening for HRSN",
-            f"{prefix}_kpi4",
-            value=bool(existing_data.get(f'{prefix}_kpi4_target')),
-            tier_label=2
-        )
-    # Tier 3 KPIs
-    kpi5 = kpi6 = False
-    if tier >= 3:
-        st.markdown("#### 🔴 Tier 3 KPIs (in addition to Tiers 1 & 2):")  # ← ADD THIS
-        kpi5 = checkbox_with_tier(  # ← CHANGE FROM st.checkbox
-            "75% of adult inpatients that have screened positive...",
-            f"{prefix}_kpi5",
-            value=bool(existing_data.get(f'{prefix}_kpi5_target')),
-            tier_label=3  # ← ADD THIS!
-        )
+def _render_checklist(question, prefix, existing_data):
+    """Checkbox list stored as one comma-separated answer, with optional free-text "Other"."""
+    checked, other_text = parse_checklist(question, stored_text(existing_data, f"{prefix}_{question.key}"))
+    st.markdown(question.label)
 
-        kpi6 = checkbox_with_tier(
-            "10% improvement from baseline of all positive screens for HRSN are given a referral prior to discharge identified from tier two",
-            f"{prefix}_kpi6",
-            value=bool(existing_data.get(f'{prefix}_kpi6_target')),
-            tier_label=3
-        )
-    
-    st.markdown("---")
-    
-    # KPI 1 inputs
-    if kpi1:
-        data[f'{prefix}_kpi1_target'] = text_input_with_tier(
-            "Provide the target KPI if you selected, \"70% of inpatient admissions have documented discharge planning.\"",
-            f"{prefix}_kpi1_target",
-            value=existing_data.get(f'{prefix}_kpi1_target', ''),
-            tier_label=1
-        )
-        data[f'{prefix}_kpi1_actual'] = text_input_with_tier(  # ← CHANGE THIS
-            "Provide the actual KPI performance results if you selected, \"70% of inpatient admissions have documented discharge planning.\"",
-            f"{prefix}_kpi1_actual",
-            value=existing_data.get(f'{prefix}_kpi1_actual', ''),
-            tier_label=1  # ← ADD THIS
-        )
-    
-    # KPI 2 inputs
-    if kpi2:
-        kpi2_text = "10% improvement from baseline" if tier == 1 else "10% improvement from baseline of above KPI"
-        data[f'{prefix}_kpi2_target'] = text_input_with_tier(
-            f"Provide the target KPI if you selected, \"{kpi2_text}.\"",
-            f"{prefix}_kpi2_target",
-            value=existing_data.get(f'{prefix}_kpi2_target', ''),
-            tier_label=1
-        )
-        data[f'{prefix}_kpi2_actual'] = text_input_with_tier(
-            f"Provide the actual KPI performance results if you selected, \"{kpi2_text}.\"",
-            f"{prefix}_kpi2_actual",
-            value=existing_data.get(f'{prefix}_kpi2_actual', ''),
-            tier_label=1
-        )
-    
-    # KPI 3 inputs 
-    if kpi3:
-        data[f'{prefix}_kpi3_target'] = text_input_with_tier(
-            "Provide the target KPI if you selected, \"50% of adult inpatients were offered screening for the 5 (five) HRSN prior to discharge.\"",
-            f"{prefix}_kpi3_target",
-            value=existing_data.get(f'{prefix}_kpi3_target', ''),
-            tier_label=2
-        )
-        data[f'{prefix}_kpi3_actual'] = text_input_with_tier(
-            "Provide the actual KPI performance results if you selected, \"50% of adult inpatients were offered screening for the 5 (five) HRSN prior to discharge.\"",
-            f"{prefix}_kpi3_actual",
-            value=existing_data.get(f'{prefix}_kpi3_actual', ''),
-            tier_label=2
-        )
-    
-    # KPI 4 inputs 
-    if kpi4:
-        data[f'{prefix}_kpi4_target'] = text_input_with_tier(
-            "Provide the target KPI if you selected, \"10% improvement from baseline of all inpatients identified in tier one offered screening for HRSN.\"",
-            f"{prefix}_kpi4_target",
-            value=existing_data.get(f'{prefix}_kpi4_target', ''),
-            tier_label=2
-        )
-        data[f'{prefix}_kpi4_actual'] = text_input_with_tier(
-            "Provide the actual KPI performance results if you selected, \"10% improvement from baseline of all inpatients identified in tier one offered screening for HRSN.\"",
-            f"{prefix}_kpi4_actual",
-            value=existing_data.get(f'{prefix}_kpi4_actual', ''),
-            tier_label=2
-        )
-    
-    # KPI 5 inputs 
-    if kpi5:
-        data[f'{prefix}_kpi5_target'] = text_input_with_tier(
-            "Provide the target KPI if you selected, \"75% of adult inpatients that have screened positive for HRSN are given referrals to community resources prior to discharge.\" *",
-            f"{prefix}_kpi5_target",
-            value=existing_data.get(f'{prefix}_kpi5_target', ''),
-            tier_label=3
-        )
-        data[f'{prefix}_kpi5_actual'] = text_input_with_tier(
-            "Provide the actual KPI performance results if you selected, \"75% of adult inpatients that have screened positive for HRSN are given referrals to community resources prior to discharge.\" *",
-            f"{prefix}_kpi5_actual",
-            value=existing_data.get(f'{prefix}_kpi5_actual', ''),
-            tier_label=3
-        )
-    
-    # KPI 6 inputs 
-    if kpi6:
-        data[f'{prefix}_kpi6_target'] = text_input_with_tier(
-            "Provide the target KPI if you selected, \"10% improvement from baseline of all positive screens for HRSN are given a referral prior to discharge identified from tier two.\" *",
-            f"{prefix}_kpi6_target",
-            value=existing_data.get(f'{prefix}_kpi6_target', ''),
-            tier_label=3
-        )
-        data[f'{prefix}_kpi6_actual'] = text_input_with_tier(
-            "Provide the actual KPI performance results if you selected, \"10% improvement from baseline of all positive screens for HRSN are given a referral prior to discharge identified from tier two.\" *",
-            f"{prefix}_kpi6_actual",
-            value=existing_data.get(f'{prefix}_kpi6_actual', ''),
-            tier_label=3
-        )
-    
-    # ============== RATIONALE & SUCCESS ==============
-    st.markdown("---")
-    data[f'{prefix}_rationale'] = text_area_with_counter(  # ← CHANGE THIS
-        "Provide the rationale to why you selected this best practice & tier *",
-        f"{prefix}_rationale",
-        height=150,
-        max_chars=2000,  # ← ADD THIS
-        value=existing_data.get(f'{prefix}_rationale', '')
-    )
-    data[f'{prefix}_success'] = text_area_with_counter(  # ← CHANGE THIS
-        "Are there any success stories and/or barriers to implementing this best practice? *",
-        f"{prefix}_success",
-        height=150,
-        max_chars=2000,  # ← ADD THIS
-        value=existing_data.get(f'{prefix}_success', '')
-    )
-    
-    return data
+    selected = []
+    for widget_key, label, value in question.options:
+        if st.checkbox(label, key=f"{prefix}_{widget_key}", value=widget_key in checked):
+            selected.append(value)
 
-def render_bp2_questions(tier, prefix, existing_data=None):
-    """BP2: Bed Capacity Alert System - CUMULATIVE with tier labels"""
-    data = {}
-    existing_data = existing_data or {}
-    
-    st.markdown("### 🟢 Tier 1: Capacity Metrics")
-    st.markdown("**Describe the one or more capacity metrics your organization selected to achieve tier 1: ***")
-    
-    metrics = []
-    if st.checkbox("Total number of patients in hospital", key=f"{prefix}_metric_total"):
-        metrics.append("Total patients")
-    if st.checkbox("Percent of hospital beds occupied", key=f"{prefix}_metric_beds"):
-        metrics.append("% beds occupied")
-    if st.checkbox("Percent of ED border patients / overall ED beds", key=f"{prefix}_metric_ed"):
-        metrics.append("% ED border")
-    if st.checkbox("NEDOC score", key=f"{prefix}_metric_nedoc"):
-        metrics.append("NEDOC")
-    if st.checkbox("Other", key=f"{prefix}_metric_other_check"):
-        other = st.text_input("Describe other capacity metric *", key=f"{prefix}_metric_other")
-        metrics.append(f"Other: {other}")
-    
-    data[f'{prefix}_capacity_metrics'] = ", ".join(metrics)
-    data[f'{prefix}_t1_target'] = text_input_with_tier(
-        "Provide the target metric for your chosen capacity metric to achieve tier 1 *",
-        f"{prefix}_t1_target",
-        value=existing_data.get(f'{prefix}_t1_target', ''),
-        tier_label=1
-    )
-    data[f'{prefix}_t1_actual'] = text_input_with_tier(
-        "Provide the actual target metric performance results to achieve tier 1 *",
-        f"{prefix}_t1_actual",
-        value=existing_data.get(f'{prefix}_t1_actual', ''),
-        tier_label=1
-    )
-    
-    if tier >= 2:
-        st.markdown("### 🟡 Tier 2: Bed Capacity Alert Process (in addition to Tier 1)")
-        data[f'{prefix}_t2_surge'] = text_area_with_counter(
-            "Describe the established bed capacity alert process (aka surge plan) driven by capacity metrics *",
-            f"{prefix}_t2_surge",
-            height=150,
-            max_chars=2000,
-            value=existing_data.get(f'{prefix}_t2_surge', ''),
-            tier_label=2
-        )
-        data[f'{prefix}_t2_target'] = text_input_with_tier(
-            "Provide the target metric for your chosen capacity metric to achieve tier 2 *",
-            f"{prefix}_t2_target",
-            value=existing_data.get(f'{prefix}_t2_target', ''),
-            tier_label=2
-        )
-        data[f'{prefix}_t2_actual'] = text_input_with_tier(
-            "Provide the actual target metric performance results to achieve tier 2 *",
-            f"{prefix}_t2_actual",
-            value=existing_data.get(f'{prefix}_t2_actual', ''),
-            tier_label=2
-        )
-    
-    if tier >= 3:
-        st.markdown("### 🔴 Tier 3: Demonstrate Activation (in addition to Tiers 1 & 2)")
-        data[f'{prefix}_t3_quant'] = text_area_with_counter(
-            "Describe the process to achieve tier 3, when an organization quantitatively demonstrates consistent activation of surge plans *",
-            f"{prefix}_t3_quant",
-            height=150,
-            max_chars=2000,
-            value=existing_data.get(f'{prefix}_t3_quant', ''),
-            tier_label=3
-        )
-        data[f'{prefix}_t3_target'] = text_input_with_tier(
-            "Provide the target metric for your chosen capacity metric to achieve tier 3 *",
-            f"{prefix}_t3_target",
-            value=existing_data.get(f'{prefix}_t3_target', ''),
-            tier_label=3
-        )
-        data[f'{prefix}_t3_actual'] = text_input_with_tier(
-            "Provide the actual target metric performance results to achieve tier 3 *",
-            f"{prefix}_t3_actual",
-            value=existing_data.get(f'{prefix}_t3_actual', ''),
-            tier_label=3
-        )
-    
-    st.markdown("---")
-    data[f'{prefix}_rationale'] = text_area_with_counter(
-        "Provide the rationale to why you selected this best practice & tier *",
-        f"{prefix}_rationale",
-        height=150,
-        max_chars=2000,
-        value=existing_data.get(f'{prefix}_rationale', '')
-    )
-    data[f'{prefix}_success'] = text_area_with_counter(
-        "Are there any success stories and/or barriers to implementing this best practice? *",
-        f"{prefix}_success",
-        height=150,
-        max_chars=2000,
-        value=existing_data.get(f'{prefix}_success', '')
-    )
-    
-    return data
+    if question.other:
+        # Inside a form the text box can't appear on tick, so it is always shown
+        check_key, text_key, other_label = question.other
+        other_checked = st.checkbox("Other", key=f"{prefix}_{check_key}", value=other_text is not None)
+        other = st.text_input(other_label, key=f"{prefix}_{text_key}", value=other_text or '')
+        if other_checked:
+            selected.append(f"Other: {other}")
 
-def render_bp3_questions(tier, prefix, existing_data=None):
-    """BP3: Standardized Daily Shift Huddles - CUMULATIVE with tier labels"""
-    data = {}
-    existing_data = existing_data or {}
-    
-    st.markdown("### 🟢 Tier 1: Daily Huddles")
-    data[f'{prefix}_t1_kpi'] = text_area_with_counter(
-        "Provide the KPI chosen to achieve tier 1 *",
-        f"{prefix}_t1_kpi",
-        height=100,
-        max_chars=1000,
-        value=existing_data.get(f'{prefix}_t1_kpi', ''),
-        tier_label=1
-    )
-    data[f'{prefix}_t1_actual'] = text_area_with_counter(
-        "Provide the actual KPI performance results to achieve tier 1 *",
-        f"{prefix}_t1_actual",
-        height=100,
-        max_chars=1000,
-        value=existing_data.get(f'{prefix}_t1_actual', ''),
-        tier_label=1
-    )
-    
-    if tier >= 2:
-        st.markdown("### 🟡 Tier 2: Standardized Infrastructure (in addition to Tier 1)")
-        data[f'{prefix}_t2_kpi'] = text_area_with_counter(
-            "Provide the KPI chosen to achieve tier 2 *",
-            f"{prefix}_t2_kpi",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_t2_kpi', ''),
-            tier_label=2
-        )
-        data[f'{prefix}_t2_actual'] = text_area_with_counter(
-            "Provide the actual KPI performance results to achieve tier 2 *",
-            f"{prefix}_t2_actual",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_t2_actual', ''),
-            tier_label=2
-        )
-    
-    if tier >= 3:
-        st.markdown("### 🔴 Tier 3: KPI Monitoring (in addition to Tiers 1 & 2)")
-        st.markdown("**Describe the KPI your organization implemented to achieve tier 3: ***")
-        kpi_types = []
-        if st.checkbox("Percent of discharge orders written by noon", key=f"{prefix}_t3_noon"):
-            kpi_types.append("Discharge orders by noon")
-        if st.checkbox("Percent of patients leaving the facility by a designated time", key=f"{prefix}_t3_leaving"):
-            kpi_types.append("Patients leaving by designated time")
-        if st.checkbox("Other", key=f"{prefix}_t3_other_check"):
-            other = st.text_input("Describe other KPI *", key=f"{prefix}_t3_other")
-            kpi_types.append(f"Other: {other}")
-        
-        data[f'{prefix}_t3_kpi_type'] = ", ".join(kpi_types)
-        data[f'{prefix}_t3_formula'] = text_area_with_counter(
-            "Provide the KPI formula chosen to achieve tier 3 *",
-            f"{prefix}_t3_formula",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_t3_formula', ''),
-            tier_label=3
-        )
-        data[f'{prefix}_t3_actual'] = text_area_with_counter(
-            "Provide the actual KPI performance results to achieve tier 3 *",
-            f"{prefix}_t3_actual",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_t3_actual', ''),
-            tier_label=3
-        )
-    
-    st.markdown("---")
-    data[f'{prefix}_rationale'] = text_area_with_counter(
-        "Provide the rationale to why you selected this best practice & tier *",
-        f"{prefix}_rationale",
-        height=150,
-        max_chars=2000,
-        value=existing_data.get(f'{prefix}_rationale', '')
-    )
-    data[f'{prefix}_success'] = text_area_with_counter(
-        "Are there any success stories and/or barriers to implementing this best practice? *",
-        f"{prefix}_success",
-        height=150,
-        max_chars=2000,
-        value=existing_data.get(f'{prefix}_success', '')
-    )
-    
-    return data
+    return ", ".join(selected)
 
-def render_bp4_questions(tier, prefix, existing_data=None):
-    """BP4: Expedited Care Intervention - NON-HIERARCHICAL (no tier labels needed)"""
-    practices = ["Nurse Expediter", "Discharge Lounge", "Observation Unit (ED or hospital based)", 
-                 "Provider Screening in Triage / Early Provider Screening Process", 
-                 "Dedicated CM and/or SW resources in the ED"]
-    
-    data = {}
-    existing_data = existing_data or {}
-    
-    if tier == 1:
-        st.markdown("### 🟢 Tier 1: Select ONE Expedited Care Practice")
-        data[f'{prefix}_practice'] = st.radio("Select the expedited care practice you plan to report *", practices, key=f"{prefix}_practice")
-        data[f'{prefix}_t1_formula'] = text_area_with_counter(
-            "Provide the KPI formula for this practice *",
-            f"{prefix}_t1_formula",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_t1_formula', '')
-        )
-        data[f'{prefix}_t1_actual'] = text_area_with_counter(
-            "Provide the actual KPI performance results *",
-            f"{prefix}_t1_actual",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_t1_actual', '')
-        )
-    
-    elif tier == 2:
-        st.markdown("### 🟡 Tier 2: Select TWO Expedited Care Practices")
-        selected = st.multiselect("Select two expedited care practices *", practices, key=f"{prefix}_practices")
-        data[f'{prefix}_practices'] = ", ".join(selected)
-        data[f'{prefix}_t1_formula'] = text_area_with_counter(
-            "Provide the KPI formula for first practice *",
-            f"{prefix}_t1_formula",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_t1_formula', '')
-        )
-        data[f'{prefix}_t1_actual'] = text_area_with_counter(
-            "Provide the actual KPI performance for first practice *",
-            f"{prefix}_t1_actual",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_t1_actual', '')
-        )
-        data[f'{prefix}_t2_formula'] = text_area_with_counter(
-            "Provide the KPI formula for second practice *",
-            f"{prefix}_t2_formula",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_t2_formula', '')
-        )
-        data[f'{prefix}_t2_actual'] = text_area_with_counter(
-            "Provide the actual KPI performance for second practice *",
-            f"{prefix}_t2_actual",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_t2_actual', '')
-        )
-    
-    elif tier == 3:
-        st.markdown("### 🔴 Tier 3: Select THREE Expedited Care Practices")
-        selected = st.multiselect("Select three expedited care practices *", practices, key=f"{prefix}_practices")
-        data[f'{prefix}_practices'] = ", ".join(selected)
-        data[f'{prefix}_t1_formula'] = text_area_with_counter(
-            "Provide the KPI formula for first practice *",
-            f"{prefix}_t1_formula",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_t1_formula', '')
-        )
-        data[f'{prefix}_t1_actual'] = text_area_with_counter(
-            "Provide the actual KPI performance for first practice *",
-            f"{prefix}_t1_actual",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_t1_actual', '')
-        )
-        data[f'{prefix}_t2_formula'] = text_area_with_counter(
-            "Provide the KPI formula for second practice *",
-            f"{prefix}_t2_formula",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_t2_formula', '')
-        )
-        data[f'{prefix}_t2_actual'] = text_area_with_counter(
-            "Provide the actual KPI performance for second practice *",
-            f"{prefix}_t2_actual",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_t2_actual', '')
-        )
-        data[f'{prefix}_t3_formula'] = text_area_with_counter(
-            "Provide the KPI formula for third practice *",
-            f"{prefix}_t3_formula",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_t3_formula', '')
-        )
-        data[f'{prefix}_t3_actual'] = text_area_with_counter(
-            "Provide the actual KPI performance for third practice *",
-            f"{prefix}_t3_actual",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_t3_actual', '')
-        )
-    
-    st.markdown("---")
-    data[f'{prefix}_rationale'] = text_area_with_counter(
-        "Provide the rationale to why you selected this best practice & tier *",
-        f"{prefix}_rationale",
-        height=150,
-        max_chars=2000,
-        value=existing_data.get(f'{prefix}_rationale', '')
-    )
-    data[f'{prefix}_success'] = text_area_with_counter(
-        "Are there any success stories and/or barriers to implementing this best practice? *",
-        f"{prefix}_success",
-        height=150,
-        max_chars=2000,
-        value=existing_data.get(f'{prefix}_success', '')
-    )
-    
-    return data
 
-def render_bp5_questions(tier, prefix, existing_data=None):
-    """BP5: Patient Flow Throughput Performance Council - NON-HIERARCHICAL (no tier labels needed)"""
-    data = {}
+def _toggle_default(question, prefix, existing_data):
+    """A toggle's last state this session, else on when its answer was saved"""
+    key = f"{prefix}_{question.key}"
+    if isinstance(existing_data.get(key), bool):
+        return existing_data[key]
+    return bool(stored_text(existing_data, f"{prefix}_{question.default_from}"))
+
+
+def _render_questions(questions, prefix, existing_data, data, toggles):
+    for question in questions:
+        if question.show_if and not toggles.get(question.show_if):
+            continue
+
+        key = f"{prefix}_{question.key}"
+        if question.kind == HEADER:
+            st.markdown(question.label)
+        elif question.kind == DIVIDER:
+            st.markdown("---")
+        elif question.kind == TOGGLE:
+            toggles[question.key] = checkbox_with_tier(
+                question.label, key,
+                value=_toggle_default(question, prefix, existing_data),
+                tier_label=question.tier_label
+            )
+        elif question.kind == TEXT:
+            data[key] = text_input_with_tier(
+                question.label, key,
+                value=stored_text(existing_data, key),
+                tier_label=question.tier_label
+            )
+        elif question.kind == TEXTAREA:
+            data[key] = text_area_with_counter(
+                question.label, key,
+                height=question.height,
+                max_chars=question.max_chars,
+                value=stored_text(existing_data, key),
+                tier_label=question.tier_label
+            )
+        elif question.kind == CHECKLIST:
+            data[key] = _render_checklist(question, prefix, existing_data)
+        elif question.kind == CHOICE:
+            stored = stored_text(existing_data, key)
+            index = question.options.index(stored) if stored in question.options else 0
+            data[key] = st.radio(question.label, question.options, index=index, key=key)
+        elif question.kind == MULTI:
+            stored = stored_text(existing_data, key).split(", ")
+            default = [option for option in question.options if option in stored]
+            data[key] = ", ".join(st.multiselect(question.label, question.options, default=default, key=key))
+
+
+def survey_form_buttons(save_label=None):
+    """
+    Buttons at the foot of a section form. Save Draft and Submit are form buttons too,
+    so answers typed but not yet saved are sent with them instead of being lost.
+
+    Returns:
+        str: The pressed button ('save', 'draft', 'submit') or None
+    """
+    columns = st.columns(3 if save_label else 2)
+    action = None
+    if save_label and columns[0].form_submit_button(save_label, use_container_width=True):
+        action = 'save'
+    if columns[-2].form_submit_button("💾 Save Draft", use_container_width=True):
+        action = 'draft'
+    submit_label = "💾 Update Survey" if st.session_state.edit_mode else "✅ Submit Survey"
+    if columns[-1].form_submit_button(submit_label, use_container_width=True, type="primary"):
+        action = 'submit'
+    return action
+
+
+def render_bp_questions(bp, tier, prefix, existing_data=None):
+    """
+    Render the questions for one Best Practice from its compiled schema plan.
+    Gating controls at the top of the plan (KPI toggles) stay live; the answers
+    are batched in a form and only reach the server when one of its buttons is pressed.
+
+    Args:
+        bp: Best Practice code ('BP1'..'BP6')
+        tier: Selected tier (1-3)
+        prefix: Answer key prefix ('bp1' or 'bp2')
+        existing_data: Previously saved answers used to prefill widgets
+
+    Returns:
+        tuple: (answers keyed by sheet column, pressed form button - see survey_form_buttons)
+    """
     existing_data = existing_data or {}
-    
-    if tier == 1:
-        st.markdown("### 🟢 Tier 1: Create Structure")
-        st.markdown("**Select the accountable measure(s) you plan to report: ***")
-        measures = []
-        if st.checkbox("Committee/council scheduled monthly at minimum", key=f"{prefix}_t1_monthly"):
-            measures.append("Monthly committee")
-        if st.checkbox("Team develops and works on capacity and throughput projects", key=f"{prefix}_t1_projects"):
-            measures.append("Throughput projects")
-        if st.checkbox("Other", key=f"{prefix}_t1_other_check"):
-            other = st.text_input("Describe other measure *", key=f"{prefix}_t1_other")
-            measures.append(f"Other: {other}")
-        
-        data[f'{prefix}_t1_measures'] = ", ".join(measures)
-        data[f'{prefix}_t1_formula'] = text_area_with_counter(
-            "Provide the target measures' formula to achieve tier 1 *",
-            f"{prefix}_t1_formula",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_t1_formula', '')
-        )
-        data[f'{prefix}_t1_actual'] = text_area_with_counter(
-            "Provide the target measures' actual performance results to achieve tier 1 *",
-            f"{prefix}_t1_actual",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_t1_actual', '')
-        )
-        data[f'{prefix}_improvements'] = text_area_with_counter(
-            "Describe any throughput improvements measured after implementing this best practice *",
-            f"{prefix}_improvements",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_improvements', '')
-        )
-    
-    elif tier == 2:
-        st.markdown("### 🟡 Tier 2: Establish Accountability")
-        st.markdown("**Select the accountable measure(s) you plan to report: ***")
-        measures2 = []
-        if st.checkbox("Committee/council scheduled monthly at minimum", key=f"{prefix}_t2_monthly"):
-            measures2.append("Monthly committee")
-        if st.checkbox("Committee meetings include regular report outs", key=f"{prefix}_t2_reportouts"):
-            measures2.append("Report outs")
-        if st.checkbox("Report outs include executive participation", key=f"{prefix}_t2_exec"):
-            measures2.append("Executive participation")
-        if st.checkbox("Team develops and works on capacity and throughput projects", key=f"{prefix}_t2_projects"):
-            measures2.append("Throughput projects")
-        if st.checkbox("KPIs are evidence-based", key=f"{prefix}_t2_evidence"):
-            measures2.append("Evidence-based KPIs")
-        if st.checkbox("Other", key=f"{prefix}_t2_other_check"):
-            other = st.text_input("Describe other Tier 2 measure *", key=f"{prefix}_t2_other")
-            measures2.append(f"Other: {other}")
-        
-        data[f'{prefix}_t2_measures'] = ", ".join(measures2)
-        data[f'{prefix}_t2_formula'] = text_area_with_counter(
-            "Provide the target measures' formula to achieve tier 2 *",
-            f"{prefix}_t2_formula",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_t2_formula', '')
-        )
-        data[f'{prefix}_t2_actual'] = text_area_with_counter(
-            "Provide the target measures' actual performance results to achieve tier 2 *",
-            f"{prefix}_t2_actual",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_t2_actual', '')
-        )
-        data[f'{prefix}_improvements'] = text_area_with_counter(
-            "Describe any throughput improvements measured after implementing this best practice *",
-            f"{prefix}_improvements",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_improvements', '')
-        )
-    
-    elif tier == 3:
-        st.markdown("### 🔴 Tier 3: Change Culture")
-        st.markdown("**Select the accountable measure(s) you plan to report: ***")
-        measures3 = []
-        if st.checkbox("Committee/council scheduled monthly at minimum", key=f"{prefix}_t3_monthly"):
-            measures3.append("Monthly committee")
-        if st.checkbox("Committee meetings include regular report outs", key=f"{prefix}_t3_reportouts"):
-            measures3.append("Report outs")
-        if st.checkbox("Report outs include executive participation", key=f"{prefix}_t3_exec"):
-            measures3.append("Executive participation")
-        if st.checkbox("Team develops and works on capacity and throughput projects", key=f"{prefix}_t3_projects"):
-            measures3.append("Throughput projects")
-        if st.checkbox("Committee ensures routine capacity/throughput huddles", key=f"{prefix}_t3_huddles"):
-            measures3.append("Routine huddles")
-        if st.checkbox("Committee ensures observation protocols", key=f"{prefix}_t3_obs"):
-            measures3.append("Observation protocols")
-        if st.checkbox("KPIs are evidence-based", key=f"{prefix}_t3_evidence"):
-            measures3.append("Evidence-based KPIs")
-        if st.checkbox("KPIs reported for key units/service lines", key=f"{prefix}_t3_units"):
-            measures3.append("KPIs for units")
-        if st.checkbox("Other", key=f"{prefix}_t3_other_check"):
-            other = st.text_input("Describe other Tier 3 measure *", key=f"{prefix}_t3_other")
-            measures3.append(f"Other: {other}")
-        
-        data[f'{prefix}_t3_measures'] = ", ".join(measures3)
-        data[f'{prefix}_t3_formula'] = text_area_with_counter(
-            "Provide the target measures' formula to achieve tier 3 *",
-            f"{prefix}_t3_formula",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_t3_formula', '')
-        )
-        data[f'{prefix}_t3_actual'] = text_area_with_counter(
-            "Provide the target measures' actual performance results to achieve tier 3 *",
-            f"{prefix}_t3_actual",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_t3_actual', '')
-        )
-        data[f'{prefix}_improvements'] = text_area_with_counter(
-            "Describe any throughput improvements measured after implementing this best practice *",
-            f"{prefix}_improvements",
-            height=100,
-            max_chars=1000,
-            value=existing_data.get(f'{prefix}_improvements', '')
-        )
-    
-    st.markdown("---")
-    data[f'{prefix}_rationale'] = text_area_with_counter(
-        "Provide the rationale to why you selected this best practice & tier *",
-        f"{prefix}_rationale",
-        height=150,
-        max_chars=2000,
-        value=existing_data.get(f'{prefix}_rationale', '')
-    )
-    data[f'{prefix}_success'] = text_area_with_counter(
-        "Are there any success stories and/or barriers to implementing this best practice? *",
-        f"{prefix}_success",
-        height=150,
-        max_chars=2000,
-        value=existing_data.get(f'{prefix}_success', '')
-    )
-    
-    return data
+    data = {}
+    toggles = {}
+
+    plan = compile_plan(bp, tier)
+    first_answer = next((i for i, q in enumerate(plan) if q.kind in ANSWER_KINDS), len(plan))
+
+    _render_questions(plan[:first_answer], prefix, existing_data, data, toggles)
+    with st.form(f"{prefix}_form", enter_to_submit=False):
+        _render_questions(plan[first_answer:], prefix, existing_data, data, toggles)
+        action = survey_form_buttons("✔️ Save answers")
+
+    return data, action
+
+
+def assigned_bp(slot, hospital_name):
+    """BP code HSCRC assigned to this hospital for section 1 or 2 ('' if they choose)"""
+    assigned_bps = HOSPITAL_BP_ASSIGNMENTS.get(hospital_name, ["", ""])
+    return assigned_bps[slot - 1] if len(assigned_bps) >= slot else ""
+
+
+def resolve_bp_choice(slot, hospital_name, values):
+    """(bp, tier) for a section: the hospital's assigned BP or the saved choice, and the saved tier"""
+    prefix = f"bp{slot}"
+    bp = assigned_bp(slot, hospital_name) or values.get(prefix, "")
+    if bp not in BP_OPTIONS:
+        bp = ""
+    return bp, tier_number(values.get(f'{prefix}_tier')) or 1
+
+
+def inactive_section(slot, hospital_name, values):
+    """Answers of a section that isn't on screen, taken from saved values without building widgets"""
+    prefix = f"bp{slot}"
+    bp, tier = resolve_bp_choice(slot, hospital_name, values)
+    if not bp:
+        return {'bp': bp, 'tier': None, 'data': {}}
 
-def render_bp6_questions(tier, prefix, existing_data=None):
-    """BP6: Clinical Pathways & Observation Management - CUMULATIVE with tier labels"""
     data = {}
-    existing_data = existing_data or {}
-    
-    st.markdown("### 🟢 Tier 1: Design and Implement")
-    data[f'{prefix}_t1_pathway'] = text_area_with_counter(
-        "Describe the clinical pathway that was selected and implemented to achieve tier 1 *",
-        f"{prefix}_t1_pathway",
-        height=150,
-        max_chars=2000,
-        value=existing_data.get(f'{prefix}_t1_pathway', ''),
-        tier_label=1
-    )
-    data[f'{prefix}_t1_target'] = text_input_with_tier(
-        "Provide the target measure to achieve tier 1 *",
-        f"{prefix}_t1_target",
-        value=existing_data.get(f'{prefix}_t1_target', ''),
-        tier_label=1
-    )
-    data[f'{prefix}_t1_actual'] = text_input_with_tier(
-        "Provide the actual performance results to achieve tier 1 *",
-        f"{prefix}_t1_actual",
-        value=existing_data.get(f'{prefix}_t1_actual', ''),
-        tier_label=1
-    )
-    
-    if tier >= 2:
-        st.markdown("### 🟡 Tier 2: Develop Data Infrastructure (in addition to Tier 1)")
-        data[f'{prefix}_t2_data'] = text_area_with_counter(
-            "Describe the data collection and analysis systems implemented to achieve tier 2 *",
-            f"{prefix}_t2_data",
-            height=150,
-            max_chars=2000,
-            value=existing_data.get(f'{prefix}_t2_data', ''),
-            tier_label=2
-        )
-        data[f'{prefix}_t2_target'] = text_input_with_tier(
-            "Provide the target measure to achieve tier 2 *",
-            f"{prefix}_t2_target",
-            value=existing_data.get(f'{prefix}_t2_target', ''),
-            tier_label=2
-        )
-        data[f'{prefix}_t2_actual'] = text_input_with_tier(
-            "Provide the actual performance results to achieve tier 2 *",
-            f"{prefix}_t2_actual",
-            value=existing_data.get(f'{prefix}_t2_actual', ''),
-            tier_label=2
-        )
-    
-    if tier >= 3:
-        st.markdown("### 🔴 Tier 3: Demonstrate Improvement (in addition to Tiers 1 & 2)")
-        data[f'{prefix}_t3_improvement'] = text_area_with_counter(
-            "Describe the measurable results that demonstrate improvement to achieve tier 3 *",
-            f"{prefix}_t3_improvement",
-            height=150,
-            max_chars=2000,
-            value=existing_data.get(f'{prefix}_t3_improvement', ''),
-            tier_label=3
-        )
-        data[f'{prefix}_t3_target'] = text_input_with_tier(
-            "Provide the target measure to achieve tier 3 *",
-            f"{prefix}_t3_target",
-            value=existing_data.get(f'{prefix}_t3_target', ''),
-            tier_label=3
-        )
-        data[f'{prefix}_t3_actual'] = text_input_with_tier(
-            "Provide the actual performance results to achieve tier 3 *",
-            f"{prefix}_t3_actual",
-            value=existing_data.get(f'{prefix}_t3_actual', ''),
-            tier_label=3
-        )
-    
-    st.markdown("---")
-    data[f'{prefix}_rationale'] = text_area_with_counter(
-        "Provide the rationale to why you selected this best practice & tier *",
-        f"{prefix}_rationale",
-        height=150,
-        max_chars=2000,
-        value=existing_data.get(f'{prefix}_rationale', '')
-    )
-    data[f'{prefix}_success'] = text_area_with_counter(
-        "Are there any success stories and/or barriers to implementing this best practice? *",
-        f"{prefix}_success",
-        height=150,
-        max_chars=2000,
-        value=existing_data.get(f'{prefix}_success', '')
-    )
-    
-    return data
+    toggles = {}
+    for question in compile_plan(bp, tier):
+        if question.kind == TOGGLE:
+            toggles[question.key] = _toggle_default(question, prefix, values)
+        elif question.kind in ANSWER_KINDS and (not question.show_if or toggles.get(question.show_if)):
+            data[f"{prefix}_{question.key}"] = stored_text(values, f"{prefix}_{question.key}")
+    return {'bp': bp, 'tier': tier, 'data': data}
+
+
+def render_bp_section(slot, hospital_name, values):
+    """
+    One Best Practice section (BP choice, tier, questions).
+    The section's current answers are published in st.session_state.bp_sections;
+    its BP, tier and KPI toggles are kept in survey_values so they survive tab switches.
+    Save Draft / Submit hand over to the page as st.session_state.survey_action.
+    """
+    prefix = f"bp{slot}"
+    ordinal = "first" if slot == 1 else "second"
+    survey_values = st.session_state.survey_values
+
+    st.markdown('<div class="bp-section">', unsafe_allow_html=True)
+    st.markdown(f"## 📋 Best Practice #{slot}")
+
+    # Assigned BP for this hospital, else let them choose (pre-filled from saved values)
+    bp, tier_default = resolve_bp_choice(slot, hospital_name, values)
+    bp_options_list = list(BP_OPTIONS.keys())
+    if not assigned_bp(slot, hospital_name):
+        bp = st.selectbox(f"Select the {ordinal} Best Practice *",
+                          bp_options_list,
+                          format_func=lambda x: BP_OPTIONS[x],
+                          key=prefix,
+                          index=bp_options_list.index(bp))
+    survey_values[prefix] = bp
+
+    section = {'bp': bp, 'tier': None, 'data': {}}
+    action = None
+    if bp and bp != "":
+        st.markdown(f"### 🎯 {TIER_DESCRIPTIONS[bp]['name']}")
+
+        for t in [1, 2, 3]:
+            with st.expander(f"📖 {TIER_DESCRIPTIONS[bp][t]['title']}", expanded=False):
+                st.text(TIER_DESCRIPTIONS[bp][t]['description'])
+
+        tier = st.radio("Select the highest tier you plan to report *",
+                        [1, 2, 3],
+                        format_func=lambda x: f"Tier {x}",
+                        key=f"tier{slot}",
+                        horizontal=True,
+                        index=tier_default - 1)
+        survey_values[f'{prefix}_tier'] = tier
+
+        st.markdown("---")
+        st.markdown("### 📝 Questions")
+
+        # Answers saved earlier in this session win over the stored submission,
+        # so switching tier or tab back and forth doesn't lose them
+        data, action = render_bp_questions(bp, tier, prefix, {**values, **survey_values})
+        for question in compile_plan(bp, tier):
+            if question.kind == TOGGLE:
+                survey_values[f"{prefix}_{question.key}"] = st.session_state.get(f"{prefix}_{question.key}", False)
+        if action:
+            survey_values.update(data)
+        if action == 'save':
+            st.success(f"✔️ Best Practice #{slot} answers saved")
+        section = {'bp': bp, 'tier': tier, 'data': data}
+    else:
+        with st.form(f"{prefix}_form", enter_to_submit=False):
+            action = survey_form_buttons()
+
+    st.session_state.bp_sections[prefix] = section
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    if action in ('draft', 'submit'):
+        # Saving and submitting happen at page level, after the contact details
+        st.session_state.survey_action = action
+        st.rerun()
+
+
+@st.fragment
+def render_bp_tabs(hospital_name, existing_data):
+    """
+    Both Best Practice sections as tabs. Only the active section's widgets are built;
+    the other keeps its answers in session state. Runs as a fragment, so switching
+    tabs, changing the tier or a KPI toggle reruns only this part of the page.
+    """
+    values = {**existing_data, **st.session_state.survey_values}
+
+    tab_labels = {}
+    for slot in (1, 2):
+        section = st.session_state.bp_sections.get(f"bp{slot}")
+        bp = section['bp'] if section else resolve_bp_choice(slot, hospital_name, values)[0]
+        tab_labels[slot] = f"📋 Best Practice #{slot}" + (f" ({bp})" if bp else "")
+
+    active = st.radio("Best Practice section", [1, 2], format_func=tab_labels.get,
+                      key="active_bp_tab", horizontal=True, label_visibility="collapsed")
+
+    for slot in (1, 2):
+        if slot == active:
+            render_bp_section(slot, hospital_name, values)
+        elif f"bp{slot}" not in st.session_state.bp_sections:
+            st.session_state.bp_sections[f"bp{slot}"] = inactive_section(slot, hospital_name, values)
+
+    autosave_draft(hospital_name)
+
+# ==================== DRAFT AUTOSAVE ====================
+CONTACT_FIELDS = ['contact_name', 'email', 'phone', 'secondary_contact_name', 'secondary_email', 'secondary_phone']
+
+def current_form_values():
+    """Everything entered so far: committed form sections plus the live BP/tier controls"""
+    values = {field: st.session_state.get(f"form_{field}", '') for field in CONTACT_FIELDS}
+    for prefix, section in st.session_state.bp_sections.items():
+        values[prefix] = section['bp']
+        values[f'{prefix}_tier'] = section['tier']
+        values.update(section['data'])
+    return values
+
+def autosave_draft(hospital_name, initialize=False):
+    """
+    Hand changed form values to the debounced draft store.
+    The first full render only records a baseline, so opening the form doesn't create a draft.
+    """
+    if st.session_state.draft_snapshot is None and not initialize:
+        return
+    values = current_form_values()
+    if st.session_state.draft_snapshot is None:
+        st.session_state.draft_snapshot = values
+    elif values != st.session_state.draft_snapshot:
+        get_draft_store().save_later(hospital_name, values)
+        st.session_state.draft_snapshot = values
+
+def reset_form_state():
+    """Forget in-session form values so widgets prefill from saved data again"""
+    for key in list(st.session_state.keys()):
+        if key.startswith(('form_', 'bp1', 'bp2', 'tier1', 'tier2')):
+            del st.session_state[key]
+    st.session_state.survey_values = {}
+    st.session_state.bp_sections = {}
+    st.session_state.draft_snapshot = None
 
 # ==================== INITIALIZE SESSION STATE ====================
 if 'logged_in' not in st.session_state:
@@ -1209,6 +685,14 @@ if 'edit_mode' not in st.session_state:
     st.session_state.edit_mode = False
 if 'just_submitted' not in st.session_state:
     st.session_state.just_submitted = False
+if 'email_keys' not in st.session_state:
+    st.session_state.email_keys = []
+if 'survey_values' not in st.session_state:
+    st.session_state.survey_values = {}     # Answers committed by section forms this session
+if 'bp_sections' not in st.session_state:
+    st.session_state.bp_sections = {}       # 'bp1'/'bp2' -> {'bp', 'tier', 'data'}
+if 'draft_snapshot' not in st.session_state:
+    st.session_state.draft_snapshot = None  # Form values last handed to the draft store
 
 # ==================== LOGIN SIDEBAR ====================
 with st.sidebar:
@@ -1228,9 +712,11 @@ with st.sidebar:
             if hospital_selection and password == HOSPITAL_CREDS.get(hospital_selection):
                 st.session_state.logged_in = True
                 st.session_state.hospital = hospital_selection
+                log_event(LOGIN, hospital_selection, hospital_selection)
                 st.success(f"✅ Welcome, {hospital_selection}!")
                 st.rerun()
             else:
+                log_event(LOGIN_FAILED, hospital_selection, hospital_selection)
                 st.error("❌ Invalid hospital or password")
         
         st.markdown("---")
@@ -1240,6 +726,8 @@ with st.sidebar:
     else:
         st.markdown(f"**Logged in as:**")
         st.info(st.session_state.hospital)
+        if SETTINGS.sheets.cycle:
+            st.markdown(f"**Reporting cycle:** {SETTINGS.sheets.cycle}")
         if st.button("🚪 Logout", use_container_width=True):
             st.session_state.clear()
             st.rerun()
@@ -1278,6 +766,9 @@ if st.session_state.just_submitted:
     st.session_state.edit_mode = False
     # Continue to show portal view below
 
+# Delivery status of emails queued by the last Submit/Approve
+show_email_status()
+
 if existing_submission is not None and not st.session_state.edit_mode:
     # ==================== PORTAL VIEW (Read-Only) ====================
     st.markdown('<div class="main-header">🏥 Your Submission</div>', unsafe_allow_html=True)
@@ -1329,39 +820,18 @@ if existing_submission is not None and not st.session_state.edit_mode:
                 data['approved_at'] = approved_at_time
                 
                 with st.spinner("Approving submission..."):
-                    success = save_or_update_submission(selected_hospital, data)  # Actually updates the row now
+                    success, _ = save_submission_changes(selected_hospital, data, existing_submission.to_dict(),
+                                                         action='approve', saved_by=data['approved_by'])
                 
                 if success:
-                    # Send approval email to hospital(s)
-                    with st.spinner("Sending approval email..."):
-                        # Send to primary contact
-                        email_sent_primary = send_approval_email(
-                            recipient_email=existing_submission.get('email'),
-                            hospital_name=selected_hospital,
-                            contact_name=existing_submission.get('contact_name'),
-                            approved_by=data['approved_by'],
-                            approved_at=approved_at_time
-                        )
-                        
-                        # Send to secondary contact if provided
-                        email_sent_secondary = True
-                        secondary_email_addr = existing_submission.get('secondary_email')
-                        if secondary_email_addr and secondary_email_addr.strip():
-                            email_sent_secondary = send_approval_email(
-                                recipient_email=secondary_email_addr,
-                                hospital_name=selected_hospital,
-                                contact_name=existing_submission.get('secondary_contact_name') or "Secondary Contact",
-                                approved_by=data['approved_by'],
-                                approved_at=approved_at_time
-                            )
-                        
-                        if email_sent_primary:
-                            st.success("📧 Approval email sent!")
-                            # Note: Secondary email failures are handled silently since it's optional
-                        else:
-                            st.error("❌ Failed to send approval email.")
+                    # Queue approval email to hospital(s) - delivered in the background
+                    st.session_state.email_keys = queue_notification_emails(
+                        'approval', data, approved_at_time,
+                        approved_by=data['approved_by'],
+                        approved_at=approved_at_time
+                    )
                     
-                    st.cache_data.clear()
+                    load_hospital_submission.clear(selected_hospital)
                     st.success("✅ Submission approved!")
                     st.rerun()
                 else:
@@ -1404,10 +874,11 @@ if existing_submission is not None and not st.session_state.edit_mode:
                     data['approved_at'] = ''
                     
                     with st.spinner("Un-approving submission..."):
-                        success = save_or_update_submission(selected_hospital, data)  # Actually updates the row now
+                        success, _ = save_submission_changes(selected_hospital, data, existing_submission.to_dict(),
+                                                             action='unapprove', saved_by=entered_email.strip())
                     
                     if success:
-                        st.cache_data.clear()
+                        load_hospital_submission.clear(selected_hospital)
                         st.session_state['show_unapprove_dialog'] = False
                         st.success("✅ Submission un-approved! You can now edit.")
                         st.rerun()
@@ -1499,10 +970,9 @@ if existing_submission is not None and not st.session_state.edit_mode:
     if bp_reported:
         st.markdown("---")
         st.markdown("## 📄 Download Report")
-        pdf_buffer = generate_hospital_pdf(existing_submission)
         st.download_button(
             label="📥 Download PDF Report",
-            data=pdf_buffer,
+            data=hospital_pdf_bytes(tuple(existing_submission.items())),
             file_name=f"{selected_hospital}_HSCRC_Survey.pdf",
             mime="application/pdf",
             use_container_width=True
@@ -1540,248 +1010,155 @@ else:
     
     # Convert existing submission to dict if it exists
     existing_data = existing_submission.to_dict() if existing_submission is not None else {}
+    saved_row = dict(existing_data)     # What is in Google Sheets now (for change tracking)
+    
+    # Restore unsaved work from the local draft store (newer than anything in Google Sheets)
+    draft = get_draft_store().load(selected_hospital)
+    if draft is not None:
+        draft_values, draft_time = draft
+        existing_data = {**existing_data, **draft_values}
+        col_draft1, col_draft2 = st.columns([3, 1])
+        with col_draft1:
+            st.info(f"📝 Restored your unsaved changes from {datetime.fromtimestamp(draft_time).strftime('%Y-%m-%d %H:%M')}.")
+        with col_draft2:
+            if st.button("🗑️ Discard changes", use_container_width=True):
+                get_draft_store().discard(selected_hospital)
+                reset_form_state()
+                st.rerun()
     
-    # Hospital Info (pre-filled if editing)
+    # Hospital Info (pre-filled if editing). Plain widgets, not a form: their values reach
+    # the server on blur, so Save Draft / Submit below never miss a contact change
     st.markdown("## 🏥 Hospital Information")
 
     st.markdown("### Primary Contact")
     col1, col2 = st.columns(2)
     with col1:
-        contact_name = st.text_input("Primary Contact Name *", value=existing_data.get('contact_name', ''))
+        contact_name = st.text_input("Primary Contact Name *", value=existing_data.get('contact_name', ''), key="form_contact_name")
     with col2:
-        email = st.text_input("Primary Email Address *", value=existing_data.get('email', ''))
+        email = st.text_input("Primary Email Address *", value=existing_data.get('email', ''), key="form_email")
 
-    phone = st.text_input("Primary Phone Number *", value=existing_data.get('phone', ''))
+    phone = st.text_input("Primary Phone Number *", value=existing_data.get('phone', ''), key="form_phone")
 
     st.markdown("### Secondary Contact (Optional)")
     col3, col4 = st.columns(2)
     with col3:
-        secondary_contact_name = st.text_input("Secondary Contact Name", value=existing_data.get('secondary_contact_name', ''))
+        secondary_contact_name = st.text_input("Secondary Contact Name", value=existing_data.get('secondary_contact_name', ''), key="form_secondary_contact_name")
     with col4:
-        secondary_email = st.text_input("Secondary Email Address", value=existing_data.get('secondary_email', ''))
+        secondary_email = st.text_input("Secondary Email Address", value=existing_data.get('secondary_email', ''), key="form_secondary_email")
 
-    secondary_phone = st.text_input("Secondary Phone Number", value=existing_data.get('secondary_phone', ''))
+    secondary_phone = st.text_input("Secondary Phone Number", value=existing_data.get('secondary_phone', ''), key="form_secondary_phone")
     st.markdown("---")
     
-    # ==================== BP #1 ====================
-    st.markdown('<div class="bp-section">', unsafe_allow_html=True)
-    st.markdown("## 📋 Best Practice #1")
-    
-    bp1_default = existing_data.get('bp1', '')
-    bp1_options_list = list(BP_OPTIONS.keys())
-    bp1_default_index = bp1_options_list.index(bp1_default) if bp1_default in bp1_options_list else 0
-    
-    # Get assigned BPs for this hospital
-    assigned_bps = HOSPITAL_BP_ASSIGNMENTS.get(selected_hospital, ["", ""])
-    assigned_bp1 = assigned_bps[0] if len(assigned_bps) > 0 else ""
-    assigned_bp2 = assigned_bps[1] if len(assigned_bps) > 1 else ""
-
-    # Pre-fill with assigned BP or use existing data
-    bp1_value = existing_data.get('bp1', assigned_bp1)
-    bp1_index = bp1_options_list.index(bp1_value) if bp1_value in bp1_options_list else 0
-
-    if assigned_bp1:
-        bp1 = assigned_bp1
-
-    else:
-        # Allow manual selection if no assignment
-        bp1 = st.selectbox("Select the first Best Practice *", 
-                        bp1_options_list, 
-                        format_func=lambda x: BP_OPTIONS[x], 
-                        key="bp1",
-                        index=bp1_index)
+    # ==================== BP #1 / BP #2 ====================
+    render_bp_tabs(selected_hospital, existing_data)
     
-    bp1_data = {}
-    if bp1 and bp1 != "":
-        st.markdown(f"### 🎯 {TIER_DESCRIPTIONS[bp1]['name']}")
-        
-        for t in [1, 2, 3]:
-            with st.expander(f"📖 {TIER_DESCRIPTIONS[bp1][t]['title']}", expanded=False):
-                st.text(TIER_DESCRIPTIONS[bp1][t]['description'])
-        
-        tier1_default = int(existing_data.get('bp1_tier', 1)) if existing_data.get('bp1_tier') else 1
-        tier1 = st.radio("Select the highest tier you plan to report *", 
-                        [1, 2, 3], 
-                        format_func=lambda x: f"Tier {x}", 
-                        key="tier1", 
-                        horizontal=True,
-                        index=tier1_default - 1)
-        
-        st.markdown("---")
-        st.markdown("### 📝 Questions")
-        
-        if bp1 == "BP1":
-            bp1_data = render_bp1_questions(tier1, "bp1", existing_data)
-        elif bp1 == "BP2":
-            bp1_data = render_bp2_questions(tier1, "bp1", existing_data)
-        elif bp1 == "BP3":
-            bp1_data = render_bp3_questions(tier1, "bp1", existing_data)
-        elif bp1 == "BP4":
-            bp1_data = render_bp4_questions(tier1, "bp1", existing_data)
-        elif bp1 == "BP5":
-            bp1_data = render_bp5_questions(tier1, "bp1", existing_data)
-        elif bp1 == "BP6":
-            bp1_data = render_bp6_questions(tier1, "bp1", existing_data)
+    bp1_section = st.session_state.bp_sections.get('bp1', {})
+    bp2_section = st.session_state.bp_sections.get('bp2', {})
+    bp1, tier1, bp1_data = bp1_section.get('bp'), bp1_section.get('tier'), bp1_section.get('data', {})
+    bp2, tier2, bp2_data = bp2_section.get('bp'), bp2_section.get('tier'), bp2_section.get('data', {})
+    autosave_draft(selected_hospital, initialize=True)
     
-    st.markdown('</div>', unsafe_allow_html=True)
-    
-    # ==================== BP #2 ====================
-    st.markdown('<div class="bp-section">', unsafe_allow_html=True)
-    st.markdown("## 📋 Best Practice #2")
-    
-    bp2_default = existing_data.get('bp2', '')
-    bp2_options_list = list(BP_OPTIONS.keys())
-    bp2_default_index = bp2_options_list.index(bp2_default) if bp2_default in bp2_options_list else 0
+    # ==================== SUBMIT ====================
+    st.markdown("---")
     
-    # Get assigned BPs for this hospital
-    assigned_bps = HOSPITAL_BP_ASSIGNMENTS.get(selected_hospital, ["", ""])
-    assigned_bp1 = assigned_bps[0] if len(assigned_bps) > 0 else ""
-    assigned_bp2 = assigned_bps[1] if len(assigned_bps) > 1 else ""
-
-    # Pre-fill BP2 with assigned BP or use existing data
-    bp2_value = existing_data.get('bp2', assigned_bp2)
-    bp2_index = bp2_options_list.index(bp2_value) if bp2_value in bp2_options_list else 0
-
-    if assigned_bp2:
-        bp2 = assigned_bp2
+    # ==================== SAVE DRAFT & SUBMIT ====================
+    # The buttons are in the Best Practice section form (see survey_form_buttons)
+    survey_action = st.session_state.pop('survey_action', None)
+    
+    if survey_action == 'draft':
+        # Build submission data dictionary
+        data = {
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'hospital_name': selected_hospital,
+            'contact_name': contact_name,
+            'email': email,
+            'phone': phone,
+            'secondary_contact_name': secondary_contact_name,  # ← ADD
+            'secondary_email': secondary_email,                # ← ADD
+            'secondary_phone': secondary_phone,                # ← ADD
+            'bp1': bp1,
+            'bp1_tier': tier1 if bp1 else None,
+            'bp2': bp2,
+            'bp2_tier': tier2 if bp2 else None,
+            'approved': 'False',
+            'approved_by': '',
+            'approved_at': ''
+        }
         
-    else:
-        # Allow manual selection if no assignment
-        bp2 = st.selectbox("Select the second Best Practice *", 
-                        bp2_options_list, 
-                        format_func=lambda x: BP_OPTIONS[x], 
-                        key="bp2",
-                        index=bp2_index)
-    
-    bp2_data = {}
-    if bp2 and bp2 != "":
-        st.markdown(f"### 🎯 {TIER_DESCRIPTIONS[bp2]['name']}")
+        # Add BP-specific data
+        data.update(bp1_data)
+        data.update(bp2_data)
         
-        for t in [1, 2, 3]:
-            with st.expander(f"📖 {TIER_DESCRIPTIONS[bp2][t]['title']}", expanded=False):
-                st.text(TIER_DESCRIPTIONS[bp2][t]['description'])
+        # Save to Google Sheets (NO EMAIL!) - only the fields that changed
+        with st.spinner("Saving draft..."):
+            success, patch = save_submission_changes(selected_hospital, data, saved_row,
+                                                     action='draft', saved_by=contact_name)
         
-        tier2_default = int(existing_data.get('bp2_tier', 1)) if existing_data.get('bp2_tier') else 1
-        tier2 = st.radio("Select the highest tier you plan to report *", 
-                        [1, 2, 3], 
-                        format_func=lambda x: f"Tier {x}", 
-                        key="tier2", 
-                        horizontal=True,
-                        index=tier2_default - 1)
+        if success:
+            st.success("💾 Draft saved! You can come back anytime to continue editing.")
+            get_draft_store().discard(selected_hospital)
+            st.session_state.draft_snapshot = None
+            if patch:
+                load_hospital_submission.clear(selected_hospital)
+        else:
+            st.error("❌ Failed to save draft. Please try again.")
+    
+    if survey_action == 'submit':
+        # Build submission data dictionary
+        data = {
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'hospital_name': selected_hospital,
+            'contact_name': contact_name,
+            'email': email,
+            'phone': phone,
+            'secondary_contact_name': secondary_contact_name,  # ← ADD
+            'secondary_email': secondary_email,                # ← ADD
+            'secondary_phone': secondary_phone,                # ← ADD
+            'bp1': bp1,
+            'bp1_tier': tier1 if bp1 else None,
+            'bp2': bp2,
+            'bp2_tier': tier2 if bp2 else None,
+            'approved': 'False',
+            'approved_by': '',
+            'approved_at': ''
+        }
         
-        st.markdown("---")
-        st.markdown("### 📝 Questions")
+        # Add BP-specific data
+        data.update(bp1_data)
+        data.update(bp2_data)
         
-        if bp2 == "BP1":
-            bp2_data = render_bp1_questions(tier2, "bp2", existing_data)
-        elif bp2 == "BP2":
-            bp2_data = render_bp2_questions(tier2, "bp2", existing_data)
-        elif bp2 == "BP3":
-            bp2_data = render_bp3_questions(tier2, "bp2", existing_data)
-        elif bp2 == "BP4":
-            bp2_data = render_bp4_questions(tier2, "bp2", existing_data)
-        elif bp2 == "BP5":
-            bp2_data = render_bp5_questions(tier2, "bp2", existing_data)
-        elif bp2 == "BP6":
-            bp2_data = render_bp6_questions(tier2, "bp2", existing_data)
-    
-    st.markdown('</div>', unsafe_allow_html=True)
-    
-    # ==================== SUBMIT ====================
-    st.markdown("---")
-    
-    # ==================== SAVE DRAFT & SUBMIT BUTTONS ====================
-    col_btn1, col_btn2 = st.columns(2)
-    
-    with col_btn1:
-        if st.button("💾 Save Draft", use_container_width=True, type="secondary"):
-            # Build submission data dictionary
-            data = {
-                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                'hospital_name': selected_hospital,
-                'contact_name': contact_name,
-                'email': email,
-                'phone': phone,
-                'secondary_contact_name': secondary_contact_name,  # ← ADD
-                'secondary_email': secondary_email,                # ← ADD
-                'secondary_phone': secondary_phone,                # ← ADD
-                'bp1': bp1,
-                'bp1_tier': tier1 if bp1 else None,
-                'bp2': bp2,
-                'bp2_tier': tier2 if bp2 else None,
-                'approved': 'False',
-                'approved_by': '',
-                'approved_at': ''
-            }
-            
-            # Add BP-specific data
-            data.update(bp1_data)
-            data.update(bp2_data)
-            
-            # Save to Google Sheets (NO EMAIL!)
-            with st.spinner("Saving draft..."):
-                success = save_or_update_submission(selected_hospital, data)
-            
-            if success:
-                st.success("💾 Draft saved! You can come back anytime to continue editing.")
-                st.cache_data.clear()
-            else:
-                st.error("❌ Failed to save draft. Please try again.")
-    
-    with col_btn2:
-        submit_label = "💾 Update Survey" if st.session_state.edit_mode else "✅ Submit Survey"
+        # Required answers come from the question schema (only questions that were shown)
+        missing = []
+        if bp1:
+            missing += validate_answers(bp1, tier1, "bp1", bp1_data)
+        if bp2:
+            missing += validate_answers(bp2, tier2, "bp2", bp2_data)
         
-        if st.button(submit_label, use_container_width=True, type="primary"):
-            # Build submission data dictionary
-            data = {
-                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                'hospital_name': selected_hospital,
-                'contact_name': contact_name,
-                'email': email,
-                'phone': phone,
-                'secondary_contact_name': secondary_contact_name,  # ← ADD
-                'secondary_email': secondary_email,                # ← ADD
-                'secondary_phone': secondary_phone,                # ← ADD
-                'bp1': bp1,
-                'bp1_tier': tier1 if bp1 else None,
-                'bp2': bp2,
-                'bp2_tier': tier2 if bp2 else None,
-                'approved': 'False',
-                'approved_by': '',
-                'approved_at': ''
-            }
-            
-            # Add BP-specific data
-            data.update(bp1_data)
-            data.update(bp2_data)
-            
-            # Save/Update in Google Sheets (updates existing row if hospital exists)
+        if missing:
+            st.error("❌ Please complete the required questions before submitting:\n- " + "\n- ".join(missing))
+            success = None
+        else:
+            # Save/Update in Google Sheets (only the fields that changed)
             with st.spinner("Saving to Database..."):
-                success = save_or_update_submission(selected_hospital, data)
+                success, patch = save_submission_changes(selected_hospital, data, saved_row,
+                                                         action='submit', saved_by=contact_name)
+        
+        if success and not patch and st.session_state.edit_mode:
+            # Update with nothing changed: no write, no email, no cache refresh
+            get_draft_store().discard(selected_hospital)
+            st.info("ℹ️ No changes since your last save - nothing to update.")
+        elif success:
+            # Queue email confirmation - delivered in the background so Submit returns right away
+            st.session_state.email_keys = queue_notification_emails(
+                'submission', data, data['timestamp'],
+                submission_data=data
+            )
             
-            if success:
-                # Send email notification to hospital
-                with st.spinner("Sending email confirmation..."):
-                    # Send to primary contact
-                    email_sent_primary = send_submission_email(
-                        recipient_email=email,
-                        hospital_name=selected_hospital,
-                        contact_name=contact_name,
-                        submission_data=data
-                    )
-                    
-                    # Send to secondary contact if provided
-                    email_sent_secondary = True
-                    if secondary_email.strip():
-                        email_sent_secondary = send_submission_email(
-                            recipient_email=secondary_email,
-                            hospital_name=selected_hospital,
-                            contact_name=secondary_contact_name or "Secondary Contact",
-                            submission_data=data
-                        )
-                    
-                    if email_sent_primary:
-                        st.success("📧 Approval email sent!")
-                        # Note: Secondary email failures are handled silently since it's optional
-                    else:
-                        st.error("❌ Failed to send approval email.")
+            if patch:
+                load_hospital_submission.clear(selected_hospital)
+            get_draft_store().discard(selected_hospital)
+            reset_form_state()
+            st.session_state.just_submitted = True
+            st.rerun()
+        elif success is False:
+            st.error("❌ Failed to save survey. Please try again.")
@@ -5,6 +5,7 @@ from datetime import datetime
 import plotly.express as px
 import plotly.graph_objects as go
 from io import BytesIO
+from survey_registry import require_registry
 
 # ==================== 2. SET_PAGE_CONFIG (MUST BE HERE!) ====================
 st.set_page_config(
@@ -24,14 +25,9 @@ HSCRC_STAFF = {
 }
 
 # BP Names mapping
-BP_NAMES = {
-    "BP1": "BP1: Interdisciplinary Rounds & Early Discharge Planning",
-    "BP2": "BP2: Bed Capacity Alert System",
-    "BP3": "BP3: Standardized Daily Shift Huddles",
-    "BP4": "BP4: Expedited Care Intervention",
-    "BP5": "BP5: Patient Flow Throughput Performance Council",
-    "BP6": "BP6: Clinical Pathways & Observation Management"
-}
+# Hospitals and Best Practices are shared across apps (survey_registry.json)
+REGISTRY = require_registry()
+BP_NAMES = REGISTRY.bp_names
 
 # ==================== CUSTOM STYLING ====================
 st.markdown("""
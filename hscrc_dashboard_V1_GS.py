@@ -4,10 +4,34 @@ import pandas as pd
 from datetime import datetime
 import plotly.express as px
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 from io import BytesIO
 
 # Import Google Sheets connector
-from google_sheets_connector import load_data_from_sheets
+from google_sheets_connector import load_data_from_sheets, update_submissions_fields, current_cycle, list_cycle_worksheets
+from settings import require_settings
+from survey_registry import require_registry
+
+# Shared aggregations (also used by the statewide PDF report)
+from survey_analytics import (
+    explode_bp_selections, filter_selections, bp_popularity,
+    tier_distribution, tier_colors, bp_tier_matrix, cycle_overview, bp_tier_by_cycle, data_version, TIER_COLORS
+)
+# Cross-cycle tier trajectories and distributions
+from survey_trends import (
+    cycle_selections, tier_trajectories, trajectory_summary, statewide_distribution, trajectory_segments
+)
+# Long-format (one row per answer) view of the BP answers
+from long_format import to_long, field_values, cell_counts
+from kpi_extraction import kpi_table, attainment_by_bp, CONFIDENCE_LEVELS
+# Past reporting cycles are read from frozen snapshots, not Google Sheets
+from cycle_archive import frozen_cycles, load_snapshot, freeze_cycle, snapshot_path, stack_cycles, ArchiveError
+from statewide_report import write_statewide_report
+from reminder_campaign import find_pending_hospitals, start_reminder_campaign, campaign_running, get_campaign_log, QUEUED
+from email_outbox import enqueue_emails, notification_emails
+from survey_schema import is_approved
+from submission_history import record_version
+from audit_log import get_audit_log, log_event, LOGIN, LOGIN_FAILED, APPROVE, CYCLE_FROZEN, EVENT_TYPES
 
 # ==================== 2. SET_PAGE_CONFIG (MUST BE HERE!) ====================
 st.set_page_config(
@@ -17,6 +41,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# Secrets are parsed and validated once per process; stop here with one clear error if invalid
+SETTINGS = require_settings()
+
 # ==================== 3. CONFIGURATION ====================
 
 # HSCRC Staff credentials
@@ -26,15 +53,10 @@ HSCRC_STAFF = {
     "admin": "hscrc2025"
 }
 
-# BP Names mapping
-BP_NAMES = {
-    "BP1": "BP1: Interdisciplinary Rounds & Early Discharge Planning",
-    "BP2": "BP2: Bed Capacity Alert System",
-    "BP3": "BP3: Standardized Daily Shift Huddles",
-    "BP4": "BP4: Expedited Care Intervention",
-    "BP5": "BP5: Patient Flow Throughput Performance Council",
-    "BP6": "BP6: Clinical Pathways & Observation Management"
-}
+# Hospital roster and BP names are shared with the hospital portal (survey_registry.json)
+REGISTRY = require_registry()
+HOSPITAL_NAMES = REGISTRY.hospital_names
+BP_NAMES = REGISTRY.bp_names
 
 # ==================== CUSTOM STYLING ====================
 st.markdown("""
@@ -62,17 +84,37 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # ==================== DATA FUNCTIONS ====================
-@st.cache_data(ttl=60)
+@st.cache_data(ttl=SETTINGS.cache.data_ttl)
 def load_data():
-    """Load data from Google Sheets"""
-    df = load_data_from_sheets()
-    
-    if df.empty:
-        st.warning("⚠️ No submissions found in Google Sheets yet.")
-        st.info("Hospitals can submit data using the Survey app, and it will appear here automatically!")
-        st.stop()
-    
-    return df
+    """Load the active cycle's data from Google Sheets"""
+    return load_data_from_sheets()
+
+def load_cycle_data(cycle):
+    """Submissions for a reporting cycle: live from Google Sheets, or from its frozen snapshot"""
+    if cycle == LIVE_CYCLE:
+        return load_data()
+    return load_snapshot(cycle)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def load_cycle_trends(cycle_versions):
+    """Trend tables for a set of cycles, recomputed only when the set or a cycle's data changes"""
+    cycles = [cycle for cycle, _ in cycle_versions]
+    stacked = stack_cycles({cycle: load_cycle_data(cycle) for cycle in cycles})
+    selections = cycle_selections(stacked, cycles)
+    trajectories = tier_trajectories(selections)
+    return {
+        'overview': cycle_overview(stacked, len(HOSPITAL_NAMES)),
+        'bp_tiers': bp_tier_by_cycle(stacked, BP_NAMES),
+        'trajectories': trajectories,
+        'summary': trajectory_summary(trajectories),
+        'distribution': statewide_distribution(selections),
+        'distribution_by_bp': statewide_distribution(selections, by_bp=True),
+    }
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def load_kpis(cycle, version):
+    """Typed KPI table for a cycle, re-parsed only when that cycle's data changes"""
+    return kpi_table(load_cycle_data(cycle))
 
 
 # ==================== LOGIN SYSTEM ====================
@@ -88,9 +130,11 @@ with st.sidebar:
         if username in HSCRC_STAFF and password == HSCRC_STAFF[username]:
             st.session_state['hscrc_logged_in'] = True
             st.session_state['staff_name'] = username.title()
+            log_event(LOGIN, actor=username.title(), app='dashboard')
             st.success(f"✅ Welcome back, {username.title()}!")
             st.rerun()
         else:
+            log_event(LOGIN_FAILED, actor=username.strip().title() or None, app='dashboard')
             st.error("❌ Invalid username or password")
     
     st.markdown("---")
@@ -126,12 +170,35 @@ if 'hscrc_logged_in' not in st.session_state or not st.session_state['hscrc_logg
     st.stop()
 
 # ==================== MAIN DASHBOARD (AFTER LOGIN) ====================
+# Reporting cycles: the active one (live in Google Sheets) plus every frozen past cycle
+LIVE_CYCLE = current_cycle()
+CYCLES = [cycle for cycle in frozen_cycles() if cycle != LIVE_CYCLE] + [LIVE_CYCLE]
+
+with st.sidebar:
+    st.markdown("---")
+    selected_cycle = st.selectbox(
+        "🗓️ Reporting Cycle:",
+        options=CYCLES[::-1],
+        format_func=lambda cycle: f"{cycle} (live)" if cycle == LIVE_CYCLE else f"{cycle} (frozen)",
+        key="selected_cycle"
+    )
+viewing_live = selected_cycle == LIVE_CYCLE
+
 # Load data
-df = load_data()
+df = load_cycle_data(selected_cycle)
+live_df = df if viewing_live else load_data()
+
+if df.empty:
+    st.warning(f"⚠️ No submissions found for the {selected_cycle} cycle yet.")
+    st.info("Hospitals can submit data using the Survey app, and it will appear here automatically!")
+    st.stop()
 
 # Header
 st.markdown('<div class="main-header">📊 HSCRC Analytics Dashboard</div>', unsafe_allow_html=True)
 st.markdown(f'<div class="sub-header">Welcome, {st.session_state["staff_name"]}!</div>', unsafe_allow_html=True)
+if not viewing_live:
+    st.info(f"🧊 Viewing the frozen {selected_cycle} cycle (read-only). "
+            f"The approval queue and reminders below always work on the live {LIVE_CYCLE} cycle.")
 st.markdown("---")
 
 # ==================== OVERVIEW METRICS ====================
@@ -252,55 +319,22 @@ st.markdown("---")
 # ==================== VISUALIZATIONS ====================
 st.markdown("## 📊 Visual Analytics")
 
+# One row per reported BP, restricted to the BP/Tier filter criteria
+bp_codes_filter = [code for code, name in BP_NAMES.items() if name in filter_bps] if filter_bps else []
+selections_df = filter_selections(explode_bp_selections(filtered_df), bp_codes_filter, filter_tiers)
+
 viz_col1, viz_col2 = st.columns(2)
 
 with viz_col1:
     # BP Popularity Chart
     st.markdown("**Best Practice Popularity**")
     
-    # Count BPs from bp1 and bp2, but ONLY if they match the filter criteria
-    all_bp_codes = []
-    
-    # Convert BP filter names back to codes
-    bp_codes_filter = [code for code, name in BP_NAMES.items() if name in filter_bps] if filter_bps else []
-    
-    for _, row in filtered_df.iterrows():
-        # Check bp1
-        if pd.notna(row.get('bp1')):
-            include_bp1 = True
-            # If BP filter is active, check if bp1 matches
-            if bp_codes_filter:
-                include_bp1 = row['bp1'] in bp_codes_filter
-            # If Tier filter is active, check if bp1_tier matches
-            if filter_tiers and include_bp1:
-                include_bp1 = row.get('bp1_tier') in filter_tiers
-            
-            if include_bp1:
-                all_bp_codes.append(row['bp1'])
-        
-        # Check bp2
-        if pd.notna(row.get('bp2')):
-            include_bp2 = True
-            # If BP filter is active, check if bp2 matches
-            if bp_codes_filter:
-                include_bp2 = row['bp2'] in bp_codes_filter
-            # If Tier filter is active, check if bp2_tier matches
-            if filter_tiers and include_bp2:
-                include_bp2 = row.get('bp2_tier') in filter_tiers
-            
-            if include_bp2:
-                all_bp_codes.append(row['bp2'])
+    bp_counts = bp_popularity(selections_df, BP_NAMES)
     
-    if all_bp_codes:
-        from collections import Counter
-        bp_counts = Counter(all_bp_codes)
-        
-        # Map to full names
-        bp_labels = [BP_NAMES.get(code, code) for code in bp_counts.keys()]
-        
+    if not bp_counts.empty:
         fig_bp_pop = px.bar(
-            x=bp_labels,
-            y=list(bp_counts.values()),
+            x=bp_counts.index.tolist(),
+            y=bp_counts.values.tolist(),
             labels={'x': 'Best Practice', 'y': 'Number of Selections'},
             title="Which Best Practices Are Most Popular?"
         )
@@ -314,65 +348,16 @@ with viz_col2:
     # Tier Distribution
     st.markdown("**Tier Distribution Across All BPs**")
     
-    # Collect tiers, but ONLY for BPs that match the filter criteria
-    all_tiers = []
-    
-    # Convert BP filter names back to codes
-    bp_codes_filter = [code for code, name in BP_NAMES.items() if name in filter_bps] if filter_bps else []
-    
-    for _, row in filtered_df.iterrows():
-        # Check bp1
-        if pd.notna(row.get('bp1')) and pd.notna(row.get('bp1_tier')):
-            include_bp1 = True
-            # If BP filter is active, check if bp1 matches
-            if bp_codes_filter:
-                include_bp1 = row['bp1'] in bp_codes_filter
-            # If Tier filter is active, check if bp1_tier matches
-            if filter_tiers and include_bp1:
-                include_bp1 = row['bp1_tier'] in filter_tiers
-            
-            if include_bp1:
-                all_tiers.append(row['bp1_tier'])
-        
-        # Check bp2
-        if pd.notna(row.get('bp2')) and pd.notna(row.get('bp2_tier')):
-            include_bp2 = True
-            # If BP filter is active, check if bp2 matches
-            if bp_codes_filter:
-                include_bp2 = row['bp2'] in bp_codes_filter
-            # If Tier filter is active, check if bp2_tier matches
-            if filter_tiers and include_bp2:
-                include_bp2 = row['bp2_tier'] in filter_tiers
-            
-            if include_bp2:
-                all_tiers.append(row['bp2_tier'])
+    tier_counts = tier_distribution(selections_df)
     
-    if all_tiers:
-        from collections import Counter
-        tier_counts = Counter(all_tiers)
-        
-        # Sort by tier number
-        tier_counts = dict(sorted(tier_counts.items()))
-        
-        # Color map for tiers
-        colors = []
-        for tier in tier_counts.keys():
-            if tier == 1:
-                colors.append('#28a745')
-            elif tier == 2:
-                colors.append('#ffc107')
-            elif tier == 3:
-                colors.append('#dc3545')
-            else:
-                colors.append('#6c757d')
-        
-        tier_labels = [f"Tier {t}" for t in tier_counts.keys()]
+    if not tier_counts.empty:
+        tier_labels = [f"Tier {t}" for t in tier_counts.index]
         
         fig_tier_dist = px.pie(
-            values=list(tier_counts.values()),
+            values=tier_counts.values.tolist(),
             names=tier_labels,
             title="Overall Tier Selection Distribution",
-            color_discrete_sequence=colors
+            color_discrete_sequence=tier_colors(tier_counts.index)
         )
         st.plotly_chart(fig_tier_dist, use_container_width=True)
     else:
@@ -384,57 +369,9 @@ st.markdown("---")
 st.markdown("## 🗺️ Best Practice × Tier Matrix")
 st.markdown("See which tiers are selected for each best practice")
 
-# Build matrix data
-matrix_data = []
-
-# Convert BP filter names back to codes
-bp_codes_filter = [code for code, name in BP_NAMES.items() if name in filter_bps] if filter_bps else []
+pivot_df = bp_tier_matrix(selections_df, BP_NAMES)
 
-# Process bp1
-if 'bp1' in filtered_df.columns and 'bp1_tier' in filtered_df.columns:
-    for _, row in filtered_df.iterrows():
-        if pd.notna(row['bp1']) and pd.notna(row['bp1_tier']):
-            include_bp1 = True
-            # If BP filter is active, check if bp1 matches
-            if bp_codes_filter:
-                include_bp1 = row['bp1'] in bp_codes_filter
-            # If Tier filter is active, check if bp1_tier matches
-            if filter_tiers and include_bp1:
-                include_bp1 = row['bp1_tier'] in filter_tiers
-            
-            if include_bp1:
-                matrix_data.append({
-                    'BP': BP_NAMES.get(row['bp1'], row['bp1']),
-                    'Tier': f"Tier {row['bp1_tier']}",
-                    'Hospital': row['hospital_name']
-                })
-
-# Process bp2
-if 'bp2' in filtered_df.columns and 'bp2_tier' in filtered_df.columns:
-    for _, row in filtered_df.iterrows():
-        if pd.notna(row['bp2']) and pd.notna(row['bp2_tier']):
-            include_bp2 = True
-            # If BP filter is active, check if bp2 matches
-            if bp_codes_filter:
-                include_bp2 = row['bp2'] in bp_codes_filter
-            # If Tier filter is active, check if bp2_tier matches
-            if filter_tiers and include_bp2:
-                include_bp2 = row['bp2_tier'] in filter_tiers
-            
-            if include_bp2:
-                matrix_data.append({
-                    'BP': BP_NAMES.get(row['bp2'], row['bp2']),
-                    'Tier': f"Tier {row['bp2_tier']}",
-                    'Hospital': row['hospital_name']
-                })
-
-if matrix_data:
-    matrix_df = pd.DataFrame(matrix_data)
-    
-    # Count occurrences
-    heatmap_counts = matrix_df.groupby(['BP', 'Tier']).size().reset_index(name='Count')
-    pivot_df = heatmap_counts.pivot(index='BP', columns='Tier', values='Count').fillna(0)
-    
+if not pivot_df.empty:
     # Create heatmap
     fig_heatmap = go.Figure(data=go.Heatmap(
         z=pivot_df.values,
@@ -574,6 +511,399 @@ with insight_col2:
 
 st.markdown("---")
 
+# ==================== KPI ATTAINMENT ====================
+st.markdown("## 🎯 KPI Attainment")
+
+kpis = load_kpis(selected_cycle, data_version(df) if viewing_live else 'frozen')
+kpis = kpis[kpis['hospital_name'].isin(filtered_df['hospital_name'])]
+
+if kpis.empty:
+    st.info("No KPI targets or actuals reported for the selected hospitals yet.")
+else:
+    kpi_col1, kpi_col2, kpi_col3 = st.columns(3)
+    with kpi_col1:
+        st.metric("KPIs Reported", len(kpis))
+    with kpi_col2:
+        st.metric("With Target and Actual", int(kpis['attainment'].notna().sum()))
+    with kpi_col3:
+        median_attainment = kpis['attainment'].median()
+        st.metric("Median Attainment", "—" if pd.isna(median_attainment) else f"{median_attainment:.0f}%")
+    
+    st.caption("Numbers are read from the free-text answers. Attainment is actual ÷ target × 100 when both are "
+               "in the same unit (ratios count as percentages); for lower-is-better measures, under 100% beats the target.")
+    
+    kpi_confidence = st.multiselect(
+        "Confidence:", options=list(CONFIDENCE_LEVELS), default=['high', 'medium'], key="kpi_confidence"
+    )
+    shown_kpis = kpis[kpis['confidence'].isin(kpi_confidence)]
+    
+    comparable_kpis = shown_kpis.dropna(subset=['attainment'])
+    if not comparable_kpis.empty:
+        fig_attainment = px.strip(
+            comparable_kpis.assign(BP=comparable_kpis['bp'].map(lambda code: BP_NAMES.get(code, code)[:40])),
+            x='BP', y='attainment', color='confidence',
+            hover_data=['hospital_name', 'kpi', 'target_text', 'actual_text'],
+            labels={'attainment': 'Attainment (% of target)', 'confidence': 'Confidence'},
+            title="KPI Attainment by Best Practice"
+        )
+        fig_attainment.add_hline(y=100, line_dash='dash', line_color='#6c757d')
+        st.plotly_chart(fig_attainment, use_container_width=True)
+    
+    st.dataframe(attainment_by_bp(shown_kpis, BP_NAMES), hide_index=True, use_container_width=True)
+    
+    with st.expander(f"📋 All Parsed KPIs ({len(shown_kpis)})"):
+        st.dataframe(shown_kpis, hide_index=True, use_container_width=True)
+    st.download_button(
+        label="📥 Download KPI Table (CSV)",
+        data=shown_kpis.to_csv(index=False),
+        file_name=f"hscrc_kpis_{selected_cycle}_{datetime.now().strftime('%Y%m%d')}.csv",
+        mime="text/csv"
+    )
+
+st.markdown("---")
+
+# ==================== CROSS-CYCLE TRENDS ====================
+st.markdown("## 📈 Cross-Cycle Trends")
+
+if len(CYCLES) < 2:
+    st.info("Trends appear once a past reporting cycle has been frozen (see Data Source & Refresh below).")
+else:
+    # Frozen cycles never change, so only the live cycle's content goes into the cache key
+    live_version = data_version(live_df)
+    trends = load_cycle_trends(tuple((cycle, live_version if cycle == LIVE_CYCLE else 'frozen') for cycle in CYCLES))
+    tier_color_map = {f"Tier {tier}": color for tier, color in TIER_COLORS.items()}
+    overview_tab, trajectory_tab, distribution_tab, movers_tab = st.tabs(
+        ["📊 Overview", "🏥 Hospital Trajectories", "🗺️ Statewide Distribution", "↕️ Tier Changes"]
+    )
+    
+    with overview_tab:
+        st.markdown("**Participation and Average Tier by Cycle**")
+        st.dataframe(trends['overview'], use_container_width=True)
+        
+        bp_trend = trends['bp_tiers']
+        if not bp_trend.empty:
+            trend_long = bp_trend.reset_index().melt(id_vars='BP', var_name='Cycle', value_name='Average Tier').dropna()
+            fig_bp_trend = px.line(
+                trend_long, x='Cycle', y='Average Tier', color='BP', markers=True,
+                title="Average Tier per Best Practice",
+                category_orders={'Cycle': CYCLES}
+            )
+            fig_bp_trend.update_yaxes(dtick=1)
+            st.plotly_chart(fig_bp_trend, use_container_width=True)
+    
+    with trajectory_tab:
+        trajectories = trends['trajectories']
+        trend_hospitals = st.multiselect(
+            "Hospitals (all if empty):",
+            options=sorted(trajectories.index.get_level_values('hospital_name').unique()),
+            key="trend_hospitals"
+        )
+        if trend_hospitals:
+            trajectories = trajectories[trajectories.index.get_level_values('hospital_name').isin(trend_hospitals)]
+        
+        segments = trajectory_segments(trajectories)
+        if not segments:
+            st.info("No tiers reported for these hospitals")
+        else:
+            # One small panel per Best Practice; every hospital's line in a panel is a single trace
+            panel_cols = 3
+            panel_rows = -(-len(segments) // panel_cols)
+            fig_trajectories = make_subplots(
+                rows=panel_rows, cols=panel_cols, shared_yaxes=True,
+                subplot_titles=[BP_NAMES.get(bp, bp)[:40] for bp in segments],
+                vertical_spacing=0.3 / panel_rows
+            )
+            for index, (bp, (x, y, hospitals)) in enumerate(segments.items()):
+                row, col = index // panel_cols + 1, index % panel_cols + 1
+                fig_trajectories.add_trace(go.Scatter(
+                    x=x, y=y, hovertext=hospitals, mode='lines+markers', name=bp,
+                    line={'width': 1, 'color': '#1f4788'}, marker={'size': 4}, opacity=0.35,
+                    hovertemplate="%{hovertext}<br>%{x}: Tier %{y}<extra></extra>", showlegend=False
+                ), row=row, col=col)
+                block = trajectories.xs(bp, level='bp')
+                fig_trajectories.add_trace(go.Scatter(
+                    x=list(block.columns), y=block.mean().to_numpy(), mode='lines', name='Average',
+                    line={'width': 3, 'color': '#dc3545'}, showlegend=index == 0
+                ), row=row, col=col)
+            fig_trajectories.update_xaxes(type='category', categoryorder='array', categoryarray=CYCLES)
+            fig_trajectories.update_yaxes(range=[0.5, 3.5], dtick=1)
+            fig_trajectories.update_layout(height=260 * panel_rows, title="Tier by Cycle, per Best Practice")
+            st.plotly_chart(fig_trajectories, use_container_width=True)
+    
+    with distribution_tab:
+        distribution = trends['distribution'].assign(tier=lambda d: 'Tier ' + d['tier'].astype(str))
+        fig_distribution = px.bar(
+            distribution, x='cycle', y='share', color='tier', text='count',
+            labels={'cycle': 'Cycle', 'share': '% of Selections', 'tier': 'Tier'},
+            title="Statewide Tier Distribution by Cycle",
+            color_discrete_map=tier_color_map, category_orders={'cycle': CYCLES}
+        )
+        st.plotly_chart(fig_distribution, use_container_width=True)
+        
+        by_bp = trends['distribution_by_bp'].assign(tier=lambda d: 'Tier ' + d['tier'].astype(str))
+        if not by_bp.empty:
+            fig_distribution_bp = px.bar(
+                by_bp, x='cycle', y='share', color='tier', facet_col='bp', facet_col_wrap=3,
+                labels={'cycle': 'Cycle', 'share': '%', 'tier': 'Tier', 'bp': 'BP'},
+                title="Tier Distribution by Cycle, per Best Practice",
+                color_discrete_map=tier_color_map, category_orders={'cycle': CYCLES, 'bp': sorted(by_bp['bp'].unique())},
+                height=260 * -(-by_bp['bp'].nunique() // 3)
+            )
+            st.plotly_chart(fig_distribution_bp, use_container_width=True)
+    
+    with movers_tab:
+        summary = trends['summary']
+        movers = summary[(summary['Cycles Reported'] > 1) & (summary['Change'] != 0)].reset_index()
+        movers = movers.assign(
+            BP=movers['bp'].map(lambda code: BP_NAMES.get(code, code)),
+            _size=movers['Change'].abs()
+        ).sort_values(['_size', 'hospital_name'], ascending=[False, True])
+        st.markdown(f"**{len(movers)} hospital / Best Practice pairs changed tier between their first and latest cycle**")
+        if not movers.empty:
+            movers = movers.rename(columns={'hospital_name': 'Hospital'})[
+                ['Hospital', 'BP', 'First Cycle', 'First Tier', 'Latest Cycle', 'Latest Tier', 'Change', 'Cycles Reported']
+            ]
+            st.dataframe(movers, hide_index=True, use_container_width=True)
+            st.download_button(
+                label="📥 Download Tier Changes (CSV)",
+                data=movers.to_csv(index=False),
+                file_name=f"hscrc_tier_changes_{datetime.now().strftime('%Y%m%d')}.csv",
+                mime="text/csv"
+            )
+
+st.markdown("---")
+
+# ==================== APPROVAL QUEUE ====================
+st.markdown(f"## ✅ Approval Queue ({LIVE_CYCLE})")
+st.markdown("Draft submissions waiting for approval. Tick the ones to approve and approve them in one step.")
+
+approval_result = st.session_state.pop('approval_result', None)
+if approval_result:
+    st.success(f"✅ Approved {approval_result['approved']} submission(s) - "
+               f"{approval_result['emails']} approval email(s) queued for delivery")
+    if approval_result['skipped']:
+        st.warning(f"⚠️ No longer in the sheet, skipped: {', '.join(approval_result['skipped'])}")
+    if approval_result['history_failed']:
+        st.warning(f"⚠️ Approved, but not added to the version history: {', '.join(approval_result['history_failed'])}")
+
+queue_columns = ['hospital_name', 'timestamp', 'contact_name', 'email', 'secondary_contact_name',
+                 'secondary_email', 'bp1', 'bp1_tier', 'bp2', 'bp2_tier', 'approved']
+latest_submissions = live_df.reindex(columns=queue_columns).fillna('').drop_duplicates('hospital_name', keep='first')
+drafts = latest_submissions[~latest_submissions['approved'].map(is_approved)]
+
+if drafts.empty:
+    st.info("🎉 No draft submissions are waiting for approval")
+else:
+    queue_col1, queue_col2, queue_col3 = st.columns(3)
+    with queue_col1:
+        queue_search = st.text_input("Search hospital:", key="queue_search")
+    with queue_col2:
+        queue_bps = st.multiselect("Best Practice:", options=list(BP_NAMES.values()), key="queue_bps")
+    with queue_col3:
+        queue_sort = st.selectbox("Sort by:", ["Oldest first", "Newest first", "Hospital (A-Z)"], key="queue_sort")
+    
+    queue_df = drafts
+    if queue_search:
+        queue_df = queue_df[queue_df['hospital_name'].str.contains(queue_search, case=False, regex=False)]
+    if queue_bps:
+        queue_codes = [code for code, name in BP_NAMES.items() if name in queue_bps]
+        queue_df = queue_df[queue_df['bp1'].isin(queue_codes) | queue_df['bp2'].isin(queue_codes)]
+    if queue_sort == "Hospital (A-Z)":
+        queue_df = queue_df.sort_values('hospital_name')
+    else:
+        queue_df = queue_df.assign(_submitted=pd.to_datetime(queue_df['timestamp'], errors='coerce')).sort_values(
+            '_submitted', ascending=(queue_sort == "Oldest first"), na_position='last')
+    
+    queue_table = pd.DataFrame({
+        'Approve': False,
+        'Hospital': queue_df['hospital_name'],
+        'Submitted': queue_df['timestamp'].astype(str),
+        'Contact': queue_df['contact_name'].astype(str),
+        'Email': queue_df['email'].astype(str),
+        'BP #1': queue_df['bp1'].map(lambda code: BP_NAMES.get(code, code)),
+        'Tier #1': queue_df['bp1_tier'].astype(str),
+        'BP #2': queue_df['bp2'].map(lambda code: BP_NAMES.get(code, code)),
+        'Tier #2': queue_df['bp2_tier'].astype(str),
+    })
+    
+    st.caption(f"{len(queue_table)} of {len(drafts)} draft submission(s) shown")
+    
+    # A form, so ticking boxes doesn't rerun the whole dashboard
+    with st.form("approval_queue_form"):
+        edited_queue = st.data_editor(
+            queue_table,
+            hide_index=True,
+            use_container_width=True,
+            disabled=[column for column in queue_table.columns if column != 'Approve'],
+            column_config={"Approve": st.column_config.CheckboxColumn("Approve", default=False)},
+            key="approval_queue_editor"
+        )
+        approve_all = st.checkbox(f"Approve all {len(queue_table)} shown")
+        approve_clicked = st.form_submit_button("✅ Approve Selected", disabled=queue_table.empty)
+    
+    if approve_clicked:
+        selected = list(queue_table['Hospital'] if approve_all else edited_queue.loc[edited_queue['Approve'], 'Hospital'])
+        if not selected:
+            st.warning("⚠️ Select at least one submission to approve")
+        else:
+            approved_at_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            approval = {
+                'approved': 'True',  # Store as string for Google Sheets
+                'approved_by': st.session_state['staff_name'],
+                'approved_at': approved_at_time,
+            }
+            
+            # One batched Sheets write for every selected row
+            with st.spinner(f"Approving {len(selected)} submission(s)..."):
+                approved = update_submissions_fields({hospital: approval for hospital in selected})
+            
+            if approved:
+                # Approval emails are delivered in the background by the outbox worker
+                submissions = queue_df.set_index('hospital_name', drop=False)
+                full_rows = live_df.drop_duplicates('hospital_name', keep='first').set_index('hospital_name', drop=False)
+                emails = []
+                history_failed = []
+                for hospital in approved:
+                    emails.extend(notification_emails(
+                        'approval', submissions.loc[hospital].to_dict(), approved_at_time,
+                        approved_by=approval['approved_by'],
+                        approved_at=approved_at_time
+                    ))
+                    log_event(APPROVE, hospital, approval['approved_by'], action='approve', bulk=len(approved))
+                    saved_row = full_rows.loc[hospital].to_dict()
+                    try:
+                        record_version(hospital, {**saved_row, **approval}, action='approve',
+                                       saved_by=approval['approved_by'], previous=saved_row)
+                    except Exception:
+                        history_failed.append(hospital)
+                st.session_state['approval_result'] = {
+                    'approved': len(approved),
+                    'emails': len(enqueue_emails(emails)),
+                    'skipped': [hospital for hospital in selected if hospital not in approved],
+                    'history_failed': history_failed,
+                }
+                load_data.clear()
+                st.rerun()
+
+st.markdown("---")
+
+# ==================== REMINDER CAMPAIGN ====================
+st.markdown(f"## 📨 Reminder Campaign ({LIVE_CYCLE})")
+st.markdown("Email hospitals that have not submitted yet, or whose submission is still a draft.")
+
+# Contacts for hospitals without a submission come from secrets: [hospital_contacts] "Hospital" = "email"
+reminder_targets = find_pending_hospitals(live_df, HOSPITAL_NAMES, dict(SETTINGS.hospital_contacts))
+
+rem_col1, rem_col2, rem_col3 = st.columns(3)
+with rem_col1:
+    st.metric("Hospitals to Remind", reminder_targets['hospital_name'].nunique())
+with rem_col2:
+    st.metric("Recipients", int((reminder_targets['recipient'] != '').sum()))
+with rem_col3:
+    st.metric("No Email on File", int((reminder_targets['recipient'] == '').sum()))
+
+with st.expander("📋 View Reminder Recipients"):
+    st.dataframe(reminder_targets, hide_index=True, use_container_width=True)
+
+campaign_col1, campaign_col2 = st.columns(2)
+with campaign_col1:
+    campaign_id = st.text_input(
+        "Campaign name:",
+        value=f"reminder-{datetime.now().strftime('%Y-%m-%d')}",
+        help="Re-running a campaign with the same name skips recipients it already reached"
+    )
+with campaign_col2:
+    per_minute = st.number_input("Max emails per minute:", min_value=1, max_value=120, value=20)
+
+@st.fragment(run_every=3)
+def poll_campaign_progress(campaign_id):
+    """Re-read a running campaign's delivery log every few seconds without rerunning the page"""
+    if not campaign_running(campaign_id):
+        st.rerun()
+    statuses = get_campaign_log(campaign_id)['status']
+    queued = int((statuses == QUEUED).sum())
+    sending = queued + int(statuses.isin(['sent', 'failed']).sum())
+    done = sending - queued
+    st.progress(done / sending if sending else 0.0,
+                text=f"📨 Sending reminders in the background: {done} of {sending} done")
+
+if st.button("📨 Send Reminders", disabled=reminder_targets.empty or campaign_running(campaign_id)):
+    try:
+        # Sending is rate limited and can take minutes, so it runs off the page script
+        start_reminder_campaign(campaign_id, reminder_targets, per_minute=per_minute)
+    except Exception as e:
+        st.error(f"❌ Reminder campaign failed: {str(e)}")
+
+if campaign_running(campaign_id):
+    poll_campaign_progress(campaign_id)
+
+campaign_log = get_campaign_log(campaign_id)
+if not campaign_log.empty:
+    campaign_counts = campaign_log['status'].value_counts()
+    st.caption(f"Campaign {campaign_id}: sent {campaign_counts.get('sent', 0)} | "
+               f"failed {campaign_counts.get('failed', 0)} | no address {campaign_counts.get('no address', 0)} | "
+               f"waiting {campaign_counts.get(QUEUED, 0)}")
+    with st.expander(f"📬 Delivery Log: {campaign_id}"):
+        st.dataframe(campaign_log, hide_index=True, use_container_width=True)
+
+st.markdown("---")
+
+# ==================== STATEWIDE REPORT ====================
+st.markdown("## 📄 Statewide Summary Report")
+st.markdown("Printable PDF with the popularity chart, tier distribution, BP × Tier matrix and summary tables for all submissions.")
+
+def build_statewide_report(report_df=df, generated_by=st.session_state['staff_name']):
+    """PDF bytes for the download button; built only when the button is clicked"""
+    report_file = BytesIO()
+    write_statewide_report(report_df, report_file, BP_NAMES, generated_by=generated_by)
+    return report_file.getvalue()
+
+# Streamlit runs a callable `data` on its own thread at click time, so the page
+# script never waits for the PDF and no report is held between reruns
+st.download_button(
+    label="📥 Download Statewide Report (PDF)",
+    data=build_statewide_report,
+    file_name=f"hscrc_statewide_report_{datetime.now().strftime('%Y%m%d')}.pdf",
+    mime="application/pdf",
+    on_click="ignore"
+)
+
+st.markdown("---")
+
+# ==================== AUDIT LOG ====================
+st.markdown("## 🧾 Audit Log")
+st.markdown("Logins, edits, approvals and email sends, newest first.")
+
+audit_log = get_audit_log()
+audit_col1, audit_col2, audit_col3, audit_col4 = st.columns(4)
+with audit_col1:
+    audit_hospital = st.selectbox("Hospital:", ["All Hospitals"] + list(HOSPITAL_NAMES), key="audit_hospital")
+with audit_col2:
+    audit_actor = st.selectbox("Actor:", ["Anyone"] + audit_log.actors(), key="audit_actor")
+with audit_col3:
+    audit_types = st.multiselect("Event type:", list(EVENT_TYPES), key="audit_types")
+with audit_col4:
+    audit_limit = st.number_input("Show up to:", min_value=50, max_value=5000, value=500, step=50, key="audit_limit")
+
+audit_events = audit_log.query(
+    hospital_name=None if audit_hospital == "All Hospitals" else audit_hospital,
+    actor=None if audit_actor == "Anyone" else audit_actor,
+    event_types=audit_types,
+    limit=int(audit_limit)
+)
+if audit_events.empty:
+    st.info("No audit events match these filters.")
+else:
+    st.dataframe(audit_events, hide_index=True, use_container_width=True)
+    st.download_button(
+        label="📥 Download Audit Log (CSV)",
+        data=audit_events.to_csv(index=False),
+        file_name=f"hscrc_audit_log_{datetime.now().strftime('%Y%m%d')}.csv",
+        mime="text/csv"
+    )
+
+st.markdown("---")
+
 # ==================== DATA SOURCE INFO ====================
 st.markdown("## ⚙️ Data Source & Refresh")
 
@@ -588,6 +918,47 @@ with col_info2:
         st.success("✅ Data refreshed!")
         st.rerun()
 
+footprint = cell_counts(df)
+st.caption(f"Sheet cells for the {selected_cycle} cycle: {footprint['wide']:,} in the wide layout, "
+           f"{footprint['long']:,} in the long layout (storage.layout is '{SETTINGS.storage.layout}')")
+
+with st.expander("🔎 Compare One Answer Across Best Practices"):
+    answers_long = to_long(df)
+    if answers_long.empty:
+        st.info("No Best Practice answers in this cycle yet.")
+    else:
+        answer_field = st.selectbox("Question field:", sorted(answers_long['field'].unique()), key="answer_field")
+        field_answers = field_values(answers_long, answer_field)
+        st.dataframe(
+            field_answers.assign(bp=field_answers['bp'].map(lambda code: BP_NAMES.get(code, code))).rename(columns={
+                'hospital_name': 'Hospital', 'slot': 'Slot', 'bp': 'Best Practice', 'field': 'Field', 'value': 'Answer'
+            }),
+            hide_index=True, use_container_width=True
+        )
+
+with st.expander("🧊 Freeze a Past Reporting Cycle"):
+    st.markdown(f"""
+    Freezing copies a finished cycle's worksheet into a compressed, read-only snapshot.
+    Its data then loads from the snapshot, and the worksheet can be removed from the spreadsheet.
+    The live **{LIVE_CYCLE}** cycle can't be frozen; move `sheets.cycle` in secrets to the next cycle first.
+    """)
+    freezable = [cycle for cycle in list_cycle_worksheets() if cycle != LIVE_CYCLE and cycle not in CYCLES]
+    if not freezable:
+        st.info("No unfrozen past cycle worksheets.")
+    else:
+        freeze_choice = st.selectbox("Cycle worksheet:", freezable, key="freeze_cycle")
+        if st.button(f"🧊 Freeze {freeze_choice}"):
+            try:
+                snapshot_path(freeze_choice)   # Rejects a bad name before its worksheet is opened
+                with st.spinner(f"Freezing {freeze_choice}..."):
+                    frozen_rows = load_data_from_sheets(freeze_choice)
+                    freeze_cycle(freeze_choice, frozen_rows)
+                log_event(CYCLE_FROZEN, actor=st.session_state['staff_name'], cycle=freeze_choice, rows=len(frozen_rows))
+                st.success(f"✅ Froze {freeze_choice} ({len(frozen_rows)} rows)")
+                st.rerun()
+            except ArchiveError as e:
+                st.error(f"❌ {e}")
+
 st.markdown("---")
 
 # Footer
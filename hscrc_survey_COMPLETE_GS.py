@@ -4,6 +4,7 @@ from datetime import datetime
 
 # Import Google Sheets connector
 from google_sheets_connector import append_row_to_sheets
+from survey_registry import require_registry
 
 # ==================== PAGE CONFIG ====================
 st.set_page_config(
@@ -72,15 +73,9 @@ HOSPITALS = [
     "UMMC Downtown", "UMMC-Midtown", "UPMC Western Maryland", "Other"
 ]
 
-BP_OPTIONS = {
-    "": "-- Select Best Practice --",
-    "BP1": "BP1: Interdisciplinary Rounds & Early Discharge Planning",
-    "BP2": "BP2: Bed Capacity Alert System",
-    "BP3": "BP3: Standardized Daily Shift Huddles",
-    "BP4": "BP4: Expedited Care Intervention",
-    "BP5": "BP5: Patient Flow Throughput Performance Council",
-    "BP6": "BP6: Clinical Pathways & Observation Management"
-}
+# Hospitals and Best Practices are shared across apps (survey_registry.json)
+REGISTRY = require_registry()
+BP_OPTIONS = REGISTRY.bp_options
 
 TIER_DESCRIPTIONS = {
     "BP1": {
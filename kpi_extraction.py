@@ -0,0 +1,184 @@
+"""
+KPI Extraction for HSCRC Survey Submissions
+KPI targets and actuals (bp1_kpi1_target, bp2_t1_actual, ...) are free text. This
+pulls the percentage, ratio or count out of every one of them with compiled regexes
+applied to whole Series (no per-answer Python loop) and flags how sure each read is.
+"""
+
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from long_format import to_long
+from survey_schema import QUESTION_SCHEMA, answer_keys
+
+KPI_COLUMNS = ['hospital_name', 'bp', 'slot', 'kpi', 'label', 'target_text', 'actual_text',
+               'target', 'actual', 'unit', 'attainment', 'confidence']
+
+# Confidence flags, most to least certain
+HIGH = 'high'           # The answer is just the quantity ("70%", "3/4", "12")
+MEDIUM = 'medium'       # One quantity inside prose ("about 70% of admissions")
+LOW = 'low'             # Several numbers; the first percentage / ratio / number was taken
+NONE = 'none'           # No number found
+CONFIDENCE_LEVELS = (HIGH, MEDIUM, LOW, NONE)
+
+# Units: ratios are converted to percentages so they compare with percentage answers
+PERCENT = 'percent'
+COUNT = 'count'
+
+# Fields next to a KPI's <kpi>_actual: its target (BP1, BP2, BP6) or, where a BP asks for no
+# target, the KPI's name or formula (BP3-BP5). Labels are shown as text and never parsed, since
+# the numbers in "30-day readmission rate" or "readmits / discharges x 100" are not goals.
+_TARGET_SUFFIX = 'target'
+_LABEL_SUFFIXES = ('kpi', 'formula')
+
+_NUMBER_TEXT = r'\d+(?:,\d{3})*(?:\.\d+)?'
+_PERCENT = re.compile(rf'(-?{_NUMBER_TEXT})\s*(?:%|percent\b|pct\b)', re.IGNORECASE)
+# 3/4, 45 out of 60, 9 of 10 - but not dates like 12/31/2025
+_RATIO = re.compile(rf'(?<![\d/.])({_NUMBER_TEXT})\s*(?:/|out of|of)\s*({_NUMBER_TEXT})(?![\d/])', re.IGNORECASE)
+_NUMBER = re.compile(rf'(?<![\w.])(-?{_NUMBER_TEXT})')
+_EXACT = re.compile(
+    rf'[<>=~≤≥]*\s*(?:-?{_NUMBER_TEXT}\s*(?:%|percent|pct)?|{_NUMBER_TEXT}\s*(?:/|out of|of)\s*{_NUMBER_TEXT})',
+    re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=None)
+def _kpi_fields():
+    """(bp, field, kpi, measure) for every KPI actual, target and label field in QUESTION_SCHEMA."""
+    fields = []
+    for bp in QUESTION_SCHEMA:
+        keys = answer_keys(bp)
+        for key in keys:
+            kpi, _, measure = key.rpartition('_')
+            if measure != 'actual':
+                continue
+            fields.append((bp, key, kpi, 'actual'))
+            if f"{kpi}_{_TARGET_SUFFIX}" in keys:
+                fields.append((bp, f"{kpi}_{_TARGET_SUFFIX}", kpi, 'target'))
+            label = next((f"{kpi}_{suffix}" for suffix in _LABEL_SUFFIXES if f"{kpi}_{suffix}" in keys), None)
+            if label:
+                fields.append((bp, label, kpi, 'label'))
+    return tuple(fields)
+
+
+def _to_float(text):
+    """Numbers as a float array (NaN where there is none); thousands separators removed."""
+    return pd.to_numeric(text.str.replace(',', '', regex=False), errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+
+
+def parse_quantities(values):
+    """
+    Read one quantity out of every free-text answer.
+    A percentage wins over a ratio, and a ratio over a plain number.
+
+    Args:
+        values: Series of answers (text or numbers; blanks allowed)
+
+    Returns:
+        DataFrame indexed like values with value (float), unit (PERCENT / COUNT / ''),
+        kind ('percent' / 'ratio' / 'count' / '') and confidence (see CONFIDENCE_LEVELS)
+    """
+    text = values.astype('string').str.strip()
+    percent = _to_float(text.str.extract(_PERCENT)[0])
+    ratio = text.str.extract(_RATIO)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio_value = _to_float(ratio[0]) / _to_float(ratio[1]) * 100
+    ratio_value[~np.isfinite(ratio_value)] = np.nan
+    number = _to_float(text.str.extract(_NUMBER)[0])
+
+    has_percent, has_ratio, has_number = ~np.isnan(percent), ~np.isnan(ratio_value), ~np.isnan(number)
+    kind = np.select([has_percent, has_ratio, has_number], ['percent', 'ratio', 'count'], default='')
+    value = np.select([has_percent, has_ratio, has_number], [percent, ratio_value, number], default=np.nan)
+
+    # A ratio is two numbers; any number beyond the quantity itself makes the read ambiguous
+    numbers_found = text.str.count(_NUMBER).fillna(0).to_numpy(dtype=int)
+    exact = text.str.fullmatch(_EXACT).fillna(False).to_numpy(dtype=bool)
+    confidence = np.select(
+        [kind == '', exact, numbers_found <= np.where(kind == 'ratio', 2, 1)],
+        [NONE, HIGH, MEDIUM],
+        default=LOW
+    )
+
+    return pd.DataFrame({
+        'value': value,
+        'unit': np.select([kind == 'count', kind != ''], [COUNT, PERCENT], default=''),
+        'kind': kind,
+        'confidence': confidence,
+    }, index=values.index)
+
+
+def kpi_table(df):
+    """
+    One typed row per reported KPI: the target and actual as numbers and how much
+    of the target was attained. Fields come from QUESTION_SCHEMA: BPs without a target
+    question (BP3-BP5) get actual-only rows labelled with the KPI's name or formula
+    (t1_kpi, t2_formula, ...). Attainment is actual / target x 100 and is only set
+    when both sides parse to the same unit; for measures where lower is better
+    (e.g. length of stay) a value under 100 means the target was beaten.
+
+    Args:
+        df: Wide submissions table (a hospital's first row is used)
+
+    Returns:
+        DataFrame with KPI_COLUMNS; confidence is the lower of the target's and the actual's
+    """
+    fields = pd.DataFrame(list(_kpi_fields()), columns=['bp', 'field', 'kpi', 'measure'])
+    answers = to_long(df).merge(fields, on=['bp', 'field'])
+    if answers.empty:
+        return pd.DataFrame(columns=KPI_COLUMNS)
+
+    kpis = answers.pivot(index=['hospital_name', 'bp', 'slot', 'kpi'], columns='measure', values='value')
+    # A name or formula with neither a target nor an actual is not a reported KPI
+    kpis = kpis.reindex(columns=['label', 'target', 'actual']).dropna(subset=['target', 'actual'], how='all')
+    if kpis.empty:
+        return pd.DataFrame(columns=KPI_COLUMNS)
+    kpis = kpis.reset_index()
+    kpis.columns.name = None
+    kpis = kpis.rename(columns={'target': 'target_text', 'actual': 'actual_text'})
+
+    target = parse_quantities(kpis['target_text'])
+    actual = parse_quantities(kpis['actual_text'])
+    comparable = (target['unit'] != '') & (target['unit'] == actual['unit']) & (target['value'] != 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        attainment = np.where(comparable, actual['value'] / target['value'] * 100, np.nan)
+
+    # Rank flags so the less certain side of each KPI decides its confidence
+    rank = {level: position for position, level in enumerate(CONFIDENCE_LEVELS)}
+    reported = kpis[['target_text', 'actual_text']].notna().to_numpy()
+    ranks = np.where(reported, np.column_stack([target['confidence'].map(rank), actual['confidence'].map(rank)]), -1)
+
+    kpis = kpis.assign(
+        target=target['value'],
+        actual=actual['value'],
+        unit=actual['unit'].where(actual['unit'] != '', target['unit']),
+        attainment=np.round(attainment, 1),
+        confidence=np.asarray(CONFIDENCE_LEVELS, dtype=object)[ranks.max(axis=1)],
+    )
+    return kpis[KPI_COLUMNS].fillna({'label': '', 'target_text': '', 'actual_text': ''})
+
+
+def attainment_by_bp(kpis, bp_names=None):
+    """
+    Per Best Practice: KPIs reported, how many have an attainment, the median
+    attainment and the share of KPIs at or above target.
+
+    Returns:
+        DataFrame with BP, KPIs, Comparable, Median Attainment (%), Met Target (%)
+    """
+    columns = ['BP', 'KPIs', 'Comparable', 'Median Attainment (%)', 'Met Target (%)']
+    if kpis.empty:
+        return pd.DataFrame(columns=columns)
+
+    summary = kpis.assign(met=kpis['attainment'] >= 100).groupby('bp').agg(
+        KPIs=('kpi', 'size'),
+        Comparable=('attainment', 'count'),
+        median=('attainment', 'median'),
+        met=('met', 'sum'),
+    ).reset_index()
+    summary['Median Attainment (%)'] = summary['median'].round(1)
+    summary['Met Target (%)'] = (summary['met'] / summary['Comparable'].where(summary['Comparable'] > 0) * 100).round(1)
+    summary['BP'] = summary['bp'].map(lambda code: (bp_names or {}).get(code, code))
+    return summary[columns]
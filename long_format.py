@@ -0,0 +1,113 @@
+"""
+Long-Format (EAV) Layout for HSCRC Survey Submissions
+The wide layout has a bp1_/bp2_ column for every question of every Best Practice,
+mostly empty. In the long layout each answered BP question is one row
+(hospital_name, slot, bp, field, value), and core columns stay in the wide sheet.
+Within a cycle's worksheets the hospital name identifies the submission.
+"""
+
+import pandas as pd
+
+from survey_schema import CORE_COLUMNS, BP_SLOTS
+
+LONG_COLUMNS = ['hospital_name', 'slot', 'bp', 'field', 'value']
+
+
+def answer_column(column):
+    """(slot, field) for a BP answer column such as 'bp2_t1_formula', else None."""
+    if column in CORE_COLUMNS:
+        return None
+    for slot in BP_SLOTS:
+        if column.startswith(f"{slot}_"):
+            return slot, column[len(slot) + 1:]
+    return None
+
+
+def split_submission(data):
+    """
+    Split one submission into its core fields and its BP answers.
+
+    Returns:
+        tuple: (core dict, answers dict of (slot, field) -> value); blank answers are kept
+        so callers can tell a cleared answer from one that wasn't sent
+    """
+    core, answers = {}, {}
+    for column, value in data.items():
+        key = answer_column(column)
+        if key is None:
+            core[column] = value
+        else:
+            answers[key] = value
+    return core, answers
+
+
+def to_long(df):
+    """
+    Melt the wide table's BP answer columns into long rows, dropping blank answers.
+
+    Returns:
+        DataFrame with LONG_COLUMNS (value as text)
+    """
+    answer_columns = [column for column in df.columns if answer_column(column)]
+    if df.empty or not answer_columns:
+        return pd.DataFrame(columns=LONG_COLUMNS)
+
+    latest = df.drop_duplicates('hospital_name', keep='first')
+    long_df = latest.melt(id_vars='hospital_name', value_vars=answer_columns, var_name='column', value_name='value')
+    text = long_df['value'].astype(str).str.strip()
+    long_df = long_df[long_df['value'].notna() & ~text.isin(['', 'None', 'nan'])]
+
+    parts = long_df['column'].str.split('_', n=1, expand=True)
+    long_df = long_df.assign(slot=parts[0], field=parts[1], value=long_df['value'].astype(str))
+
+    # Each answer is tagged with the BP chosen in its slot, so a field can be queried per BP
+    slot_bps = latest.reindex(columns=['hospital_name', *BP_SLOTS]).melt(
+        id_vars='hospital_name', var_name='slot', value_name='bp'
+    )
+    long_df = long_df.merge(slot_bps, on=['hospital_name', 'slot'], how='left')
+    long_df['bp'] = long_df['bp'].fillna('').astype(str).str.strip().replace({'None': '', 'nan': ''})
+    return long_df[LONG_COLUMNS].reset_index(drop=True)
+
+
+def to_wide(core_df, long_df):
+    """
+    Rebuild the wide table: core rows plus one bp{n}_{field} column per answered field.
+    Values are used as given (get_all_records has already numericised them).
+
+    Returns:
+        DataFrame with core_df's rows and columns, then the answer columns
+    """
+    if long_df.empty:
+        return core_df.copy()
+
+    long_df = long_df.drop_duplicates(['hospital_name', 'slot', 'field'], keep='last')
+    answers = long_df.assign(column=long_df['slot'] + '_' + long_df['field']).pivot(
+        index='hospital_name', columns='column', values='value'
+    )
+    answers.columns.name = None
+    answers = answers.drop(columns=[column for column in answers.columns if column in core_df.columns])
+
+    wide = core_df.merge(answers, how='left', left_on='hospital_name', right_index=True)
+    wide[list(answers.columns)] = wide[list(answers.columns)].astype(object).where(
+        wide[list(answers.columns)].notna(), '')
+    return wide
+
+
+def field_values(long_df, field):
+    """Every hospital's answer to one field, across slots and Best Practices."""
+    return long_df[long_df['field'] == field].reset_index(drop=True)
+
+
+def cell_counts(df):
+    """
+    Sheet cells used by a table in each layout (header rows included).
+
+    Returns:
+        dict with 'wide' and 'long' cell counts
+    """
+    core_columns = [column for column in df.columns if not answer_column(column)]
+    long_rows = len(to_long(df))
+    return {
+        'wide': (len(df) + 1) * len(df.columns),
+        'long': (len(df) + 1) * len(core_columns) + (long_rows + 1) * len(LONG_COLUMNS),
+    }
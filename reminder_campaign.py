@@ -0,0 +1,278 @@
+"""
+Reminder Campaigns for HSCRC Survey System
+Emails hospitals that have not submitted (no row, or only a draft).
+Campaigns run on a background thread; progress is read back from the delivery log.
+"""
+
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from settings import data_path
+from survey_schema import is_approved
+
+# Local SQLite file inside storage.data_dir (survives app restarts)
+REMINDER_DB_FILE = "reminders.db"
+
+DEFAULT_PER_MINUTE = 20     # Gmail-friendly default sending rate
+DEFAULT_WORKERS = 2         # Matches the SMTP pool size in email_sender
+
+STATUS_MISSING = 'No submission'
+STATUS_DRAFT = 'Draft (not approved)'
+
+# Delivery log status of a recipient waiting for its turn in a running campaign
+QUEUED = 'queued'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reminder_log (
+    campaign_id TEXT NOT NULL,
+    hospital_name TEXT NOT NULL,
+    recipient TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (campaign_id, hospital_name, recipient)
+);
+"""
+
+
+def _connect(db_path=None):
+    db_path = db_path or data_path(REMINDER_DB_FILE)
+    conn = sqlite3.connect(db_path, timeout=10, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+# ==================== TARGETING ====================
+def find_pending_hospitals(df, hospital_names, contacts=None):
+    """
+    Anti-join the hospital roster against the loaded submissions.
+
+    Args:
+        df: Submissions DataFrame (one row per hospital)
+        hospital_names: Every hospital expected to submit
+        contacts: Optional hospital -> email mapping for hospitals without a row
+
+    Returns:
+        DataFrame with hospital_name, status, recipient, contact_name;
+        recipient is empty when no address is known
+    """
+    roster = pd.DataFrame({'hospital_name': list(hospital_names)})
+
+    columns = ['hospital_name', 'email', 'contact_name', 'secondary_email', 'secondary_contact_name', 'approved']
+    latest = df.reindex(columns=columns).drop_duplicates('hospital_name', keep='first')
+    merged = roster.merge(latest, on='hospital_name', how='left', indicator=True)
+
+    missing = merged['_merge'] == 'left_only'
+    draft = ~missing & ~merged['approved'].map(is_approved).astype(bool)
+    pending = merged[missing | draft].copy()
+    pending['status'] = missing[missing | draft].map({True: STATUS_MISSING, False: STATUS_DRAFT})
+
+    if contacts:
+        fallback = pending['hospital_name'].map(contacts)
+        pending['email'] = pending['email'].where(pending['email'].fillna('').astype(str).str.strip() != '', fallback)
+
+    pending['contact_name'] = pending['contact_name'].fillna('').astype(str).str.strip()
+    pending.loc[pending['contact_name'] == '', 'contact_name'] = 'Survey Contact'
+
+    # One target row per recipient (primary plus secondary contact where given)
+    primary = pending[['hospital_name', 'status', 'email', 'contact_name']].rename(columns={'email': 'recipient'})
+    secondary = pending[['hospital_name', 'status', 'secondary_email', 'secondary_contact_name']].rename(
+        columns={'secondary_email': 'recipient', 'secondary_contact_name': 'contact_name'}
+    )
+    secondary = secondary[secondary['recipient'].fillna('').astype(str).str.strip() != '']
+    secondary['contact_name'] = secondary['contact_name'].fillna('').replace('', 'Secondary Contact')
+
+    targets = pd.concat([primary, secondary], ignore_index=True)
+    targets['recipient'] = targets['recipient'].fillna('').astype(str).str.strip()
+    return targets.sort_values(['hospital_name', 'recipient'], ignore_index=True)
+
+
+# ==================== RATE LIMITING ====================
+class RateLimiter:
+    """Thread-safe token bucket allowing `per_minute` sends per minute."""
+
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+# ==================== CAMPAIGN ====================
+def get_campaign_log(campaign_id, db_path=None):
+    """Per-recipient delivery log for a campaign."""
+    conn = _connect(db_path)
+    try:
+        return pd.read_sql_query(
+            "SELECT hospital_name, recipient, status, attempts, error, updated_at "
+            "FROM reminder_log WHERE campaign_id = ? ORDER BY hospital_name, recipient",
+            conn, params=(campaign_id,)
+        )
+    finally:
+        conn.close()
+
+
+def run_reminder_campaign(campaign_id, targets, per_minute=DEFAULT_PER_MINUTE,
+                          workers=DEFAULT_WORKERS, progress_callback=None, db_path=None):
+    """
+    Send personalized reminders, skipping recipients already reached.
+    Re-running the same campaign_id resumes where it stopped.
+
+    Args:
+        campaign_id: Name of the campaign (key for the delivery log)
+        targets: DataFrame from find_pending_hospitals
+        per_minute: Maximum messages per minute (SMTP provider limit)
+        workers: Number of concurrent senders
+        progress_callback: Optional callable(done, total)
+
+    Returns:
+        dict: counts of 'sent', 'failed', 'skipped' (already sent or no address)
+    """
+    from email_sender import deliver_email, email_config_problem
+    from settings import get_settings
+    from audit_log import log_event, EMAIL_SENT, EMAIL_FAILED
+
+    problem = email_config_problem()
+    if problem:
+        raise RuntimeError(problem)
+    config = get_settings().email.as_config()
+
+    conn = _connect(db_path)
+    lock = threading.Lock()
+    already_sent = {
+        (row[0], row[1]) for row in conn.execute(
+            "SELECT hospital_name, recipient FROM reminder_log WHERE campaign_id = ? AND status = 'sent'",
+            (campaign_id,)
+        )
+    }
+
+    def log(hospital_name, recipient, status, error=None):
+        with lock:
+            conn.execute(
+                "INSERT INTO reminder_log (campaign_id, hospital_name, recipient, status, attempts, error, updated_at) "
+                "VALUES (?, ?, ?, ?, 1, ?, datetime('now')) "
+                "ON CONFLICT (campaign_id, hospital_name, recipient) DO UPDATE SET "
+                "status = excluded.status, attempts = attempts + 1, error = excluded.error, updated_at = excluded.updated_at",
+                (campaign_id, hospital_name, recipient, status, error)
+            )
+
+    counts = {'sent': 0, 'failed': 0, 'skipped': 0}
+    todo = []
+    for target in targets.itertuples(index=False):
+        if not target.recipient:
+            log(target.hospital_name, '', 'no address')
+            counts['skipped'] += 1
+        elif (target.hospital_name, target.recipient) in already_sent:
+            counts['skipped'] += 1
+        else:
+            todo.append(target)
+
+    # Every recipient still to reach is in the log up front, so progress can be polled from it
+    with lock:
+        conn.executemany(
+            "INSERT INTO reminder_log (campaign_id, hospital_name, recipient, status, attempts, error, updated_at) "
+            "VALUES (?, ?, ?, ?, 0, NULL, datetime('now')) "
+            "ON CONFLICT (campaign_id, hospital_name, recipient) DO UPDATE SET "
+            "status = excluded.status, error = NULL, updated_at = excluded.updated_at",
+            [(campaign_id, target.hospital_name, target.recipient, QUEUED) for target in todo]
+        )
+
+    limiter = RateLimiter(per_minute)
+    total = len(todo)
+    done = 0
+
+    def send(target):
+        limiter.acquire()
+        try:
+            deliver_email('reminder', config,
+                          recipient_email=target.recipient,
+                          hospital_name=target.hospital_name,
+                          contact_name=target.contact_name,
+                          status=target.status)
+        except Exception as e:
+            log(target.hospital_name, target.recipient, 'failed', str(e)[:500])
+            log_event(EMAIL_FAILED, target.hospital_name, campaign_id, kind='reminder',
+                      recipient=target.recipient, error=str(e)[:200])
+            return 'failed'
+        log(target.hospital_name, target.recipient, 'sent')
+        log_event(EMAIL_SENT, target.hospital_name, campaign_id, kind='reminder', recipient=target.recipient)
+        return 'sent'
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reminder") as pool:
+            for result in pool.map(send, todo):
+                counts[result] += 1
+                done += 1
+                if progress_callback:
+                    progress_callback(done, total)
+    finally:
+        conn.close()
+
+    return counts
+
+
+# ==================== BACKGROUND CAMPAIGNS ====================
+_running = {}               # campaign_id -> Thread, for campaigns started in this process
+_running_lock = threading.Lock()
+
+
+def campaign_running(campaign_id):
+    """True while a campaign started with start_reminder_campaign is still sending."""
+    with _running_lock:
+        thread = _running.get(campaign_id)
+        return thread is not None and thread.is_alive()
+
+
+def start_reminder_campaign(campaign_id, targets, per_minute=DEFAULT_PER_MINUTE,
+                            workers=DEFAULT_WORKERS, db_path=None):
+    """
+    Run a reminder campaign on a background thread and return at once.
+    Follow its progress with get_campaign_log (recipients waiting to be sent are QUEUED).
+
+    Returns:
+        bool: False if that campaign is already running in this process
+    """
+    from email_sender import email_config_problem
+
+    # Checked here so a missing configuration is reported to the caller, not lost in the thread
+    problem = email_config_problem()
+    if problem:
+        raise RuntimeError(problem)
+
+    def run():
+        try:
+            run_reminder_campaign(campaign_id, targets, per_minute=per_minute, workers=workers, db_path=db_path)
+        except Exception as e:
+            # Release the recipients it didn't get to; re-running the campaign picks them up
+            conn = _connect(db_path)
+            try:
+                conn.execute(
+                    "UPDATE reminder_log SET status = 'failed', error = ?, updated_at = datetime('now') "
+                    "WHERE campaign_id = ? AND status = ?",
+                    (str(e)[:500], campaign_id, QUEUED)
+                )
+            finally:
+                conn.close()
+
+    with _running_lock:
+        thread = _running.get(campaign_id)
+        if thread is not None and thread.is_alive():
+            return False
+        thread = threading.Thread(target=run, name=f"reminders-{campaign_id}", daemon=True)
+        _running[campaign_id] = thread
+        thread.start()
+    return True
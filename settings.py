@@ -0,0 +1,249 @@
+"""
+Application Settings for HSCRC Survey System
+Parses and validates secrets once, caches them, and reloads when secrets.toml changes
+"""
+
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from types import MappingProxyType
+
+import streamlit as st
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DATA_DIR = os.path.join(APP_DIR, ".data")
+
+# Files Streamlit reads secrets from; a change to any of them triggers a reload
+SECRETS_FILES = (
+    os.path.join(os.getcwd(), ".streamlit", "secrets.toml"),
+    os.path.join(os.path.expanduser("~"), ".streamlit", "secrets.toml"),
+)
+RELOAD_CHECK_INTERVAL = 2   # Seconds between secrets file mtime checks
+
+# Reporting cycle names become worksheet titles and file names
+CYCLE_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+
+
+class SettingsError(Exception):
+    """Raised when secrets are missing or invalid."""
+
+
+@dataclass(frozen=True)
+class EmailSettings:
+    smtp_server: str
+    smtp_port: int
+    sender_email: str
+    sender_password: str = field(repr=False)
+    sender_name: str
+    use_tls: bool
+    pool_size: int
+
+    def as_config(self):
+        """Dict in the shape email_sender has always used."""
+        return {
+            'smtp_server': self.smtp_server,
+            'smtp_port': self.smtp_port,
+            'sender_email': self.sender_email,
+            'sender_password': self.sender_password,
+            'sender_name': self.sender_name,
+            'use_tls': self.use_tls,
+            'pool_size': self.pool_size,
+        }
+
+
+@dataclass(frozen=True)
+class SheetsSettings:
+    spreadsheet_name: str
+    cycle: str                  # Active reporting cycle's worksheet ('' = the first worksheet)
+    service_account: MappingProxyType = field(repr=False)
+
+
+@dataclass(frozen=True)
+class StorageSettings:
+    backend: str
+    data_dir: str
+    layout: str                 # 'wide' (one column per BP question) or 'long' (answers worksheet)
+
+
+@dataclass(frozen=True)
+class CacheSettings:
+    data_ttl: int
+
+
+@dataclass(frozen=True)
+class Settings:
+    email: EmailSettings | None     # None when the [email] section is missing or invalid
+    sheets: SheetsSettings
+    storage: StorageSettings
+    cache: CacheSettings
+    hospital_contacts: MappingProxyType
+    email_problems: tuple = ()      # Why email is None; reported when an email is sent or queued
+
+
+# ==================== PARSING ====================
+def _section(secrets, name):
+    try:
+        value = secrets.get(name, {})
+    except Exception:
+        value = {}
+    return dict(value) if value else {}
+
+
+def _as_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('true', '1', 'yes')
+
+
+def parse_settings(secrets):
+    """
+    Build Settings from a secrets mapping, collecting every problem.
+    Email is optional: problems in [email] only disable it (see Settings.email_problems).
+
+    Raises:
+        SettingsError: listing all missing or invalid values at once
+    """
+    problems = []
+
+    def require(section, key, label, found=problems):
+        value = section.get(key)
+        if value in (None, ''):
+            found.append(f"{label} is missing")
+        return value
+
+    def integer(section, key, default, label, found=problems):
+        try:
+            return int(section.get(key, default))
+        except (TypeError, ValueError):
+            found.append(f"{label} must be a whole number")
+            return default
+
+    email = _section(secrets, "email")
+    email_problems = []
+    email_settings = EmailSettings(
+        smtp_server=str(email.get("smtp_server", "smtp.gmail.com")),
+        smtp_port=integer(email, "smtp_port", 587, "email.smtp_port", email_problems),
+        sender_email=require(email, "sender_email", "email.sender_email", email_problems),
+        sender_password=require(email, "sender_password", "email.sender_password", email_problems),
+        sender_name=str(email.get("sender_name", "HSCRC Survey System")),
+        use_tls=_as_bool(email.get("use_tls", True)),
+        pool_size=integer(email, "pool_size", 2, "email.pool_size", email_problems),
+    )
+
+    service_account = _section(secrets, "gcp_service_account")
+    for key in ("client_email", "private_key", "token_uri"):
+        require(service_account, key, f"gcp_service_account.{key}")
+    sheets = _section(secrets, "sheets")
+    cycle = str(sheets.get("cycle", "")).strip()
+    if cycle and not CYCLE_NAME.match(cycle):
+        problems.append("sheets.cycle may only contain letters, digits, '.', '_' and '-'")
+    sheets_settings = SheetsSettings(
+        spreadsheet_name=str(sheets.get("spreadsheet_name", "HSCRC Survey Submissions")),
+        cycle=cycle,
+        service_account=MappingProxyType(service_account),
+    )
+
+    storage = _section(secrets, "storage")
+    backend = str(storage.get("backend", "sheets"))
+    if backend != "sheets":
+        problems.append(f"storage.backend '{backend}' is not supported (expected 'sheets')")
+    data_dir = str(storage.get("data_dir", DEFAULT_DATA_DIR))
+    layout = str(storage.get("layout", "wide"))
+    if layout not in ("wide", "long"):
+        problems.append(f"storage.layout '{layout}' is not supported (expected 'wide' or 'long')")
+    storage_settings = StorageSettings(
+        backend=backend,
+        data_dir=data_dir if os.path.isabs(data_dir) else os.path.join(APP_DIR, data_dir),
+        layout=layout,
+    )
+
+    cache = _section(secrets, "cache")
+    cache_settings = CacheSettings(
+        data_ttl=integer(cache, "data_ttl", 60, "cache.data_ttl"),
+    )
+
+    if problems:
+        raise SettingsError(
+            "Invalid configuration in .streamlit/secrets.toml:\n- " + "\n- ".join(problems)
+        )
+
+    return Settings(
+        email=None if email_problems else email_settings,
+        sheets=sheets_settings,
+        storage=storage_settings,
+        cache=cache_settings,
+        hospital_contacts=MappingProxyType(_section(secrets, "hospital_contacts")),
+        email_problems=tuple(email_problems),
+    )
+
+
+# ==================== CACHED ACCESS ====================
+_lock = threading.Lock()
+_settings = None
+_stamp = None
+_last_check = 0.0
+
+
+def _secrets_stamp():
+    stamp = []
+    for path in SECRETS_FILES:
+        try:
+            stamp.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+def get_settings():
+    """
+    Return the process-wide Settings, parsed once and re-parsed only
+    when a secrets file changes on disk.
+
+    Raises:
+        SettingsError: if the secrets are missing or invalid on first load
+    """
+    global _settings, _stamp, _last_check
+
+    settings = _settings
+    if settings is not None and time.monotonic() - _last_check < RELOAD_CHECK_INTERVAL:
+        return settings
+
+    with _lock:
+        stamp = _secrets_stamp()
+        if _settings is None or stamp != _stamp:
+            try:
+                _settings = parse_settings(st.secrets)
+            except SettingsError:
+                if _settings is None:
+                    raise
+                # Keep serving the last good settings if an edit broke the file
+            _stamp = stamp
+        _last_check = time.monotonic()
+        return _settings
+
+
+def data_path(filename):
+    """Path for a local data file (SQLite stores, snapshots) inside storage.data_dir."""
+    data_dir = get_settings().storage.data_dir
+    os.makedirs(data_dir, exist_ok=True)
+    return os.path.join(data_dir, filename)
+
+
+def cycle_data_path(filename):
+    """data_path for a file kept per reporting cycle: 'history.db' becomes 'history.2025.db' in cycle 2025."""
+    cycle = get_settings().sheets.cycle
+    if cycle:
+        stem, ext = os.path.splitext(filename)
+        filename = f"{stem}.{cycle}{ext}"
+    return data_path(filename)
+
+
+def require_settings():
+    """Load settings at app startup, stopping with one clear error if they are invalid"""
+    try:
+        return get_settings()
+    except SettingsError as e:
+        st.error(f"❌ {e}")
+        st.stop()
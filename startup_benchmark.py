@@ -0,0 +1,128 @@
+"""
+Cold-Start Benchmark for the HSCRC Hospital Portal
+Renders the login page in fresh interpreters (Streamlit AppTest, no browser needed)
+and reports first-paint time, memory and the heaviest imports the script pulls in.
+
+Usage:
+    python startup_benchmark.py                          # 5 cold runs of the portal login page
+    python startup_benchmark.py --runs 10 --imports 15   # more runs, longer import list
+    python startup_benchmark.py --script hscrc_dashboard_V1_GS.py
+
+Compare before/after a change by running it on both checkouts.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Placeholder secrets: enough for settings validation, never used to connect
+BENCHMARK_SECRETS = {
+    'email': {'sender_email': 'benchmark@localhost', 'sender_password': 'benchmark'},
+    'gcp_service_account': {'client_email': 'benchmark@localhost', 'private_key': 'benchmark',
+                            'token_uri': 'https://localhost/token'},
+}
+
+# Runs in a fresh interpreter: everything the script imports is a cold import
+_CHILD = r"""
+import json, sys, time, tracemalloc
+from streamlit.testing.v1 import AppTest
+
+script, secrets, trace = sys.argv[1], json.loads(sys.argv[2]), sys.argv[3] == '1'
+at = AppTest.from_file(script, default_timeout=120)
+for section, values in secrets.items():
+    at.secrets[section] = values
+
+before = set(sys.modules)
+if trace:
+    tracemalloc.start()
+start = time.perf_counter()
+at.run()
+elapsed = time.perf_counter() - start
+peak = tracemalloc.get_traced_memory()[1] if trace else 0
+
+print(json.dumps({
+    'seconds': elapsed,
+    'peak_bytes': peak,
+    'new_modules': sorted(set(sys.modules) - before),
+    'exceptions': [str(e.value) for e in at.exception],
+}))
+"""
+
+
+def _run_child(script, secrets, trace=False, importtime=False):
+    command = [sys.executable]
+    if importtime:
+        command += ["-X", "importtime"]
+    command += ["-c", _CHILD, script, json.dumps(secrets), "1" if trace else "0"]
+    result = subprocess.run(command, capture_output=True, text=True, cwd=APP_DIR, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+
+def _heaviest_imports(stderr, new_modules, limit):
+    """Outermost modules first imported by the script, by cumulative import time (ms)."""
+    new_modules = set(new_modules)
+    totals = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        name = name.rstrip()[1:]
+        # Only outermost imports count (nested ones are indented and inside their parent's total)
+        if not name.startswith(" ") and name in new_modules:
+            totals[name] = totals.get(name, 0) + int(cumulative) / 1000
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+
+def run_benchmark(script="hospital_portal_V2_GS.py", runs=5, imports=10):
+    """
+    Cold-render `script` `runs` times.
+
+    Returns:
+        dict with seconds (list), p50_ms, peak_mb, modules, heaviest_imports, exceptions
+    """
+    script = os.path.join(APP_DIR, script)
+    with tempfile.TemporaryDirectory() as data_dir:
+        secrets = dict(BENCHMARK_SECRETS, storage={'data_dir': data_dir})
+
+        timings = [_run_child(script, secrets)[0] for _ in range(runs)]
+        traced, _ = _run_child(script, secrets, trace=True)
+        profiled, stderr = _run_child(script, secrets, importtime=True)
+
+    seconds = [timing['seconds'] for timing in timings]
+    return {
+        'seconds': seconds,
+        'p50_ms': statistics.median(seconds) * 1000,
+        'peak_mb': traced['peak_bytes'] / 1e6,
+        'modules': len(profiled['new_modules']),
+        'heaviest_imports': _heaviest_imports(stderr, profiled['new_modules'], imports),
+        'exceptions': timings[0]['exceptions'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold start of a Streamlit page")
+    parser.add_argument("--script", default="hospital_portal_V2_GS.py", help="App script to render")
+    parser.add_argument("--runs", type=int, default=5, help="Number of cold runs to time")
+    parser.add_argument("--imports", type=int, default=10, help="How many of the heaviest imports to list")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.script, args.runs, args.imports)
+    print(f"First paint:  p50 {result['p50_ms']:.0f} ms | min {min(result['seconds']) * 1000:.0f} ms "
+          f"| max {max(result['seconds']) * 1000:.0f} ms over {args.runs} cold runs")
+    print(f"Memory:       {result['peak_mb']:.1f} MB peak allocated while rendering (tracemalloc)")
+    print(f"Modules:      {result['modules']} imported by the script")
+    print("Heaviest imports (cumulative ms):")
+    for name, ms in result['heaviest_imports']:
+        print(f"  {ms:8.1f}  {name}")
+    if result['exceptions']:
+        print(f"Exceptions:   {result['exceptions']}")
+
+
+if __name__ == "__main__":
+    main()
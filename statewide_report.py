@@ -0,0 +1,261 @@
+"""
+Statewide Summary Report for HSCRC Survey System
+Builds a printable multi-page PDF with the dashboard charts and summary tables
+"""
+
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+from reportlab.lib.pagesizes import letter
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+from reportlab.graphics.shapes import Drawing, Rect, String
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.charts.piecharts import Pie
+
+from survey_analytics import (
+    data_version, explode_bp_selections, bp_popularity,
+    tier_distribution, tier_colors, bp_tier_matrix
+)
+from survey_schema import is_approved
+
+CHART_WIDTH = 6.5 * inch
+HEADER_COLOR = colors.HexColor('#1f4788')
+
+TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), HEADER_COLOR),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+])
+
+
+# ==================== CHART RENDERING ====================
+def _short_bp_label(label):
+    """Use the BP code (e.g. 'BP1') as the axis label to keep charts readable."""
+    return str(label).split(':')[0]
+
+
+def _popularity_chart(bp_counts):
+    """Bar chart of BP selections."""
+    drawing = Drawing(CHART_WIDTH, 3 * inch)
+    chart = VerticalBarChart()
+    chart.x, chart.y = 50, 40
+    chart.width, chart.height = CHART_WIDTH - 80, 3 * inch - 70
+    chart.data = [list(bp_counts.values)]
+    chart.categoryAxis.categoryNames = [_short_bp_label(label) for label in bp_counts.index]
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.valueStep = max(1, int(bp_counts.max() // 5) or 1)
+    chart.bars[0].fillColor = HEADER_COLOR
+    drawing.add(chart)
+    drawing.add(String(CHART_WIDTH / 2, 3 * inch - 15, "Which Best Practices Are Most Popular?",
+                       fontName='Helvetica-Bold', fontSize=11, textAnchor='middle'))
+    return drawing
+
+
+def _tier_pie_chart(tier_counts):
+    """Pie chart of tier selections using the tier color scheme."""
+    drawing = Drawing(CHART_WIDTH, 3 * inch)
+    pie = Pie()
+    pie.x, pie.y = CHART_WIDTH / 2 - 1.1 * inch, 20
+    pie.width = pie.height = 2.2 * inch
+    pie.data = list(tier_counts.values)
+    pie.labels = [f"Tier {tier} ({count})" for tier, count in tier_counts.items()]
+    pie.slices.fontName = 'Helvetica'
+    for i, color in enumerate(tier_colors(tier_counts.index)):
+        pie.slices[i].fillColor = colors.HexColor(color)
+        pie.slices[i].strokeColor = colors.white
+    drawing.add(pie)
+    drawing.add(String(CHART_WIDTH / 2, 3 * inch - 15, "Overall Tier Selection Distribution",
+                       fontName='Helvetica-Bold', fontSize=11, textAnchor='middle'))
+    return drawing
+
+
+def _heatmap_chart(matrix):
+    """BP × Tier heatmap drawn as a shaded grid with counts."""
+    label_width = 1.2 * inch
+    cell_height = 0.35 * inch
+    cell_width = (CHART_WIDTH - label_width) / max(len(matrix.columns), 1)
+    height = cell_height * (len(matrix.index) + 1) + 25
+
+    drawing = Drawing(CHART_WIDTH, height)
+    peak = max(int(matrix.values.max()), 1)
+    for row_idx, bp in enumerate(matrix.index):
+        y = height - 25 - cell_height * (row_idx + 2)
+        drawing.add(String(4, y + cell_height / 3, _short_bp_label(bp), fontName='Helvetica', fontSize=9))
+        for col_idx, tier in enumerate(matrix.columns):
+            count = int(matrix.loc[bp, tier])
+            shade = colors.linearlyInterpolatedColor(
+                colors.HexColor('#f7fbff'), colors.HexColor('#08306b'), 0, peak, count
+            )
+            x = label_width + col_idx * cell_width
+            drawing.add(Rect(x, y, cell_width, cell_height, fillColor=shade, strokeColor=colors.white))
+            drawing.add(String(x + cell_width / 2, y + cell_height / 3, str(count), fontName='Helvetica', fontSize=9,
+                               textAnchor='middle',
+                               fillColor=colors.white if count > peak / 2 else colors.black))
+
+    header_y = height - 25 - cell_height + cell_height / 3
+    for col_idx, tier in enumerate(matrix.columns):
+        drawing.add(String(label_width + (col_idx + 0.5) * cell_width, header_y, str(tier),
+                           fontName='Helvetica-Bold', fontSize=9, textAnchor='middle'))
+    drawing.add(String(CHART_WIDTH / 2, height - 15, "Best Practice × Tier Selection Matrix",
+                       fontName='Helvetica-Bold', fontSize=11, textAnchor='middle'))
+    return drawing
+
+
+@st.cache_data(max_entries=4, show_spinner=False)
+def report_chart_data(version, _long_df, bp_names):
+    """
+    Aggregate the report chart data once per data version.
+
+    Args:
+        version: Data version from survey_analytics.data_version (cache key)
+        _long_df: Exploded BP selections (not hashed, identified by version)
+        bp_names: BP code -> display name mapping
+
+    Returns:
+        dict with 'popularity', 'tiers' and 'heatmap' aggregates
+    """
+    return {
+        'popularity': bp_popularity(_long_df, bp_names),
+        'tiers': tier_distribution(_long_df),
+        'heatmap': bp_tier_matrix(_long_df, bp_names),
+    }
+
+
+def render_report_charts(chart_data):
+    """
+    Render the report charts as ReportLab drawings (locally, without a browser).
+    Drawings are mutable flowables, so every report gets its own.
+
+    Returns:
+        dict of chart name -> Drawing (None when there is nothing to plot)
+    """
+    bp_counts, tier_counts, matrix = chart_data['popularity'], chart_data['tiers'], chart_data['heatmap']
+    return {
+        'popularity': _popularity_chart(bp_counts) if not bp_counts.empty else None,
+        'tiers': _tier_pie_chart(tier_counts) if not tier_counts.empty else None,
+        'heatmap': _heatmap_chart(matrix) if not matrix.empty else None,
+    }
+
+
+# ==================== REPORT BUILDING ====================
+def _table(rows, col_widths):
+    table = Table(rows, colWidths=col_widths, repeatRows=1)
+    table.setStyle(TABLE_STYLE)
+    return table
+
+
+def write_statewide_report(df, stream, bp_names, generated_by=None):
+    """
+    Write the statewide summary report as PDF into an open binary stream.
+
+    Args:
+        df: All submissions (wide format, as loaded from Google Sheets)
+        stream: Writable binary file object (e.g. an open file or temp file)
+        bp_names: BP code -> display name mapping
+        generated_by: Optional staff name shown on the cover page
+    """
+    long_df = explode_bp_selections(df)
+    chart_data = report_chart_data(data_version(df), long_df, bp_names)
+    charts = render_report_charts(chart_data)
+
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle('ReportTitle', parent=styles['Heading1'], fontSize=20,
+                                 textColor=HEADER_COLOR, spaceAfter=20, alignment=TA_CENTER)
+    doc = SimpleDocTemplate(stream, pagesize=letter, rightMargin=54, leftMargin=54,
+                            topMargin=54, bottomMargin=36,
+                            title="HSCRC Statewide Best Practice Summary")
+
+    story = [Paragraph("HSCRC Statewide Best Practice Summary", title_style)]
+    generated = datetime.now().strftime('%B %d, %Y at %I:%M %p')
+    story.append(Paragraph(f"Generated {generated}" + (f" by {generated_by}" if generated_by else ""),
+                           styles['Normal']))
+    story.append(Spacer(1, 0.3 * inch))
+
+    # Overview
+    approved_count = int(df['approved'].map(is_approved).sum()) if 'approved' in df.columns else 0
+    overview = [
+        ['Metric', 'Value'],
+        ['Total Hospitals', str(df['hospital_name'].nunique())],
+        ['Total Submissions', str(len(df))],
+        ['BP Selections', str(len(long_df))],
+        ['Approved Submissions', str(approved_count)],
+        ['Draft Submissions', str(len(df) - approved_count)],
+    ]
+    story.append(Paragraph("<b>Overview</b>", styles['Heading2']))
+    story.append(_table(overview, [3 * inch, 3 * inch]))
+    story.append(Spacer(1, 0.3 * inch))
+
+    # Best practice popularity
+    story.append(Paragraph("<b>Best Practice Popularity</b>", styles['Heading2']))
+    if charts['popularity'] is not None:
+        story.append(charts['popularity'])
+        story.append(Spacer(1, 0.15 * inch))
+        bp_counts = chart_data['popularity']
+        rows = [['Best Practice', 'Selections']] + [[str(bp), str(n)] for bp, n in bp_counts.items()]
+        story.append(_table(rows, [5 * inch, 1.5 * inch]))
+    else:
+        story.append(Paragraph("No BP data reported yet.", styles['Normal']))
+    story.append(PageBreak())
+
+    # Tier distribution
+    story.append(Paragraph("<b>Tier Distribution Across All BPs</b>", styles['Heading2']))
+    if charts['tiers'] is not None:
+        story.append(charts['tiers'])
+        story.append(Spacer(1, 0.15 * inch))
+        tier_counts = chart_data['tiers']
+        total = tier_counts.sum()
+        rows = [['Tier', 'Selections', 'Share']] + [
+            [f"Tier {tier}", str(n), f"{n / total:.0%}"] for tier, n in tier_counts.items()
+        ]
+        story.append(_table(rows, [2 * inch, 2 * inch, 2 * inch]))
+    else:
+        story.append(Paragraph("No tier data reported yet.", styles['Normal']))
+    story.append(Spacer(1, 0.3 * inch))
+
+    # BP × Tier matrix
+    story.append(Paragraph("<b>Best Practice × Tier Matrix</b>", styles['Heading2']))
+    if charts['heatmap'] is not None:
+        story.append(charts['heatmap'])
+        story.append(Spacer(1, 0.15 * inch))
+        matrix = chart_data['heatmap']
+        rows = [['Best Practice'] + list(matrix.columns)] + [
+            [str(bp)] + [str(int(v)) for v in counts] for bp, counts in matrix.iterrows()
+        ]
+        tier_width = 3 * inch / max(len(matrix.columns), 1)
+        story.append(_table(rows, [3.5 * inch] + [tier_width] * len(matrix.columns)))
+    else:
+        story.append(Paragraph("No data to display in matrix.", styles['Normal']))
+    story.append(PageBreak())
+
+    # Per-hospital detail
+    story.append(Paragraph("<b>Hospital Submissions Detail</b>", styles['Heading2']))
+    cell_style = ParagraphStyle('Cell', parent=styles['Normal'], fontSize=8, leading=10)
+    rows = [['Hospital', 'First BP', 'Second BP', 'Status', 'Submitted']]
+    for _, row in df.sort_values('hospital_name').iterrows():
+        bps = []
+        for slot in ('bp1', 'bp2'):
+            code = row.get(slot)
+            if pd.notna(code) and code != '':
+                bps.append(f"{code} (Tier {row.get(f'{slot}_tier', '')})")
+            else:
+                bps.append('—')
+        rows.append([
+            Paragraph(str(row['hospital_name']), cell_style),
+            bps[0],
+            bps[1],
+            'APPROVED' if is_approved(row.get('approved')) else 'DRAFT',
+            str(row.get('timestamp', '')),
+        ])
+    story.append(_table(rows, [2.1 * inch, 1.1 * inch, 1.1 * inch, 0.9 * inch, 1.3 * inch]))
+
+    doc.build(story)
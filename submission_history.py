@@ -0,0 +1,223 @@
+"""
+Submission Version History for HSCRC Survey System
+Append-only record of every save, approve and un-approve, kept in local SQLite.
+Each version is stored as a field-level delta against the previous one, with a full
+checkpoint every CHECKPOINT_EVERY versions so rebuilding any version stays cheap.
+"""
+
+import json
+import sqlite3
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from settings import cycle_data_path
+from survey_schema import is_blank
+
+# Local SQLite file inside storage.data_dir (survives app restarts), one per reporting cycle
+HISTORY_DB_FILE = "history.db"
+
+# A version is rebuilt from the nearest checkpoint plus at most CHECKPOINT_EVERY - 1 deltas
+CHECKPOINT_EVERY = 10
+
+CHECKPOINT = 'checkpoint'
+DELTA = 'delta'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS versions (
+    hospital_name TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    action TEXT NOT NULL,
+    saved_by TEXT,
+    saved_at REAL NOT NULL,
+    PRIMARY KEY (hospital_name, version)
+);
+"""
+
+
+def _connect(db_path=None):
+    db_path = db_path or cycle_data_path(HISTORY_DB_FILE)
+    conn = sqlite3.connect(db_path, timeout=10, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _as_text(value):
+    # The sheet stores text, so 2, 2.0 and '2' are the same answer
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+
+def _normalize(data):
+    """Submission as stored in history: blank fields dropped, values as text."""
+    return {str(key): _as_text(value) for key, value in data.items() if not is_blank(value)}
+
+
+def _make_delta(old, new):
+    delta = {'set': {key: value for key, value in new.items() if old.get(key) != value}}
+    unset = [key for key in old if key not in new]
+    if unset:
+        delta['unset'] = unset
+    return delta
+
+
+def _apply(state, kind, payload):
+    if kind == CHECKPOINT:
+        return dict(payload)
+    state = dict(state)
+    state.update(payload.get('set', {}))
+    for key in payload.get('unset', []):
+        state.pop(key, None)
+    return state
+
+
+def _replay(conn, hospital_name, version):
+    """State at `version`: the nearest checkpoint at or before it plus the deltas after it."""
+    rows = conn.execute(
+        "SELECT kind, payload FROM versions WHERE hospital_name = ? AND version <= ? AND version >= "
+        "(SELECT MAX(version) FROM versions WHERE hospital_name = ? AND kind = ? AND version <= ?) "
+        "ORDER BY version",
+        (hospital_name, version, hospital_name, CHECKPOINT, version)
+    ).fetchall()
+    state = {}
+    for kind, payload in rows:
+        state = _apply(state, kind, json.loads(payload))
+    return state
+
+
+def _latest_version(conn, hospital_name):
+    row = conn.execute("SELECT MAX(version) FROM versions WHERE hospital_name = ?", (hospital_name,)).fetchone()
+    return row[0] or 0
+
+
+# ==================== RECORDING ====================
+def _append(conn, hospital_name, new, action, saved_by):
+    latest = _latest_version(conn, hospital_name)
+    previous = _replay(conn, hospital_name, latest) if latest else {}
+    if latest and previous == new:
+        return latest
+
+    version = latest + 1
+    if (version - 1) % CHECKPOINT_EVERY == 0:
+        kind, payload = CHECKPOINT, new
+    else:
+        kind, payload = DELTA, _make_delta(previous, new)
+    conn.execute(
+        "INSERT INTO versions (hospital_name, version, kind, payload, action, saved_by, saved_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (hospital_name, version, kind, json.dumps(payload), action, saved_by, time.time())
+    )
+    return version
+
+
+def record_version(hospital_name, data, action='save', saved_by=None, previous=None, db_path=None):
+    """
+    Append a version of a hospital's submission (no-op if nothing changed).
+
+    Args:
+        hospital_name: Name of the hospital
+        data: The full submission as now saved in the sheet
+        action: What produced it ('draft', 'submit', 'approve', 'unapprove', ...)
+        saved_by: Who made the change (contact or staff name)
+        previous: The row before this change; recorded first as a 'baseline'
+            version if the hospital has no history yet (rows saved before history existed)
+
+    Returns:
+        int: The new version number, or the latest one if nothing changed
+    """
+    conn = _connect(db_path)
+    try:
+        # IMMEDIATE so two saves for the same hospital can't claim the same version number
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if previous and not _latest_version(conn, hospital_name):
+                _append(conn, hospital_name, _normalize(previous), 'baseline', None)
+            version = _append(conn, hospital_name, _normalize(data), action, saved_by)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+    return version
+
+
+# ==================== READING ====================
+def materialize(hospital_name, version=None, db_path=None):
+    """
+    Rebuild a hospital's submission as it was at a version.
+
+    Args:
+        hospital_name: Name of the hospital
+        version: Version number (default: the latest)
+
+    Returns:
+        dict: field -> value (blank fields omitted), or None if the version doesn't exist
+    """
+    conn = _connect(db_path)
+    try:
+        latest = _latest_version(conn, hospital_name)
+        version = latest if version is None else version
+        if not 1 <= version <= latest:
+            return None
+        return _replay(conn, hospital_name, version)
+    finally:
+        conn.close()
+
+
+def diff_versions(hospital_name, old_version, new_version, db_path=None):
+    """
+    Fields that differ between two versions of a hospital's submission.
+
+    Returns:
+        dict: field -> (value in old_version, value in new_version); None stands for blank
+    """
+    conn = _connect(db_path)
+    try:
+        old = _replay(conn, hospital_name, old_version)
+        new = _replay(conn, hospital_name, new_version)
+    finally:
+        conn.close()
+    return {
+        key: (old.get(key), new.get(key))
+        for key in list(old) + [key for key in new if key not in old]
+        if old.get(key) != new.get(key)
+    }
+
+
+def list_versions(hospital_name, db_path=None):
+    """
+    A hospital's version history, newest first.
+
+    Returns:
+        DataFrame with version, saved_at, action, saved_by, fields_changed
+    """
+    conn = _connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT version, saved_at, action, saved_by, kind, payload FROM versions "
+            "WHERE hospital_name = ? ORDER BY version",
+            (hospital_name,)
+        ).fetchall()
+    finally:
+        conn.close()
+
+    history = []
+    state = {}
+    for version, saved_at, action, saved_by, kind, payload in rows:
+        new = _apply(state, kind, json.loads(payload))
+        changed = {key for key in set(state) | set(new) if state.get(key) != new.get(key)}
+        history.append({
+            'version': version,
+            'saved_at': datetime.fromtimestamp(saved_at).strftime("%Y-%m-%d %H:%M:%S"),
+            'action': action,
+            'saved_by': saved_by or '',
+            'fields_changed': len(changed),
+        })
+        state = new
+    return pd.DataFrame(history[::-1], columns=['version', 'saved_at', 'action', 'saved_by', 'fields_changed'])
@@ -0,0 +1,157 @@
+"""
+Shared analytics for HSCRC survey submissions
+Aggregations used by the dashboard and the statewide PDF report
+"""
+
+import hashlib
+
+import pandas as pd
+
+from survey_schema import BP_SLOTS, is_approved
+
+TIER_COLORS = {1: '#28a745', 2: '#ffc107', 3: '#dc3545'}
+DEFAULT_TIER_COLOR = '#6c757d'
+
+
+def data_version(df):
+    """Return a short content hash identifying this version of the data."""
+    if df is None or df.empty:
+        return 'empty'
+    hashed = pd.util.hash_pandas_object(df.astype(str), index=False).values
+    digest = hashlib.sha1(hashed.tobytes())
+    digest.update('|'.join(map(str, df.columns)).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def explode_bp_selections(df, keep_columns=()):
+    """
+    Turn the wide submission table into one row per reported best practice.
+
+    Args:
+        df: Wide submissions table
+        keep_columns: Extra columns carried onto every row (e.g. 'cycle')
+
+    Returns:
+        DataFrame with columns hospital_name, *keep_columns, slot, bp, tier (nullable Int64)
+    """
+    keep_columns = [column for column in keep_columns if column in df.columns]
+    frames = []
+    for slot in BP_SLOTS:
+        tier_col = f'{slot}_tier'
+        if slot not in df.columns:
+            continue
+        part = pd.DataFrame({
+            'hospital_name': df['hospital_name'],
+            **{column: df[column] for column in keep_columns},
+            'slot': slot,
+            'bp': df[slot],
+            'tier': df[tier_col] if tier_col in df.columns else pd.NA,
+        })
+        frames.append(part)
+
+    if not frames:
+        return pd.DataFrame({
+            'hospital_name': pd.Series(dtype=object),
+            **{column: pd.Series(dtype=object) for column in keep_columns},
+            'slot': pd.Series(dtype=object),
+            'bp': pd.Series(dtype=object),
+            'tier': pd.Series(dtype='Int64'),
+        })
+
+    long_df = pd.concat(frames, ignore_index=True)
+    long_df = long_df[long_df['bp'].notna() & (long_df['bp'].astype(str).str.strip() != '')]
+    long_df['tier'] = pd.to_numeric(long_df['tier'], errors='coerce').astype('Int64')
+    return long_df.reset_index(drop=True)
+
+
+def filter_selections(long_df, bp_codes=None, tiers=None):
+    """Keep only the BP selections that match the BP and tier filters."""
+    mask = pd.Series(True, index=long_df.index)
+    if bp_codes:
+        mask &= long_df['bp'].isin(bp_codes)
+    if tiers:
+        mask &= long_df['tier'].isin(tiers)
+    return long_df[mask]
+
+
+def bp_popularity(long_df, bp_names=None):
+    """Number of selections per best practice, most popular first."""
+    counts = long_df['bp'].value_counts()
+    if bp_names:
+        counts.index = [bp_names.get(code, code) for code in counts.index]
+    return counts
+
+
+def tier_distribution(long_df):
+    """Number of selections per tier, ordered by tier."""
+    return long_df['tier'].dropna().value_counts().sort_index()
+
+
+def tier_colors(tiers):
+    """Chart colors matching the tier traffic-light scheme."""
+    return [TIER_COLORS.get(tier, DEFAULT_TIER_COLOR) for tier in tiers]
+
+
+def bp_tier_matrix(long_df, bp_names=None):
+    """
+    Count selections for each best practice and tier.
+
+    Returns:
+        DataFrame indexed by BP name with one 'Tier N' column per tier
+    """
+    rated = long_df[long_df['tier'].notna()]
+    if rated.empty:
+        return pd.DataFrame()
+
+    labels = rated['bp'].map(lambda code: bp_names.get(code, code)) if bp_names else rated['bp']
+    matrix = pd.crosstab(labels, 'Tier ' + rated['tier'].astype(str))
+    matrix.index.name = 'BP'
+    matrix.columns.name = 'Tier'
+    return matrix
+
+
+def cycle_overview(stacked, hospital_count=None):
+    """
+    Headline numbers per reporting cycle.
+
+    Args:
+        stacked: Submissions of several cycles with a 'cycle' column (see cycle_archive.stack_cycles)
+        hospital_count: Hospitals expected to submit, for the participation rate
+
+    Returns:
+        DataFrame indexed by cycle with Submitted, Approved, Participation % (if hospital_count) and Average Tier
+    """
+    latest = stacked.drop_duplicates(['cycle', 'hospital_name'], keep='first')
+    approved = latest.get('approved', pd.Series('', index=latest.index)).map(is_approved).astype(bool)
+    overview = pd.DataFrame({
+        'Submitted': latest.groupby('cycle', sort=False)['hospital_name'].nunique(),
+        'Approved': approved.groupby(latest['cycle'], sort=False).sum(),
+    })
+    if hospital_count:
+        overview['Participation %'] = (overview['Submitted'] / hospital_count * 100).round(1)
+    tiers = explode_bp_selections(latest, keep_columns=('cycle',))
+    overview['Average Tier'] = tiers.groupby('cycle', sort=False)['tier'].mean().astype(float).round(2)
+    overview.index.name = 'Cycle'
+    return overview
+
+
+def bp_tier_by_cycle(stacked, bp_names=None):
+    """
+    Average tier reported for each best practice in each cycle.
+
+    Returns:
+        DataFrame indexed by BP name with one column per cycle (NaN where the BP wasn't reported)
+    """
+    latest = stacked.drop_duplicates(['cycle', 'hospital_name'], keep='first')
+    rated = explode_bp_selections(latest, keep_columns=('cycle',)).dropna(subset=['tier'])
+    if rated.empty:
+        return pd.DataFrame()
+
+    labels = rated['bp'].map(lambda code: bp_names.get(code, code)) if bp_names else rated['bp']
+    matrix = rated.assign(bp=labels, tier=rated['tier'].astype(float)).pivot_table(
+        index='bp', columns='cycle', values='tier', aggfunc='mean', sort=False
+    )
+    matrix = matrix.reindex(columns=list(dict.fromkeys(latest['cycle'])))
+    matrix.index.name = 'BP'
+    matrix.columns.name = 'Cycle'
+    return matrix.round(2)
@@ -0,0 +1,153 @@
+"""
+Survey Registry for HSCRC Survey System
+Hospitals, their logins and Best Practice assignments, and Best Practice / tier text.
+Loaded from survey_registry.json once per process and reloaded when the file changes,
+so assignment updates don't need a redeploy.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+
+import streamlit as st
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+REGISTRY_FILE = os.path.join(APP_DIR, "survey_registry.json")
+RELOAD_CHECK_INTERVAL = 2   # Seconds between registry file mtime checks
+
+SELECT_BP_LABEL = "-- Select Best Practice --"
+TIERS = (1, 2, 3)
+
+
+class RegistryError(Exception):
+    """Raised when the registry file is missing or invalid."""
+
+
+@dataclass(frozen=True)
+class SurveyRegistry:
+    hospital_creds: MappingProxyType        # hospital -> portal password
+    hospital_names: tuple                   # every hospital expected to submit, in file order
+    hospital_bps: MappingProxyType          # hospital -> (assigned BP #1, assigned BP #2)
+    bp_names: MappingProxyType              # "BP1" -> "BP1: Interdisciplinary Rounds & ..."
+    bp_options: MappingProxyType            # bp_names plus the "" placeholder, for selectboxes
+    tier_descriptions: MappingProxyType     # "BP1" -> {"name": ..., 1: {"title", "description"}, ...}
+
+
+# ==================== PARSING ====================
+def parse_registry(raw):
+    """
+    Build the registry and its derived lookups from the file's JSON content.
+
+    Raises:
+        RegistryError: listing every problem found at once
+    """
+    problems = []
+    best_practices = raw.get("best_practices") or {}
+    hospitals = raw.get("hospitals") or {}
+    if not best_practices:
+        problems.append("best_practices is empty")
+    if not hospitals:
+        problems.append("hospitals is empty")
+
+    bp_names = {}
+    tier_descriptions = {}
+    for code, bp in best_practices.items():
+        tiers = bp.get("tiers") or {}
+        missing = [str(t) for t in TIERS if str(t) not in tiers]
+        if not bp.get("name") or missing:
+            problems.append(f"best_practices.{code} needs a name and tiers {', '.join(map(str, TIERS))}")
+            continue
+        bp_names[code] = f"{code}: {bp['name']}"
+        description = {"name": bp["name"]}
+        for t in TIERS:
+            description[t] = MappingProxyType(dict(tiers[str(t)]))
+        tier_descriptions[code] = MappingProxyType(description)
+
+    hospital_creds = {}
+    hospital_bps = {}
+    for name, hospital in hospitals.items():
+        assigned = tuple(hospital.get("best_practices") or ("", ""))
+        unknown = [code for code in assigned if code and code not in best_practices]
+        if unknown:
+            problems.append(f"hospitals.{name} is assigned unknown Best Practice(s): {', '.join(unknown)}")
+        if not hospital.get("password"):
+            problems.append(f"hospitals.{name}.password is missing")
+        hospital_creds[name] = hospital.get("password")
+        hospital_bps[name] = assigned
+
+    if problems:
+        raise RegistryError(f"Invalid {os.path.basename(REGISTRY_FILE)}:\n- " + "\n- ".join(problems))
+
+    return SurveyRegistry(
+        hospital_creds=MappingProxyType(hospital_creds),
+        hospital_names=tuple(hospital_creds),
+        hospital_bps=MappingProxyType(hospital_bps),
+        bp_names=MappingProxyType(bp_names),
+        bp_options=MappingProxyType({"": SELECT_BP_LABEL, **bp_names}),
+        tier_descriptions=MappingProxyType(tier_descriptions),
+    )
+
+
+def load_registry(path=None):
+    """Read and parse a registry file (no caching)."""
+    path = path or REGISTRY_FILE
+    try:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+    except (OSError, ValueError) as e:
+        raise RegistryError(f"Could not read {os.path.basename(path)}: {e}") from e
+    return parse_registry(raw)
+
+
+# ==================== CACHED ACCESS ====================
+_lock = threading.Lock()
+_registry = None
+_stamp = None
+_last_check = 0.0
+
+
+def _file_stamp():
+    try:
+        return os.stat(REGISTRY_FILE).st_mtime_ns
+    except OSError:
+        return None
+
+
+def get_registry():
+    """
+    Return the process-wide registry, loaded once and reloaded only
+    when survey_registry.json changes on disk.
+
+    Raises:
+        RegistryError: if the file is missing or invalid on first load
+    """
+    global _registry, _stamp, _last_check
+
+    registry = _registry
+    if registry is not None and time.monotonic() - _last_check < RELOAD_CHECK_INTERVAL:
+        return registry
+
+    with _lock:
+        stamp = _file_stamp()
+        if _registry is None or stamp != _stamp:
+            try:
+                _registry = load_registry()
+            except RegistryError:
+                if _registry is None:
+                    raise
+                # Keep serving the last good registry if an edit broke the file
+            _stamp = stamp
+        _last_check = time.monotonic()
+        return _registry
+
+
+def require_registry():
+    """Load the registry at app startup, stopping with one clear error if it is invalid"""
+    try:
+        return get_registry()
+    except RegistryError as e:
+        st.error(f"❌ {e}")
+        st.stop()
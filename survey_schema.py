@@ -0,0 +1,453 @@
+"""
+Declarative Question Schema for the HSCRC Best Practices Survey
+One definition per Best Practice, compiled once into per-tier render plans.
+Rendering, loading, validation, PDF output and the sheet column set all derive from it.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+# ==================== QUESTION KINDS ====================
+HEADER = 'header'          # Markdown heading / instruction line (no answer)
+DIVIDER = 'divider'        # Horizontal rule (no answer)
+TOGGLE = 'toggle'          # Checkbox that reveals other questions (no answer of its own)
+TEXT = 'text'              # Single-line text input
+TEXTAREA = 'textarea'      # Multi-line text with a character limit
+CHECKLIST = 'checklist'    # Checkboxes stored as one comma-separated answer, optional "Other"
+CHOICE = 'choice'          # Radio buttons, one option
+MULTI = 'multi'            # Multiselect stored as one comma-separated answer
+
+ANSWER_KINDS = (TEXT, TEXTAREA, CHECKLIST, CHOICE, MULTI)
+
+ALL_TIERS = (1, 2, 3)
+
+# Columns every submission row has, in sheet order
+CORE_COLUMNS = [
+    'timestamp', 'hospital_name', 'contact_name', 'email', 'phone',
+    'secondary_contact_name', 'secondary_email', 'secondary_phone',
+    'bp1', 'bp1_tier', 'bp2', 'bp2_tier',
+    'approved', 'approved_by', 'approved_at'
+]
+BP_SLOTS = ('bp1', 'bp2')
+
+
+def from_tier(tier):
+    """Shown for this tier and every higher tier (cumulative BPs)."""
+    return tuple(t for t in ALL_TIERS if t >= tier)
+
+
+def only(*tiers):
+    """Shown for exactly these tiers (non-hierarchical BPs)."""
+    return tuple(tiers)
+
+
+# ==================== SCHEMA DEFINITION ====================
+# Each question is a dict:
+#   kind       one of the kinds above
+#   key        answer/widget key suffix (full key is f"{prefix}_{key}")
+#   label      text, or {tier: text} when the wording depends on the tier
+#   tiers      tiers the question is shown for (default: all)
+#   tier_label tier badge shown next to the label
+#   show_if    key of a TOGGLE that must be checked for the question to show
+#   options    CHECKLIST: [(widget_key, label, stored_value)]; CHOICE/MULTI: [option]
+#   other      CHECKLIST: (check_key, text_key, label) for an "Other" option
+#   default_from  TOGGLE: answer key whose presence pre-checks the toggle
+#   height, max_chars  TEXTAREA sizing
+#   required   defaults to True when the label ends with "*"
+#   summary    short label for reports (defaults to the label)
+
+def _header(text, tiers=ALL_TIERS):
+    return {'kind': HEADER, 'label': text, 'tiers': tiers}
+
+
+def _kpi_text(key, label, tier_label, show_if, tiers=ALL_TIERS):
+    return {'kind': TEXT, 'key': key, 'label': label, 'tier_label': tier_label,
+            'show_if': show_if, 'tiers': tiers}
+
+
+def _short(key, label, tier_label=None, tiers=ALL_TIERS):
+    return {'kind': TEXTAREA, 'key': key, 'label': label, 'height': 100, 'max_chars': 1000,
+            'tier_label': tier_label, 'tiers': tiers}
+
+
+def _long(key, label, tier_label=None, tiers=ALL_TIERS):
+    return {'kind': TEXTAREA, 'key': key, 'label': label, 'height': 150, 'max_chars': 2000,
+            'tier_label': tier_label, 'tiers': tiers}
+
+
+def _text(key, label, tier_label=None, tiers=ALL_TIERS):
+    return {'kind': TEXT, 'key': key, 'label': label, 'tier_label': tier_label, 'tiers': tiers}
+
+
+COMMON_QUESTIONS = [
+    {'kind': DIVIDER},
+    dict(_long('rationale', "Provide the rationale to why you selected this best practice & tier *"),
+         summary="Rationale"),
+    dict(_long('success', "Are there any success stories and/or barriers to implementing this best practice? *"),
+         summary="Success/Barriers"),
+]
+
+_BP1_KPI2 = {1: "10% improvement from baseline", 2: "10% improvement from baseline of above KPI",
+             3: "10% improvement from baseline of above KPI"}
+_BP1_KPI3 = "50% of adult inpatients were offered screening for the 5 (five) HRSN prior to discharge."
+_BP1_KPI4 = "10% improvement from baseline of all inpatients identified in tier one offered screening for HRSN."
+_BP1_KPI5 = ("75% of adult inpatients that have screened positive for HRSN are given referrals "
+             "to community resources prior to discharge.")
+_BP1_KPI6 = ("10% improvement from baseline of all positive screens for HRSN are given a referral "
+             "prior to discharge identified from tier two.")
+
+_BP4_PRACTICES = [
+    "Nurse Expediter", "Discharge Lounge", "Observation Unit (ED or hospital based)",
+    "Provider Screening in Triage / Early Provider Screening Process",
+    "Dedicated CM and/or SW resources in the ED"
+]
+_BP4_ORDINALS = {1: "first", 2: "second", 3: "third"}
+
+_BP5_MEASURES = {
+    'monthly': ("Committee/council scheduled monthly at minimum", "Monthly committee"),
+    'reportouts': ("Committee meetings include regular report outs", "Report outs"),
+    'exec': ("Report outs include executive participation", "Executive participation"),
+    'projects': ("Team develops and works on capacity and throughput projects", "Throughput projects"),
+    'huddles': ("Committee ensures routine capacity/throughput huddles", "Routine huddles"),
+    'obs': ("Committee ensures observation protocols", "Observation protocols"),
+    'evidence': ("KPIs are evidence-based", "Evidence-based KPIs"),
+    'units': ("KPIs reported for key units/service lines", "KPIs for units"),
+}
+_BP5_TIERS = {
+    1: ("### 🟢 Tier 1: Create Structure", ['monthly', 'projects'], "Describe other measure *"),
+    2: ("### 🟡 Tier 2: Establish Accountability",
+        ['monthly', 'reportouts', 'exec', 'projects', 'evidence'], "Describe other Tier 2 measure *"),
+    3: ("### 🔴 Tier 3: Change Culture",
+        ['monthly', 'reportouts', 'exec', 'projects', 'huddles', 'obs', 'evidence', 'units'],
+        "Describe other Tier 3 measure *"),
+}
+
+
+def _bp5_questions():
+    questions = []
+    for tier, (heading, measures, other_label) in _BP5_TIERS.items():
+        questions += [
+            _header(heading, only(tier)),
+            {'kind': CHECKLIST, 'key': f't{tier}_measures', 'tiers': only(tier),
+             'label': "**Select the accountable measure(s) you plan to report: ***",
+             'options': [(f't{tier}_{m}',) + _BP5_MEASURES[m] for m in measures],
+             'other': (f't{tier}_other_check', f't{tier}_other', other_label)},
+            _short(f't{tier}_formula', f"Provide the target measures' formula to achieve tier {tier} *",
+                   tiers=only(tier)),
+            _short(f't{tier}_actual',
+                   f"Provide the target measures' actual performance results to achieve tier {tier} *",
+                   tiers=only(tier)),
+        ]
+    questions.append(_short('improvements',
+                            "Describe any throughput improvements measured after implementing this best practice *"))
+    return questions
+
+
+QUESTION_SCHEMA = {
+    # BP1: Interdisciplinary Rounds - KPI checkboxes reveal target/actual inputs
+    "BP1": [
+        _header("### Select the KPIs you plan to achieve: *"),
+        _header("#### 🟢 Tier 1 KPIs:"),
+        {'kind': TOGGLE, 'key': 'kpi1', 'label': "70% of inpatient admissions have documented discharge planning",
+         'tier_label': 1, 'default_from': 'kpi1_target'},
+        {'kind': TOGGLE, 'key': 'kpi2', 'label': _BP1_KPI2, 'tier_label': 1, 'default_from': 'kpi2_target'},
+        _header("#### 🟡 Tier 2 KPIs (in addition to Tier 1):", from_tier(2)),
+        {'kind': TOGGLE, 'key': 'kpi3', 'label': "50% of adult inpatients were offered screening...",
+         'tier_label': 2, 'default_from': 'kpi3_target', 'tiers': from_tier(2)},
+        {'kind': TOGGLE, 'key': 'kpi4', 'label': _BP1_KPI4.rstrip('.'),
+         'tier_label': 2, 'default_from': 'kpi4_target', 'tiers': from_tier(2)},
+        _header("#### 🔴 Tier 3 KPIs (in addition to Tiers 1 & 2):", from_tier(3)),
+        {'kind': TOGGLE, 'key': 'kpi5', 'label': "75% of adult inpatients that have screened positive...",
+         'tier_label': 3, 'default_from': 'kpi5_target', 'tiers': from_tier(3)},
+        {'kind': TOGGLE, 'key': 'kpi6', 'label': _BP1_KPI6.rstrip('.'),
+         'tier_label': 3, 'default_from': 'kpi6_target', 'tiers': from_tier(3)},
+        {'kind': DIVIDER},
+        _kpi_text('kpi1_target', "Provide the target KPI if you selected, \"70% of inpatient admissions have documented discharge planning.\"", 1, 'kpi1'),
+        _kpi_text('kpi1_actual', "Provide the actual KPI performance results if you selected, \"70% of inpatient admissions have documented discharge planning.\"", 1, 'kpi1'),
+        _kpi_text('kpi2_target', {t: f"Provide the target KPI if you selected, \"{text}.\"" for t, text in _BP1_KPI2.items()}, 1, 'kpi2'),
+        _kpi_text('kpi2_actual', {t: f"Provide the actual KPI performance results if you selected, \"{text}.\"" for t, text in _BP1_KPI2.items()}, 1, 'kpi2'),
+        _kpi_text('kpi3_target', f"Provide the target KPI if you selected, \"{_BP1_KPI3}\"", 2, 'kpi3', from_tier(2)),
+        _kpi_text('kpi3_actual', f"Provide the actual KPI performance results if you selected, \"{_BP1_KPI3}\"", 2, 'kpi3', from_tier(2)),
+        _kpi_text('kpi4_target', f"Provide the target KPI if you selected, \"{_BP1_KPI4}\"", 2, 'kpi4', from_tier(2)),
+        _kpi_text('kpi4_actual', f"Provide the actual KPI performance results if you selected, \"{_BP1_KPI4}\"", 2, 'kpi4', from_tier(2)),
+        _kpi_text('kpi5_target', f"Provide the target KPI if you selected, \"{_BP1_KPI5}\" *", 3, 'kpi5', from_tier(3)),
+        _kpi_text('kpi5_actual', f"Provide the actual KPI performance results if you selected, \"{_BP1_KPI5}\" *", 3, 'kpi5', from_tier(3)),
+        _kpi_text('kpi6_target', f"Provide the target KPI if you selected, \"{_BP1_KPI6}\" *", 3, 'kpi6', from_tier(3)),
+        _kpi_text('kpi6_actual', f"Provide the actual KPI performance results if you selected, \"{_BP1_KPI6}\" *", 3, 'kpi6', from_tier(3)),
+    ],
+
+    # BP2: Bed Capacity Alert System - cumulative
+    "BP2": [
+        _header("### 🟢 Tier 1: Capacity Metrics"),
+        {'kind': CHECKLIST, 'key': 'capacity_metrics',
+         'label': "**Describe the one or more capacity metrics your organization selected to achieve tier 1: ***",
+         'options': [
+             ('metric_total', "Total number of patients in hospital", "Total patients"),
+             ('metric_beds', "Percent of hospital beds occupied", "% beds occupied"),
+             ('metric_ed', "Percent of ED border patients / overall ED beds", "% ED border"),
+             ('metric_nedoc', "NEDOC score", "NEDOC"),
+         ],
+         'other': ('metric_other_check', 'metric_other', "Describe other capacity metric *")},
+        _text('t1_target', "Provide the target metric for your chosen capacity metric to achieve tier 1 *", 1),
+        _text('t1_actual', "Provide the actual target metric performance results to achieve tier 1 *", 1),
+        _header("### 🟡 Tier 2: Bed Capacity Alert Process (in addition to Tier 1)", from_tier(2)),
+        _long('t2_surge', "Describe the established bed capacity alert process (aka surge plan) driven by capacity metrics *", 2, from_tier(2)),
+        _text('t2_target', "Provide the target metric for your chosen capacity metric to achieve tier 2 *", 2, from_tier(2)),
+        _text('t2_actual', "Provide the actual target metric performance results to achieve tier 2 *", 2, from_tier(2)),
+        _header("### 🔴 Tier 3: Demonstrate Activation (in addition to Tiers 1 & 2)", from_tier(3)),
+        _long('t3_quant', "Describe the process to achieve tier 3, when an organization quantitatively demonstrates consistent activation of surge plans *", 3, from_tier(3)),
+        _text('t3_target', "Provide the target metric for your chosen capacity metric to achieve tier 3 *", 3, from_tier(3)),
+        _text('t3_actual', "Provide the actual target metric performance results to achieve tier 3 *", 3, from_tier(3)),
+    ],
+
+    # BP3: Standardized Daily Shift Huddles - cumulative
+    "BP3": [
+        _header("### 🟢 Tier 1: Daily Huddles"),
+        _short('t1_kpi', "Provide the KPI chosen to achieve tier 1 *", 1),
+        _short('t1_actual', "Provide the actual KPI performance results to achieve tier 1 *", 1),
+        _header("### 🟡 Tier 2: Standardized Infrastructure (in addition to Tier 1)", from_tier(2)),
+        _short('t2_kpi', "Provide the KPI chosen to achieve tier 2 *", 2, from_tier(2)),
+        _short('t2_actual', "Provide the actual KPI performance results to achieve tier 2 *", 2, from_tier(2)),
+        _header("### 🔴 Tier 3: KPI Monitoring (in addition to Tiers 1 & 2)", from_tier(3)),
+        {'kind': CHECKLIST, 'key': 't3_kpi_type', 'tiers': from_tier(3),
+         'label': "**Describe the KPI your organization implemented to achieve tier 3: ***",
+         'options': [
+             ('t3_noon', "Percent of discharge orders written by noon", "Discharge orders by noon"),
+             ('t3_leaving', "Percent of patients leaving the facility by a designated time",
+              "Patients leaving by designated time"),
+         ],
+         'other': ('t3_other_check', 't3_other', "Describe other KPI *")},
+        _short('t3_formula', "Provide the KPI formula chosen to achieve tier 3 *", 3, from_tier(3)),
+        _short('t3_actual', "Provide the actual KPI performance results to achieve tier 3 *", 3, from_tier(3)),
+    ],
+
+    # BP4: Expedited Care Intervention - one, two or three practices (non-hierarchical)
+    "BP4": [
+        _header("### 🟢 Tier 1: Select ONE Expedited Care Practice", only(1)),
+        _header("### 🟡 Tier 2: Select TWO Expedited Care Practices", only(2)),
+        _header("### 🔴 Tier 3: Select THREE Expedited Care Practices", only(3)),
+        {'kind': CHOICE, 'key': 'practice', 'tiers': only(1), 'options': _BP4_PRACTICES,
+         'label': "Select the expedited care practice you plan to report *"},
+        {'kind': MULTI, 'key': 'practices', 'tiers': only(2, 3), 'options': _BP4_PRACTICES,
+         'label': {2: "Select two expedited care practices *", 3: "Select three expedited care practices *"}},
+        _short('t1_formula', {1: "Provide the KPI formula for this practice *",
+                              2: "Provide the KPI formula for first practice *",
+                              3: "Provide the KPI formula for first practice *"}),
+        _short('t1_actual', {1: "Provide the actual KPI performance results *",
+                             2: "Provide the actual KPI performance for first practice *",
+                             3: "Provide the actual KPI performance for first practice *"}),
+    ] + [
+        question
+        for n in (2, 3)
+        for question in (
+            _short(f't{n}_formula', f"Provide the KPI formula for {_BP4_ORDINALS[n]} practice *", tiers=from_tier(n)),
+            _short(f't{n}_actual', f"Provide the actual KPI performance for {_BP4_ORDINALS[n]} practice *", tiers=from_tier(n)),
+        )
+    ],
+
+    # BP5: Patient Flow Throughput Performance Council - one measure set per tier (non-hierarchical)
+    "BP5": _bp5_questions(),
+
+    # BP6: Clinical Pathways & Observation Management - cumulative
+    "BP6": [
+        _header("### 🟢 Tier 1: Design and Implement"),
+        _long('t1_pathway', "Describe the clinical pathway that was selected and implemented to achieve tier 1 *"),
+        _text('t1_target', "Provide the target measure to achieve tier 1 *"),
+        _text('t1_actual', "Provide the actual performance results to achieve tier 1 *"),
+        _header("### 🟡 Tier 2: Develop Data Infrastructure (in addition to Tier 1)", from_tier(2)),
+        _long('t2_data', "Describe the data collection and analysis systems implemented to achieve tier 2 *", tiers=from_tier(2)),
+        _text('t2_target', "Provide the target measure to achieve tier 2 *", tiers=from_tier(2)),
+        _text('t2_actual', "Provide the actual performance results to achieve tier 2 *", tiers=from_tier(2)),
+        _header("### 🔴 Tier 3: Demonstrate Improvement (in addition to Tiers 1 & 2)", from_tier(3)),
+        _long('t3_improvement', "Describe the measurable results that demonstrate improvement to achieve tier 3 *", tiers=from_tier(3)),
+        _text('t3_target', "Provide the target measure to achieve tier 3 *", tiers=from_tier(3)),
+        _text('t3_actual', "Provide the actual performance results to achieve tier 3 *", tiers=from_tier(3)),
+    ],
+}
+
+
+# ==================== COMPILED PLAN ====================
+Question = namedtuple('Question', [
+    'kind', 'key', 'label', 'tier_label', 'show_if', 'options', 'other',
+    'default_from', 'height', 'max_chars', 'required', 'summary'
+])
+
+
+def _compile_question(spec, tier):
+    label = spec.get('label', '')
+    if isinstance(label, dict):
+        label = label[tier]
+    return Question(
+        kind=spec['kind'],
+        key=spec.get('key'),
+        label=label,
+        tier_label=spec.get('tier_label'),
+        show_if=spec.get('show_if'),
+        options=tuple(spec.get('options', ())),
+        other=spec.get('other'),
+        default_from=spec.get('default_from'),
+        height=spec.get('height'),
+        max_chars=spec.get('max_chars'),
+        required=spec.get('required', spec['kind'] in ANSWER_KINDS and label.rstrip().endswith('*')),
+        summary=spec.get('summary', label.strip('* :')),
+    )
+
+
+@lru_cache(maxsize=None)
+def compile_plan(bp, tier):
+    """
+    Render plan for one Best Practice at one tier, built once per process.
+
+    Returns:
+        tuple of Question, in display order
+    """
+    return tuple(
+        _compile_question(spec, tier)
+        for spec in QUESTION_SCHEMA[bp] + COMMON_QUESTIONS
+        if tier in spec.get('tiers', ALL_TIERS)
+    )
+
+
+@lru_cache(maxsize=None)
+def answer_keys(bp):
+    """Every answer key suffix this Best Practice can produce, across all tiers."""
+    keys = []
+    for tier in ALL_TIERS:
+        for question in compile_plan(bp, tier):
+            if question.kind in ANSWER_KINDS and question.key not in keys:
+                keys.append(question.key)
+    return tuple(keys)
+
+
+@lru_cache(maxsize=None)
+def sheet_columns():
+    """Full column set for the submissions sheet / CSV: core columns, then BP answers per slot."""
+    columns = list(CORE_COLUMNS)
+    for slot in BP_SLOTS:
+        for bp in QUESTION_SCHEMA:
+            for key in answer_keys(bp):
+                column = f"{slot}_{key}"
+                if column not in columns:
+                    columns.append(column)
+    return tuple(columns)
+
+
+def tier_number(value):
+    """Tier as stored in the sheet (1, '2', 3.0) -> int, or None if not a valid tier."""
+    try:
+        tier = int(float(value))
+    except (TypeError, ValueError):
+        return None
+    return tier if tier in ALL_TIERS else None
+
+
+def is_blank(value):
+    """True for missing answers (None, NaN, empty or whitespace strings)."""
+    if value is None:
+        return True
+    if isinstance(value, float) and value != value:
+        return True
+    return str(value).strip() in ('', 'None', 'nan')
+
+
+def is_approved(value):
+    """Approval flag as stored in the sheet (True, 'TRUE', 'True', '1', 'yes') -> bool."""
+    if isinstance(value, bool):
+        return value
+    return not is_blank(value) and str(value).strip().lower() in ('true', '1', 'yes')
+
+
+# Yes/no columns written with USER_ENTERED, so the sheet turns them into booleans
+FLAG_COLUMNS = ('approved',)
+
+
+def changed_fields(saved, data, ignore=('timestamp',)):
+    """
+    Fields of a new submission that differ from the saved row.
+    Columns the new data doesn't include count as cleared, matching a full-row write.
+    Flags in FLAG_COLUMNS compare by value: Sheets stores 'False' as a boolean and reads back 'FALSE'.
+
+    Returns:
+        dict: column -> new value (empty when nothing changed)
+    """
+    patch = {}
+    for key in list(data) + [key for key in saved if key not in data]:
+        if key in ignore:
+            continue
+        old, new = saved.get(key), data.get(key, '')
+        if key in FLAG_COLUMNS:
+            if is_approved(old) != is_approved(new):
+                patch[key] = new
+            continue
+        if is_blank(old) and is_blank(new):
+            continue
+        if is_blank(old) or is_blank(new) or str(old).strip() != str(new).strip():
+            patch[key] = '' if is_blank(new) else new
+    return patch
+
+
+def validate_answers(bp, tier, prefix, data):
+    """
+    Check required answers for a rendered Best Practice section.
+    Only questions that were shown (present in data) are checked.
+
+    Returns:
+        list of labels of required questions left blank
+    """
+    missing = []
+    for question in compile_plan(bp, tier):
+        if not question.required or question.kind not in ANSWER_KINDS:
+            continue
+        key = f"{prefix}_{question.key}"
+        if key in data and is_blank(data[key]):
+            missing.append(question.summary)
+    return missing
+
+
+def answered_questions(bp, tier, prefix, submission):
+    """
+    (label, answer) pairs for the answered questions of a submission, in plan order.
+    Used for read-only views and the PDF report.
+    """
+    tier = tier_number(tier)
+    if bp not in QUESTION_SCHEMA or tier is None:
+        return []
+
+    rows = []
+    for question in compile_plan(bp, tier):
+        if question.kind not in ANSWER_KINDS:
+            continue
+        value = submission.get(f"{prefix}_{question.key}")
+        if not is_blank(value):
+            rows.append((question.summary, str(value)))
+    return rows
+
+
+# ==================== LOADING SAVED ANSWERS ====================
+def stored_text(existing_data, key):
+    """Saved answer as a string for prefilling a widget ('' when blank)."""
+    value = (existing_data or {}).get(key)
+    return '' if is_blank(value) else str(value)
+
+
+def parse_checklist(question, stored):
+    """
+    Split a saved CHECKLIST answer back into checked option keys and "Other" text.
+
+    Returns:
+        (set of checked widget keys, other text or None)
+    """
+    checked, other_text = set(), None
+    if not stored:
+        return checked, other_text
+
+    marker = stored.find("Other: ")
+    if question.other and marker != -1:
+        other_text = stored[marker + len("Other: "):]
+        stored = stored[:marker]
+
+    values = {part.strip() for part in stored.split(", ") if part.strip()}
+    for widget_key, _, value in question.options:
+        if value in values:
+            checked.add(widget_key)
+    return checked, other_text
@@ -0,0 +1,127 @@
+"""
+Cross-Cycle Trend Analytics for HSCRC Survey System
+Per-hospital tier trajectories and statewide tier distributions across reporting cycles.
+Everything is computed with groupby / pivot on the long table (one row per rated
+BP selection per cycle), so hundreds of hospital-cycle series cost no Python loops.
+"""
+
+import numpy as np
+import pandas as pd
+
+from survey_analytics import explode_bp_selections
+
+TREND_COLUMNS = ['cycle', 'hospital_name', 'bp', 'tier']
+
+
+def cycle_selections(stacked, cycles=None):
+    """
+    Long table of every rated BP selection across cycles.
+    A hospital's first row per cycle (the one the apps edit) is used; a BP reported in both slots counts once.
+
+    Args:
+        stacked: Submissions with a 'cycle' column (see cycle_archive.stack_cycles)
+        cycles: Cycle order (default: order of first appearance)
+
+    Returns:
+        DataFrame with cycle (ordered Categorical), hospital_name, bp, tier (Int64)
+    """
+    if stacked.empty or 'cycle' not in stacked.columns:
+        return pd.DataFrame({
+            'cycle': pd.Categorical([], categories=list(cycles or []), ordered=True),
+            'hospital_name': pd.Series(dtype=object),
+            'bp': pd.Series(dtype=object),
+            'tier': pd.Series(dtype='Int64'),
+        })
+
+    cycles = list(dict.fromkeys(stacked['cycle'])) if cycles is None else list(cycles)
+    latest = stacked.drop_duplicates(['cycle', 'hospital_name'], keep='first')
+    selections = explode_bp_selections(latest, keep_columns=('cycle',)).dropna(subset=['tier'])
+    selections = selections.drop_duplicates(['cycle', 'hospital_name', 'bp'], keep='last')
+    selections = selections.assign(cycle=pd.Categorical(selections['cycle'], categories=cycles, ordered=True))
+    return selections[TREND_COLUMNS].sort_values(['bp', 'hospital_name', 'cycle']).reset_index(drop=True)
+
+
+def tier_trajectories(selections):
+    """
+    Each hospital's tier for each BP, one column per cycle.
+
+    Returns:
+        DataFrame indexed by (hospital_name, bp) with one float column per cycle
+        (NaN where the hospital didn't report that BP in that cycle)
+    """
+    cycles = list(selections['cycle'].cat.categories)
+    trajectories = selections.assign(tier=selections['tier'].astype(float)).pivot(
+        index=['hospital_name', 'bp'], columns='cycle', values='tier'
+    )
+    trajectories.columns = trajectories.columns.astype(object)
+    return trajectories.reindex(columns=cycles)
+
+
+def trajectory_summary(trajectories):
+    """
+    First and latest reported tier per hospital and BP, and the change between them.
+
+    Returns:
+        DataFrame indexed like trajectories with First Cycle, First Tier, Latest Cycle,
+        Latest Tier, Change (latest - first), Cycles Reported
+    """
+    columns = ['First Cycle', 'First Tier', 'Latest Cycle', 'Latest Tier', 'Change', 'Cycles Reported']
+    if trajectories.empty:
+        return pd.DataFrame(columns=columns, index=trajectories.index)
+
+    reported = trajectories.notna().to_numpy()
+    values = trajectories.to_numpy()
+    rows = np.arange(len(trajectories))
+    cycles = np.asarray(trajectories.columns, dtype=object)
+
+    # Column position of the first / last reported cycle in every row, without a per-row loop
+    first = reported.argmax(axis=1)
+    last = reported.shape[1] - 1 - reported[:, ::-1].argmax(axis=1)
+
+    summary = pd.DataFrame({
+        'First Cycle': cycles[first],
+        'First Tier': values[rows, first],
+        'Latest Cycle': cycles[last],
+        'Latest Tier': values[rows, last],
+        'Change': values[rows, last] - values[rows, first],
+        'Cycles Reported': reported.sum(axis=1),
+    }, index=trajectories.index)
+    return summary[columns]
+
+
+def statewide_distribution(selections, by_bp=False):
+    """
+    How many selections fall in each tier per cycle (optionally per BP), and their share.
+
+    Returns:
+        Long DataFrame with cycle, [bp,] tier, count, share (percent of that cycle's [BP's] selections)
+    """
+    keys = ['cycle', 'bp'] if by_bp else ['cycle']
+    counts = (
+        selections.groupby(keys + ['tier'], observed=True).size()
+        .rename('count').reset_index()
+    )
+    totals = counts.groupby(keys, observed=True)['count'].transform('sum')
+    counts['share'] = (counts['count'] / totals * 100).round(1)
+    counts['tier'] = counts['tier'].astype(int)
+    return counts
+
+
+def trajectory_segments(trajectories):
+    """
+    Chart-ready line data: every hospital's trajectory for a BP joined into one
+    series, separated by NaN gaps, so each BP panel is a single trace.
+
+    Returns:
+        dict: bp -> (x cycles, y tiers, hospital labels) as flat numpy arrays
+    """
+    cycles = list(trajectories.columns)
+    segments = {}
+    for bp, block in trajectories.groupby(level='bp', sort=True):
+        count = len(block)
+        # One extra NaN column per hospital breaks the line between hospitals
+        y = np.hstack([block.to_numpy(), np.full((count, 1), np.nan)]).ravel()
+        x = np.tile(np.asarray(cycles + cycles[-1:], dtype=object), count)
+        hospitals = np.repeat(block.index.get_level_values('hospital_name').to_numpy(), len(cycles) + 1)
+        segments[bp] = (x, y, hospitals)
+    return segments